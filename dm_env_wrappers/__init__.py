@@ -2,29 +2,68 @@
 
 from dm_env_wrappers._src.action_repeat import ActionRepeatWrapper
 from dm_env_wrappers._src.base import EnvironmentWrapper, wrap_all
-from dm_env_wrappers._src.canonical_spec import CanonicalSpecWrapper
-from dm_env_wrappers._src.concatenate_observations import ConcatObservationWrapper
 from dm_env_wrappers._src.episode_statistics import EpisodeStatisticsWrapper
-from dm_env_wrappers._src.expand_scalar_observation_shapes import (
-    ExpandScalarObservationShapesWrapper,
-)
-from dm_env_wrappers._src.frame_stacking import FrameStackingWrapper
-from dm_env_wrappers._src.mujoco.dm_control_video import DmControlVideoWrapper
+from dm_env_wrappers._src.image_preprocessing import ImagePreprocessingWrapper
 from dm_env_wrappers._src.mujoco.dm_control import DmControlWrapper
 from dm_env_wrappers._src.mujoco.action_noise import ActionNoiseWrapper
-from dm_env_wrappers._src.mujoco.action_smoother import ActionSmootherWrapper
-from dm_env_wrappers._src.observation_action_reward import (
-    ObservationActionRewardWrapper,
+from dm_env_wrappers._src.mutable_timestep import (
+    FreezeTimeStepWrapper,
+    MutableTimeStep,
+    MutableTimeStepWrapper,
 )
-from dm_env_wrappers._src.single_precision import SinglePrecisionWrapper
+from dm_env_wrappers._src.observation_projection import ObservationProjectionWrapper
+from dm_env_wrappers._src.reset_prefetch import ResetPrefetchWrapper
+from dm_env_wrappers._src.reward_scaling import RewardScalingWrapper
+from dm_env_wrappers._src.running_statistics import RunningStatistics
 from dm_env_wrappers._src.step_limit import StepLimitWrapper
 from dm_env_wrappers._src.validate_spec import ValidateActionSpecWrapper
-from dm_env_wrappers._src.video import VideoWrapper
 
 from dm_env_wrappers._src import lazy_loader
 
+# Wrappers that pull in heavy dependencies (`tree`, `scipy`, `imageio`, `gym`,
+# `gymnasium`, `asyncio`, `multiprocessing`) are only imported upon first access.
 with lazy_loader.LazyImports(__name__, False):
+    from dm_env_wrappers._src.async_environment import AsyncEnvironmentWrapper
+    from dm_env_wrappers._src.async_environment import SyncEnvironmentWrapper
+    from dm_env_wrappers._src.auto_reset import AutoResetWrapper
+    from dm_env_wrappers._src.canonical_spec import CanonicalSpecWrapper
+    from dm_env_wrappers._src.codec import NestCodec
+    from dm_env_wrappers._src.codec import TimeStepCodec
+    from dm_env_wrappers._src.concatenate_observations import (
+        ConcatObservationWrapper,
+    )
+    from dm_env_wrappers._src.environment_pool import EnvironmentPool
+    from dm_env_wrappers._src.environment_pool import make_environments
+    from dm_env_wrappers._src.expand_scalar_observation_shapes import (
+        ExpandScalarObservationShapesWrapper,
+    )
+    from dm_env_wrappers._src.frame_stacking import FrameStackingWrapper
+    from dm_env_wrappers._src.mujoco.dm_control_video import DmControlVideoWrapper
+    from dm_env_wrappers._src.mujoco.action_smoother import ActionSmootherWrapper
+    from dm_env_wrappers._src.observation_action_reward import (
+        ObservationActionRewardWrapper,
+    )
+    from dm_env_wrappers._src.observation_compression import (
+        ObservationCompressionWrapper,
+    )
+    from dm_env_wrappers._src.observation_compression import ObservationDecoder
+    from dm_env_wrappers._src.observation_normalization import (
+        ObservationNormalizationWrapper,
+    )
+    from dm_env_wrappers._src.remote import EnvironmentClient
+    from dm_env_wrappers._src.remote import EnvironmentServer
+    from dm_env_wrappers._src.remote import RemoteEnvironment
+    from dm_env_wrappers._src.replay_environment import ReplayEnvironment
+    from dm_env_wrappers._src.single_precision import SinglePrecisionWrapper
+    from dm_env_wrappers._src.trajectory_recorder import (
+        TrajectoryRecorderWrapper,
+    )
+    from dm_env_wrappers._src.thread_pool_vector_env import (
+        ThreadPoolVectorEnvironment,
+    )
+    from dm_env_wrappers._src.video import VideoWrapper
     from dm_env_wrappers._src.gymnasium_wrapper import GymnasiumWrapper
+    from dm_env_wrappers._src.gymnasium_wrapper import GymnasiumVectorWrapper
     from dm_env_wrappers._src.gym_wrapper import GymWrapper
 
 del lazy_loader  # lazy_loader should not be exported
@@ -35,21 +74,46 @@ __all__ = (
     "ActionNoiseWrapper",
     "ActionRepeatWrapper",
     "ActionSmootherWrapper",
+    "AsyncEnvironmentWrapper",
+    "AutoResetWrapper",
     "CanonicalSpecWrapper",
     "ConcatObservationWrapper",
     "DmControlWrapper",
     "DmControlVideoWrapper",
+    "EnvironmentClient",
+    "EnvironmentPool",
+    "EnvironmentServer",
     "EnvironmentWrapper",
     "EpisodeStatisticsWrapper",
     "ExpandScalarObservationShapesWrapper",
     "FrameStackingWrapper",
+    "FreezeTimeStepWrapper",
+    "GymnasiumVectorWrapper",
     "GymnasiumWrapper",
     "GymWrapper",
+    "ImagePreprocessingWrapper",
+    "MutableTimeStep",
+    "MutableTimeStepWrapper",
+    "NestCodec",
     "ObservationActionRewardWrapper",
+    "ObservationCompressionWrapper",
+    "ObservationDecoder",
+    "ObservationNormalizationWrapper",
+    "ObservationProjectionWrapper",
+    "RemoteEnvironment",
+    "ReplayEnvironment",
+    "ResetPrefetchWrapper",
+    "RewardScalingWrapper",
+    "RunningStatistics",
     "SinglePrecisionWrapper",
     "StepLimitWrapper",
+    "SyncEnvironmentWrapper",
+    "ThreadPoolVectorEnvironment",
+    "TimeStepCodec",
+    "TrajectoryRecorderWrapper",
     "ValidateActionSpecWrapper",
     "VideoWrapper",
+    "make_environments",
     "wrap_all",
 )
 
@@ -22,6 +22,9 @@ from dm_env_wrappers._src import base
 class ActionRepeatWrapper(base.EnvironmentWrapper):
     """Action repeat wrapper."""
 
+    _passes_observation_through = True
+    _supports_mutable_timesteps = True
+
     def __init__(self, environment: dm_env.Environment, num_repeats: int = 1):
         super().__init__(environment)
         self._num_repeats = num_repeats
@@ -45,3 +48,6 @@ class ActionRepeatWrapper(base.EnvironmentWrapper):
 
         # Replace the final timestep's reward and discount.
         return timestep._replace(reward=reward, discount=discount)
+
+    def _wrapped_observation_keys(self, keys):
+        return keys
@@ -0,0 +1,138 @@
+"""Adapters between synchronous and `asyncio` environments.
+
+An asynchronous environment has the spec methods of a `dm_env.Environment`, but
+`reset()` and `step()` are coroutines. This lets a single thread interleave many
+environments whose steps are mostly spent waiting:
+
+    envs = [AsyncEnvironmentWrapper(wrap_all(make_env(), wrappers)) for _ in range(8)]
+    timesteps = await asyncio.gather(*(env.step(action) for env in envs))
+
+`SyncEnvironmentWrapper` goes the other way and exposes an asynchronous
+environment as a regular `dm_env.Environment`.
+"""
+
+import asyncio
+import concurrent.futures
+from typing import Any, Optional
+
+import dm_env
+
+
+class AsyncEnvironmentWrapper:
+    """Exposes a synchronous environment through `async` `reset()` and `step()`.
+
+    Calls to the wrapped environment, which can be any `EnvironmentWrapper`
+    chain, are run in an executor so they don't block the event loop. Like a
+    regular environment, the wrapper must not be stepped again before the
+    previous call has completed.
+    """
+
+    def __init__(
+        self,
+        environment: dm_env.Environment,
+        executor: Optional[concurrent.futures.Executor] = None,
+    ) -> None:
+        """Initializes a new AsyncEnvironmentWrapper.
+
+        Args:
+          environment: The synchronous environment to wrap.
+          executor: Executor to run the environment's calls in. Defaults to the
+            event loop's default executor.
+        """
+        self._environment = environment
+        self._executor = executor
+
+    async def reset(self) -> dm_env.TimeStep:
+        return await self._run(self._environment.reset)
+
+    async def step(self, action) -> dm_env.TimeStep:
+        return await self._run(self._environment.step, action)
+
+    def observation_spec(self):
+        return self._environment.observation_spec()
+
+    def action_spec(self):
+        return self._environment.action_spec()
+
+    def reward_spec(self):
+        return self._environment.reward_spec()
+
+    def discount_spec(self):
+        return self._environment.discount_spec()
+
+    @property
+    def environment(self) -> dm_env.Environment:
+        """Returns the wrapped synchronous environment."""
+        return self._environment
+
+    def __getattr__(self, name: str):
+        if name.startswith("__"):
+            raise AttributeError(
+                "attempted to get missing private attribute '{}'".format(name)
+            )
+        return getattr(self._environment, name)
+
+    def close(self):
+        return self._environment.close()
+
+    # Helper methods.
+
+    async def _run(self, fn, *args) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+
+
+class SyncEnvironmentWrapper(dm_env.Environment):
+    """Exposes an asynchronous environment as a regular `dm_env.Environment`.
+
+    Coroutines are run to completion on an event loop owned by the wrapper, so it
+    must not be used from code that is already running inside an event loop.
+    """
+
+    def __init__(self, environment: Any) -> None:
+        """Initializes a new SyncEnvironmentWrapper.
+
+        Args:
+          environment: An asynchronous environment, e.g. an
+            `AsyncEnvironmentWrapper`.
+        """
+        self._environment = environment
+        self._loop = asyncio.new_event_loop()
+
+    def reset(self) -> dm_env.TimeStep:
+        return self._loop.run_until_complete(self._environment.reset())
+
+    def step(self, action) -> dm_env.TimeStep:
+        return self._loop.run_until_complete(self._environment.step(action))
+
+    def observation_spec(self):
+        return self._environment.observation_spec()
+
+    def action_spec(self):
+        return self._environment.action_spec()
+
+    def reward_spec(self):
+        return self._environment.reward_spec()
+
+    def discount_spec(self):
+        return self._environment.discount_spec()
+
+    @property
+    def environment(self) -> Any:
+        """Returns the wrapped asynchronous environment."""
+        return self._environment
+
+    def __getattr__(self, name: str):
+        if name.startswith("__"):
+            raise AttributeError(
+                "attempted to get missing private attribute '{}'".format(name)
+            )
+        return getattr(self._environment, name)
+
+    def close(self):
+        try:
+            result = self._environment.close()
+            if asyncio.iscoroutine(result):
+                self._loop.run_until_complete(result)
+        finally:
+            self._loop.close()
@@ -0,0 +1,97 @@
+"""Tests for async_environment.py."""
+
+import asyncio
+import threading
+
+import dm_env
+import numpy as np
+from absl.testing import absltest
+from dm_env import specs
+
+from dm_env_wrappers._src import async_environment, step_limit
+
+
+class _FakeEnvironment(dm_env.Environment):
+    """A mock environment whose steps can wait on a barrier."""
+
+    def __init__(self, barrier=None) -> None:
+        self.barrier = barrier
+        self.closed = False
+
+    def reset(self) -> dm_env.TimeStep:
+        return dm_env.restart(np.zeros(1))
+
+    def step(self, action) -> dm_env.TimeStep:
+        if self.barrier is not None:
+            self.barrier.wait()
+        return dm_env.transition(1.0, np.full(1, action, dtype=np.float64))
+
+    def observation_spec(self):
+        return specs.Array(shape=(1,), dtype=np.float64)
+
+    def action_spec(self):
+        return specs.Array(shape=(), dtype=np.float64)
+
+    def close(self):
+        self.closed = True
+
+
+class AsyncEnvironmentWrapperTest(absltest.TestCase):
+    """Tests for AsyncEnvironmentWrapper."""
+
+    def test_steps_environments_concurrently(self) -> None:
+        # Each step waits for the other one, so this only completes if both
+        # environments are stepped at the same time.
+        barrier = threading.Barrier(2, timeout=5)
+        envs = [
+            async_environment.AsyncEnvironmentWrapper(_FakeEnvironment(barrier))
+            for _ in range(2)
+        ]
+
+        async def run():
+            await asyncio.gather(*(env.reset() for env in envs))
+            return await asyncio.gather(
+                *(env.step(float(i)) for i, env in enumerate(envs))
+            )
+
+        timesteps = asyncio.run(run())
+        for i, timestep in enumerate(timesteps):
+            self.assertTrue(timestep.mid())
+            np.testing.assert_array_equal(timestep.observation, [i])
+
+    def test_wraps_environment_wrapper_chain(self) -> None:
+        inner = _FakeEnvironment()
+        env = async_environment.AsyncEnvironmentWrapper(
+            step_limit.StepLimitWrapper(inner, step_limit=1)
+        )
+        self.assertEqual(env.observation_spec(), inner.observation_spec())
+        self.assertIs(env.barrier, None)
+
+        async def run():
+            await env.reset()
+            return await env.step(0.0)
+
+        self.assertTrue(asyncio.run(run()).last())
+        env.close()
+        self.assertTrue(inner.closed)
+
+
+class SyncEnvironmentWrapperTest(absltest.TestCase):
+    """Tests for SyncEnvironmentWrapper."""
+
+    def test_round_trip(self) -> None:
+        inner = _FakeEnvironment()
+        env = async_environment.SyncEnvironmentWrapper(
+            async_environment.AsyncEnvironmentWrapper(inner)
+        )
+        self.assertTrue(env.reset().first())
+        timestep = env.step(3.0)
+        self.assertEqual(timestep.reward, 1.0)
+        np.testing.assert_array_equal(timestep.observation, [3.0])
+        self.assertEqual(env.action_spec(), inner.action_spec())
+        env.close()
+        self.assertTrue(inner.closed)
+
+
+if __name__ == "__main__":
+    absltest.main()
@@ -0,0 +1,91 @@
+"""Wrapper that resets the environment in the step that ends an episode."""
+
+from typing import Optional
+
+import dm_env
+import numpy as np
+import tree
+
+from dm_env_wrappers._src import base, mutable_timestep
+
+
+class AutoResetWrapper(base.EnvironmentWrapper):
+    """Resets the wrapped environment within the `step()` call that returns LAST.
+
+    Usually, the `step()` call following a LAST timestep only resets the wrapped
+    environment, which costs a full round-trip through the wrapper chain. This
+    wrapper resets the environment right away instead:
+
+    - By default, the LAST timestep is returned and the FIRST timestep of the next
+      episode is stashed. The following `step()` call returns it without going
+      through the wrapped environment and ignores its action.
+    - With `return_first=True`, the FIRST timestep of the next episode is returned
+      in place of the LAST one, which is then available from `final_timestep`
+      until the next call. No call is spent on episode boundaries at all, but
+      consumers must read the final reward, discount and observation from the
+      side channel.
+    """
+
+    _supports_mutable_timesteps = True
+
+    def __init__(
+        self, environment: dm_env.Environment, return_first: bool = False
+    ) -> None:
+        """Initializes a new AutoResetWrapper.
+
+        Args:
+          environment: Environment to wrap.
+          return_first: Whether to return the FIRST timestep of the next episode in
+            place of the LAST timestep of the current one.
+        """
+        super().__init__(environment)
+        self._return_first = return_first
+        self._next_timestep: Optional[dm_env.TimeStep] = None
+        self._final_timestep: Optional[dm_env.TimeStep] = None
+
+    def reset(self) -> dm_env.TimeStep:
+        self._next_timestep = None
+        self._final_timestep = None
+        return self._environment.reset()
+
+    def step(self, action) -> dm_env.TimeStep:
+        self._final_timestep = None
+        if self._next_timestep is not None:
+            timestep, self._next_timestep = self._next_timestep, None
+            return timestep
+
+        timestep = self._environment.step(action)
+        if not timestep.last():
+            return timestep
+
+        # Copy the LAST timestep before resetting, since the wrapped environment may
+        # reuse a single `MutableTimeStep` for both, and the same observation arrays.
+        final_timestep = mutable_timestep.freeze(timestep)
+        final_timestep = final_timestep._replace(
+            observation=tree.map_structure(_copy_array, final_timestep.observation)
+        )
+        first_timestep = self._environment.reset()
+        if self._return_first:
+            self._final_timestep = final_timestep
+            return first_timestep
+        self._next_timestep = mutable_timestep.freeze(first_timestep)
+        return final_timestep
+
+    def register_observation_buffers(self, buffers) -> None:
+        # The final observation would be overwritten by the reset in the same step.
+        raise ValueError("AutoResetWrapper does not support observation buffers.")
+
+    @property
+    def final_timestep(self) -> Optional[dm_env.TimeStep]:
+        """The LAST timestep replaced by a FIRST one in the previous `step()` call.
+
+        This is only set when `return_first=True`, and is None otherwise.
+        """
+        return self._final_timestep
+
+    def _wrapped_observation_keys(self, keys):
+        return keys
+
+
+def _copy_array(value):
+    return value.copy() if isinstance(value, np.ndarray) else value
@@ -0,0 +1,129 @@
+"""Tests for auto_reset.py."""
+
+import dm_env
+import numpy as np
+from absl.testing import absltest
+from dm_env import specs
+
+from dm_env_wrappers._src import auto_reset, observation_normalization, step_limit
+
+
+class _FakeEnvironment(dm_env.Environment):
+    """A mock environment that counts calls to `step` and `reset`."""
+
+    def __init__(self) -> None:
+        self.num_steps = 0
+        self.num_resets = 0
+        self._episode = 0
+
+    def reset(self) -> dm_env.TimeStep:
+        self.num_resets += 1
+        self._episode += 1
+        return dm_env.restart(self._episode)
+
+    def step(self, action) -> dm_env.TimeStep:
+        del action  # Unused.
+        self.num_steps += 1
+        return dm_env.transition(1.0, self._episode)
+
+    def observation_spec(self):
+        return None
+
+    def action_spec(self):
+        return None
+
+
+class _ArrayObservationEnvironment(dm_env.Environment):
+    """A mock environment whose observations count steps across episodes."""
+
+    def __init__(self) -> None:
+        self.count = 0.0
+
+    def reset(self) -> dm_env.TimeStep:
+        self.count += 1.0
+        return dm_env.restart(self._observation())
+
+    def step(self, action) -> dm_env.TimeStep:
+        del action  # Unused.
+        self.count += 1.0
+        return dm_env.transition(1.0, self._observation())
+
+    def observation_spec(self):
+        return {"x": specs.Array(shape=(1,), dtype=np.float64)}
+
+    def action_spec(self):
+        return specs.Array(shape=(), dtype=np.int32)
+
+    def _observation(self):
+        return {"x": np.array([self.count])}
+
+
+class AutoResetWrapperTest(absltest.TestCase):
+    """Tests for AutoResetWrapper."""
+
+    def test_stashes_first_timestep(self) -> None:
+        inner = _FakeEnvironment()
+        env = auto_reset.AutoResetWrapper(step_limit.StepLimitWrapper(inner, 2))
+        env.reset()
+        env.step(0)
+        timestep = env.step(0)
+        self.assertTrue(timestep.last())
+        self.assertEqual(timestep.observation, 1)
+        self.assertEqual(inner.num_resets, 2)
+
+        timestep = env.step(0)
+        self.assertTrue(timestep.first())
+        self.assertEqual(timestep.observation, 2)
+        self.assertEqual(inner.num_steps, 2)
+
+        timestep = env.step(0)
+        self.assertTrue(timestep.mid())
+        self.assertEqual(inner.num_steps, 3)
+
+    def test_return_first(self) -> None:
+        inner = _FakeEnvironment()
+        env = auto_reset.AutoResetWrapper(
+            step_limit.StepLimitWrapper(inner, 2), return_first=True
+        )
+        env.reset()
+        env.step(0)
+        self.assertIsNone(env.final_timestep)
+
+        timestep = env.step(0)
+        self.assertTrue(timestep.first())
+        self.assertEqual(timestep.observation, 2)
+        self.assertTrue(env.final_timestep.last())
+        self.assertEqual(env.final_timestep.reward, 1.0)
+        self.assertEqual(env.final_timestep.observation, 1)
+
+        timestep = env.step(0)
+        self.assertTrue(timestep.mid())
+        self.assertIsNone(env.final_timestep)
+
+    def test_copies_reused_observation_buffers(self) -> None:
+        for return_first in (False, True):
+            # Normalized observations are written into a single reused buffer.
+            env = auto_reset.AutoResetWrapper(
+                observation_normalization.ObservationNormalizationWrapper(
+                    step_limit.StepLimitWrapper(_ArrayObservationEnvironment(), 2)
+                ),
+                return_first=return_first,
+            )
+            env.reset()
+            previous = env.step(0).observation["x"].copy()
+            timestep = env.step(0)
+            if return_first:
+                first, last = timestep, env.final_timestep
+            else:
+                last, first = timestep, env.step(0)
+            self.assertTrue(last.last())
+            self.assertTrue(first.first())
+            self.assertFalse(
+                np.shares_memory(last.observation["x"], first.observation["x"])
+            )
+            # Observations grow within an episode and the statistics are shared.
+            self.assertGreater(last.observation["x"][0], previous[0])
+
+
+if __name__ == "__main__":
+    absltest.main()
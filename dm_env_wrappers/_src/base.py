@@ -14,10 +14,36 @@
 
 """Environment wrapper base class."""
 
-from typing import Callable, Sequence
+import functools
+import inspect
+from typing import Any, Callable, FrozenSet, Optional, Sequence, Type, TypeVar
 
 import dm_env
 
+_WrapperType = TypeVar("_WrapperType", bound="EnvironmentWrapper")
+
+
+def memoize_spec(method):
+    """Caches the result of a spec method on the wrapper instance.
+
+    This is meant for wrappers that build their specs from those of the wrapped
+    environment on every call. The cache is keyed on the undecorated method, so
+    that `super()` calls from decorated overrides get their own entry.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self):
+        cache = self.__dict__.get("_spec_cache")
+        if cache is None:
+            cache = self.__dict__["_spec_cache"] = {}
+        try:
+            return cache[method]
+        except KeyError:
+            spec = cache[method] = method(self)
+            return spec
+
+    return wrapper
+
 
 class EnvironmentWrapper(dm_env.Environment):
     """Environment that wraps another environment.
@@ -25,10 +51,43 @@ class EnvironmentWrapper(dm_env.Environment):
     This exposes the wrapped environment with the `.environment` property and also
     defines `__getattr__` so that attributes are invisibly forwarded to the
     wrapped environment (and hence enabling duck-typing).
+
+    The layer of the chain that owns a forwarded attribute is looked up once and
+    cached, so repeated accesses cost a single `getattr` on that layer regardless
+    of how deep the chain is. Only the owner is cached, never the value, so
+    attributes that are reassigned (e.g. `physics`) always read fresh. Call
+    `clear_attribute_cache()` if layers of the chain are swapped after the fact.
+
+    Spec methods decorated with `memoize_spec` build their specs once. Wrappers
+    whose specs change after construction must call `clear_spec_cache()` on the
+    outermost wrapper if the chain has memoizing layers. Returned specs are shared
+    and must not be mutated.
+
+    `wrap_all(..., prune_observations=True)` tells every layer which keys of its
+    dict observation are read further out, in `_consumed_observation_keys`.
+    Wrappers that transform observations key by key skip the other keys, which
+    are then passed through unchanged even though `observation_spec()` still
+    describes them as transformed: they are dropped further out anyway.
     """
 
     _environment: dm_env.Environment
 
+    # Caller-owned arrays that observations are written into, if registered.
+    _observation_buffers: Optional[Any] = None
+
+    # Whether the observations of the wrapped environment are returned as is, so
+    # that observation buffers can be forwarded to it. Subclasses opt in.
+    _passes_observation_through: bool = False
+
+    # Whether this wrapper only uses the timesteps of the wrapped environment
+    # within the call that returned them, through fields, `first()`, `mid()`,
+    # `last()` and `_replace`, so that it can be stacked between a
+    # `MutableTimeStepWrapper` and a `FreezeTimeStepWrapper`. Subclasses opt in.
+    _supports_mutable_timesteps: bool = False
+
+    # Keys of the observation read by the layers wrapping this one, if known.
+    _consumed_observation_keys: Optional[FrozenSet[str]] = None
+
     def __init__(self, environment: dm_env.Environment):
         self._environment = environment
 
@@ -37,12 +96,118 @@ class EnvironmentWrapper(dm_env.Environment):
             raise AttributeError(
                 "attempted to get missing private attribute '{}'".format(name)
             )
-        return getattr(self._environment, name)
+        # Look up instance state directly to avoid recursing into `__getattr__`
+        # while the wrapper is only partially initialized.
+        state = self.__dict__
+        if "_environment" not in state:
+            raise AttributeError(name)
+        owners = state.setdefault("_attribute_owners", {})
+        owner = owners.get(name)
+        if owner is None:
+            owner = _find_attribute_owner(state["_environment"], name)
+            owners[name] = owner
+        return getattr(owner, name)
+
+    def __getstate__(self):
+        # Memoized specs are keyed on functions, which are not picklable by
+        # reference once decorated, and are cheap to rebuild.
+        state = self.__dict__.copy()
+        state.pop("_spec_cache", None)
+        return state
 
     @property
     def environment(self) -> dm_env.Environment:
         return self._environment
 
+    @property
+    def innermost(self) -> dm_env.Environment:
+        """The innermost environment of the chain, which is not a wrapper.
+
+        This is not named `unwrapped` so that the `unwrapped` attribute of wrapped
+        gym and gymnasium environments is still forwarded.
+        """
+        environment = self._environment
+        while isinstance(environment, EnvironmentWrapper):
+            environment = environment.environment
+        return environment
+
+    def find_wrapper(self, wrapper_type: Type[_WrapperType]) -> Optional[_WrapperType]:
+        """Returns the outermost layer, starting from this one, of a given type.
+
+        Returns None if no layer of the chain is an instance of `wrapper_type`.
+        """
+        environment: dm_env.Environment = self
+        while isinstance(environment, EnvironmentWrapper):
+            if isinstance(environment, wrapper_type):
+                return environment
+            environment = environment.environment
+        return None
+
+    def clear_attribute_cache(self) -> None:
+        """Forgets which layers own forwarded attributes, in the whole chain."""
+        environment: dm_env.Environment = self
+        while isinstance(environment, EnvironmentWrapper):
+            environment.__dict__.pop("_attribute_owners", None)
+            environment = environment.environment
+
+    def clear_spec_cache(self) -> None:
+        """Forgets memoized specs, in the whole chain."""
+        environment: dm_env.Environment = self
+        while isinstance(environment, EnvironmentWrapper):
+            environment.__dict__.pop("_spec_cache", None)
+            environment = environment.environment
+
+    def register_observation_buffers(self, buffers: Optional[Any]) -> None:
+        """Registers caller-owned arrays that observations are written into.
+
+        `buffers` must have the structure of `observation_spec()`, with one
+        writeable, C-contiguous array of the spec's shape and dtype per leaf. Once
+        registered, the observation of every timestep returned by `step()` and
+        `reset()` is `buffers` itself, overwritten on each call. This lets callers
+        have observations land directly in e.g. a replay slot or a shared-memory
+        batch. Pass None to unregister.
+
+        Wrappers that produce their own observations write them straight into the
+        buffers. Wrappers that set `_passes_observation_through` forward the
+        buffers to the wrapped environment. Other wrappers raise.
+
+        Raises:
+          ValueError: If this wrapper can neither write into nor forward buffers.
+        """
+        if not self._passes_observation_through or not isinstance(
+            self._environment, EnvironmentWrapper
+        ):
+            raise ValueError(
+                f"{type(self).__name__} does not support observation buffers."
+            )
+        self._environment.register_observation_buffers(buffers)
+
+    def _set_consumed_observation_keys(self, keys: Optional[FrozenSet[str]]) -> None:
+        """Records the observation keys read further out, for the whole chain.
+
+        Args:
+          keys: Keys of this wrapper's dict observation that the layers wrapping
+            it read, or None if they may read the whole observation.
+        """
+        self._consumed_observation_keys = keys
+        if isinstance(self._environment, EnvironmentWrapper):
+            self._environment._set_consumed_observation_keys(
+                self._wrapped_observation_keys(keys)
+            )
+
+    def _wrapped_observation_keys(
+        self, keys: Optional[FrozenSet[str]]
+    ) -> Optional[FrozenSet[str]]:
+        """Returns the keys of the wrapped environment's observation that are read.
+
+        `keys` are the keys of this wrapper's observation read further out. By
+        default, wrappers may read the whole observation, even if they pass it
+        through unchanged. Wrappers that never read observations, transform them
+        key by key, or drop keys should override this.
+        """
+        del keys  # Unused.
+        return None
+
     # The following lines are necessary because methods defined in
     # `dm_env.Environment` are not delegated through `__getattr__`, which would
     # only be used to expose methods or properties that are not defined in the
@@ -70,12 +235,41 @@ class EnvironmentWrapper(dm_env.Environment):
         return self._environment.close()
 
 
+def _find_attribute_owner(
+    environment: dm_env.Environment, name: str
+) -> dm_env.Environment:
+    """Returns the outermost layer of a chain that defines attribute `name`.
+
+    Wrappers are checked statically, without triggering their `__getattr__` or
+    evaluating their properties, so the chain is walked iteratively rather than
+    through one `__getattr__` call per layer. The innermost environment is
+    returned if no wrapper defines the attribute.
+    """
+    while isinstance(environment, EnvironmentWrapper):
+        try:
+            inspect.getattr_static(environment, name)
+        except AttributeError:
+            environment = object.__getattribute__(environment, "_environment")
+        else:
+            return environment
+    return environment
+
+
 def wrap_all(
     environment: dm_env.Environment,
     wrappers: Sequence[Callable[[dm_env.Environment], dm_env.Environment]],
+    prune_observations: bool = False,
 ) -> dm_env.Environment:
-    """Given an environment, wrap it in a list of wrappers."""
+    """Given an environment, wrap it in a list of wrappers.
+
+    If `prune_observations` is True, the observation keys read by each layer are
+    passed down the chain once it is built, so that inner wrappers skip the keys
+    dropped further out, e.g. by `ConcatObservationWrapper(name_filter=...)` or
+    `ObservationProjectionWrapper`.
+    """
     for w in wrappers:
         environment = w(environment)
 
+    if prune_observations and isinstance(environment, EnvironmentWrapper):
+        environment._set_consumed_observation_keys(None)
     return environment
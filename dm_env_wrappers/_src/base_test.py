@@ -0,0 +1,239 @@
+"""Tests for base.py."""
+
+import pickle
+
+import dm_env
+import numpy as np
+from absl.testing import absltest
+from dm_env import specs
+
+from dm_env_wrappers._src import (
+    base,
+    concatenate_observations,
+    frame_stacking,
+    observation_action_reward,
+    single_precision,
+    step_limit,
+)
+
+
+class _FakeEnvironment(dm_env.Environment):
+    """A mock environment with a mutable attribute."""
+
+    def __init__(self) -> None:
+        self.physics = object()
+        self.num_spec_calls = 0
+
+    def reset(self) -> dm_env.TimeStep:
+        return dm_env.restart(0)
+
+    def step(self, action) -> dm_env.TimeStep:
+        del action  # Unused.
+        return dm_env.transition(1, 1, 1)
+
+    def observation_spec(self):
+        self.num_spec_calls += 1
+        return None
+
+    def action_spec(self):
+        return None
+
+
+class _DictObservationEnvironment(dm_env.Environment):
+    """A mock environment with a dictionary observation."""
+
+    def __init__(self) -> None:
+        self._count = 0.0
+
+    def reset(self) -> dm_env.TimeStep:
+        self._count = 0.0
+        return dm_env.restart(self._observation())
+
+    def step(self, action) -> dm_env.TimeStep:
+        del action  # Unused.
+        self._count += 1.0
+        return dm_env.transition(1.0, self._observation())
+
+    def observation_spec(self):
+        return {
+            "a": specs.Array(shape=(2,), dtype=np.float64),
+            "b": specs.Array(shape=(3,), dtype=np.float64),
+        }
+
+    def action_spec(self):
+        return specs.Array(shape=(), dtype=np.int32)
+
+    def _observation(self):
+        return {"a": np.full(2, self._count), "b": np.full(3, -self._count)}
+
+
+class _NamedWrapper(base.EnvironmentWrapper):
+    name = "named"
+
+
+class EnvironmentWrapperTest(absltest.TestCase):
+    """Tests for EnvironmentWrapper."""
+
+    def test_attribute_forwarding_reads_fresh_values(self) -> None:
+        inner = _FakeEnvironment()
+        env = base.wrap_all(inner, [base.EnvironmentWrapper] * 10)
+        self.assertIs(env.physics, inner.physics)
+
+        # Only the owning layer is cached, so reassigned attributes are picked up.
+        inner.physics = object()
+        self.assertIs(env.physics, inner.physics)
+
+        with self.assertRaises(AttributeError):
+            env.missing_attribute
+
+    def test_attribute_owned_by_intermediate_wrapper(self) -> None:
+        env = base.wrap_all(
+            _FakeEnvironment(), [_NamedWrapper] + [base.EnvironmentWrapper] * 3
+        )
+        self.assertEqual(env.name, "named")
+
+    def test_innermost_and_find_wrapper(self) -> None:
+        inner = _FakeEnvironment()
+        env = base.wrap_all(
+            inner,
+            [
+                base.EnvironmentWrapper,
+                lambda e: step_limit.StepLimitWrapper(e, step_limit=5),
+                base.EnvironmentWrapper,
+            ],
+        )
+        self.assertIs(env.innermost, inner)
+        wrapper = env.find_wrapper(step_limit.StepLimitWrapper)
+        self.assertIsInstance(wrapper, step_limit.StepLimitWrapper)
+        self.assertIs(env.find_wrapper(base.EnvironmentWrapper), env)
+        self.assertIsNone(env.find_wrapper(_NamedWrapper))
+
+    def test_forwards_unwrapped(self) -> None:
+        inner = _FakeEnvironment()
+        inner.unwrapped = object()
+        env = base.wrap_all(inner, [base.EnvironmentWrapper] * 2)
+        self.assertIs(env.unwrapped, inner.unwrapped)
+
+    def test_attribute_lookup_does_not_evaluate_properties(self) -> None:
+        class _PropertyWrapper(base.EnvironmentWrapper):
+            num_calls = 0
+
+            @property
+            def value(self):
+                _PropertyWrapper.num_calls += 1
+                return "value"
+
+        env = base.wrap_all(
+            _FakeEnvironment(), [_PropertyWrapper, base.EnvironmentWrapper]
+        )
+        self.assertEqual(env.value, "value")
+        self.assertEqual(_PropertyWrapper.num_calls, 1)
+
+    def test_specs_are_memoized(self) -> None:
+        class _SpecWrapper(base.EnvironmentWrapper):
+            @base.memoize_spec
+            def observation_spec(self):
+                return ("wrapped", super().observation_spec())
+
+        inner = _FakeEnvironment()
+        env = base.wrap_all(
+            inner, [base.EnvironmentWrapper, _SpecWrapper, base.EnvironmentWrapper]
+        )
+        spec = env.observation_spec()
+        self.assertEqual(spec, ("wrapped", None))
+        self.assertIs(env.observation_spec(), spec)
+        self.assertEqual(inner.num_spec_calls, 1)
+
+        env.clear_spec_cache()
+        self.assertEqual(env.observation_spec(), ("wrapped", None))
+        self.assertEqual(inner.num_spec_calls, 2)
+
+    def test_specs_are_not_memoized_by_default(self) -> None:
+        def make_wrapper_type(value):
+            # Classes built here share a qualified name.
+            class _SpecWrapper(base.EnvironmentWrapper):
+                @base.memoize_spec
+                def reward_spec(self):
+                    return value
+
+                def observation_spec(self):
+                    return self.spec
+
+            return _SpecWrapper
+
+        env = make_wrapper_type("inner")(_FakeEnvironment())
+        env = make_wrapper_type("outer")(env)
+        env.spec = "before"
+        self.assertEqual(env.observation_spec(), "before")
+        env.spec = "after"
+        self.assertEqual(env.observation_spec(), "after")
+        self.assertEqual(env.reward_spec(), "outer")
+        self.assertEqual(env.environment.reward_spec(), "inner")
+
+    def test_pickle_after_spec_queries(self) -> None:
+        env = base.wrap_all(
+            _DictObservationEnvironment(),
+            [
+                single_precision.SinglePrecisionWrapper,
+                concatenate_observations.ConcatObservationWrapper,
+            ],
+        )
+        spec = env.observation_spec()
+        self.assertIn("_spec_cache", env.environment.__dict__)
+        restored = pickle.loads(pickle.dumps(env))
+        self.assertEqual(restored.observation_spec(), spec)
+        restored.reset()
+        np.testing.assert_array_equal(
+            restored.step(0).observation, [1.0, 1.0, -1.0, -1.0, -1.0]
+        )
+
+    def test_observation_buffers(self) -> None:
+        env = base.wrap_all(
+            _DictObservationEnvironment(),
+            [
+                single_precision.SinglePrecisionWrapper,
+                lambda e: frame_stacking.FrameStackingWrapper(e, 2, flatten=True),
+                concatenate_observations.ConcatObservationWrapper,
+                lambda e: step_limit.StepLimitWrapper(e, step_limit=5),
+            ],
+        )
+        spec = env.observation_spec()
+        buffer = np.zeros(spec.shape, dtype=spec.dtype)
+        env.register_observation_buffers(buffer)
+
+        env.reset()
+        timestep = env.step(0)
+        self.assertIs(timestep.observation, buffer)
+        np.testing.assert_array_equal(buffer, [0, 1, 0, 1, 0, -1, 0, -1, 0, -1])
+
+        with self.assertRaises(ValueError):
+            env.register_observation_buffers(np.zeros(3, dtype=spec.dtype))
+
+    def test_observation_buffers_raises_for_unsupported_wrapper(self) -> None:
+        env = observation_action_reward.ObservationActionRewardWrapper(
+            single_precision.SinglePrecisionWrapper(_DictObservationEnvironment())
+        )
+        buffers = {
+            k: np.zeros(s.shape, s.dtype) for k, s in env.observation_spec().items()
+        }
+        with self.assertRaises(ValueError):
+            env.register_observation_buffers(buffers)
+
+    def test_observation_buffers_raises_for_spec_preserving_transform(self) -> None:
+        class _NegateWrapper(base.EnvironmentWrapper):
+            def step(self, action) -> dm_env.TimeStep:
+                timestep = self._environment.step(action)
+                return timestep._replace(observation=-timestep.observation)
+
+        env = _NegateWrapper(
+            concatenate_observations.ConcatObservationWrapper(
+                _DictObservationEnvironment()
+            )
+        )
+        spec = env.observation_spec()
+        with self.assertRaises(ValueError):
+            env.register_observation_buffers(np.zeros(spec.shape, spec.dtype))
+
+
+if __name__ == "__main__":
+    absltest.main()
@@ -40,6 +40,9 @@ class CanonicalSpecWrapper(base.EnvironmentWrapper):
     to +/- 1.
     """
 
+    _passes_observation_through = True
+    _supports_mutable_timesteps = True
+
     def __init__(self, environment: dm_env.Environment, clip: bool = False):
         super().__init__(environment)
         self._action_spec = environment.action_spec()
@@ -49,6 +52,7 @@ class CanonicalSpecWrapper(base.EnvironmentWrapper):
         scaled_action = _scale_nested_action(action, self._action_spec, self._clip)
         return self._environment.step(scaled_action)
 
+    @base.memoize_spec
     def action_spec(self):
         return _convert_spec(self._environment.action_spec())
 
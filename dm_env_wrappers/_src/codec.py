@@ -0,0 +1,192 @@
+"""Binary serialization of nests of arrays and timesteps, laid out from specs.
+
+The layout of every leaf is fixed by the specs, so encoded values carry no
+metadata and are decoded as numpy views into the encoded buffer, without
+copying. Leaves are placed in the order of `tree.flatten` of their spec, each
+aligned to its dtype, and encoded sizes are padded to a multiple of 8 bytes so
+that several values can be packed back to back:
+
+    codec = TimeStepCodec(env.observation_spec(), env.reward_spec())
+    buffer = codec.encode(timestep)
+    timestep = codec.decode(buffer)  # Views into `buffer`.
+
+Decoded arrays are only writeable if the buffer is, e.g. a `bytearray`, and are
+only valid as long as the buffer isn't overwritten.
+"""
+
+from typing import Any, Optional
+
+import dm_env
+import numpy as np
+import tree
+from dm_env import specs
+
+_ALIGNMENT = 8
+
+
+class NestCodec:
+    """Encodes a nest of arrays matching a spec into a fixed-size byte buffer."""
+
+    def __init__(self, nested_spec) -> None:
+        """Initializes a new NestCodec.
+
+        Args:
+          nested_spec: The (possibly nested) spec of the values to encode. Object
+            dtypes, such as those of `StringArray` specs, are not supported.
+        """
+        self._nested_spec = nested_spec
+        self._is_nested = tree.is_nested(nested_spec)
+        self._leaves = []
+        offset = 0
+        for spec in tree.flatten(nested_spec):
+            dtype = np.dtype(spec.dtype)
+            if dtype.hasobject:
+                raise ValueError(f"Cannot serialize values of dtype {dtype}.")
+            shape = tuple(spec.shape)
+            offset = _align(offset, dtype.alignment)
+            self._leaves.append((offset, shape, dtype, int(np.prod(shape))))
+            offset += dtype.itemsize * int(np.prod(shape))
+        self._nbytes = _align(offset, _ALIGNMENT)
+
+    @property
+    def nbytes(self) -> int:
+        """Returns the size of an encoded value in bytes."""
+        return self._nbytes
+
+    def encode(self, nest, out: Optional[Any] = None, offset: int = 0) -> Any:
+        """Encodes a nest of arrays.
+
+        Args:
+          nest: The value to encode. Leaves are cast to the dtype of their spec and
+            must have its shape.
+          out: Writeable buffer to encode into, e.g. a `bytearray`. A new
+            `bytearray` is allocated if None.
+          offset: Offset in `out` to encode at.
+
+        Returns:
+          The buffer holding the encoded value.
+        """
+        if out is None:
+            out = bytearray(self._nbytes)
+        values = tree.flatten(nest) if self._is_nested else [nest]
+        if len(values) != len(self._leaves):
+            raise ValueError(f"Expected {len(self._leaves)} leaves, got {len(values)}.")
+        for value, (leaf_offset, shape, dtype, size) in zip(values, self._leaves):
+            if np.shape(value) != shape:
+                raise ValueError(
+                    f"Expected a value of shape {shape}, got {np.shape(value)}."
+                )
+            view = np.frombuffer(out, dtype, size, offset + leaf_offset)
+            view[:] = np.ravel(value)
+        return out
+
+    def decode(self, buffer, offset: int = 0):
+        """Returns the value encoded at `offset` of `buffer`, as views into it."""
+        values = [
+            np.frombuffer(buffer, dtype, size, offset + leaf_offset).reshape(shape)
+            for leaf_offset, shape, dtype, size in self._leaves
+        ]
+        if not self._is_nested:
+            return values[0]
+        return tree.unflatten_as(self._nested_spec, values)
+
+
+class TimeStepCodec:
+    """Encodes `dm_env.TimeStep`s into a fixed-size byte buffer.
+
+    The step type takes the first 8 bytes, followed by the reward, the discount
+    and the observation. The reward and discount of FIRST timesteps are encoded
+    as zeros and ones, and decoded back as None.
+    """
+
+    def __init__(
+        self,
+        observation_spec,
+        reward_spec=specs.Array(shape=(), dtype=float, name="reward"),
+        discount_spec=specs.BoundedArray(
+            shape=(), dtype=float, minimum=0.0, maximum=1.0, name="discount"
+        ),
+    ) -> None:
+        """Initializes a new TimeStepCodec.
+
+        Args:
+          observation_spec: The environment's observation spec.
+          reward_spec: The environment's reward spec. Defaults to that of
+            `dm_env.Environment`.
+          discount_spec: The environment's discount spec. Defaults to that of
+            `dm_env.Environment`.
+        """
+        self._reward = NestCodec(reward_spec)
+        self._discount = NestCodec(discount_spec)
+        self._observation = NestCodec(observation_spec)
+        self._reward_offset = _ALIGNMENT
+        self._discount_offset = self._reward_offset + self._reward.nbytes
+        self._observation_offset = self._discount_offset + self._discount.nbytes
+        self._nbytes = self._observation_offset + self._observation.nbytes
+        self._first_reward = tree.map_structure(
+            lambda s: np.zeros(s.shape, s.dtype), reward_spec
+        )
+        self._first_discount = tree.map_structure(
+            lambda s: np.ones(s.shape, s.dtype), discount_spec
+        )
+
+    @classmethod
+    def from_environment(cls, environment: dm_env.Environment) -> "TimeStepCodec":
+        """Builds a codec for the timesteps of `environment`."""
+        return cls(
+            environment.observation_spec(),
+            environment.reward_spec(),
+            environment.discount_spec(),
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """Returns the size of an encoded timestep in bytes."""
+        return self._nbytes
+
+    def encode(
+        self, timestep: dm_env.TimeStep, out: Optional[Any] = None, offset: int = 0
+    ) -> Any:
+        """Encodes a timestep.
+
+        Args:
+          timestep: The timestep to encode.
+          out: Writeable buffer to encode into, e.g. a `bytearray`. A new
+            `bytearray` is allocated if None.
+          offset: Offset in `out` to encode at.
+
+        Returns:
+          The buffer holding the encoded timestep.
+        """
+        if out is None:
+            out = bytearray(self._nbytes)
+        out[offset] = timestep.step_type
+        if timestep.first():
+            reward, discount = self._first_reward, self._first_discount
+        else:
+            reward, discount = timestep.reward, timestep.discount
+        self._reward.encode(reward, out, offset + self._reward_offset)
+        self._discount.encode(discount, out, offset + self._discount_offset)
+        self._observation.encode(
+            timestep.observation, out, offset + self._observation_offset
+        )
+        return out
+
+    def decode(self, buffer, offset: int = 0) -> dm_env.TimeStep:
+        """Returns the timestep encoded at `offset` of `buffer`, as views into it."""
+        step_type = dm_env.StepType(buffer[offset])
+        observation = self._observation.decode(
+            buffer, offset + self._observation_offset
+        )
+        if step_type == dm_env.StepType.FIRST:
+            return dm_env.TimeStep(step_type, None, None, observation)
+        return dm_env.TimeStep(
+            step_type,
+            self._reward.decode(buffer, offset + self._reward_offset),
+            self._discount.decode(buffer, offset + self._discount_offset),
+            observation,
+        )
+
+
+def _align(offset: int, alignment: int) -> int:
+    return (offset + alignment - 1) // alignment * alignment
@@ -0,0 +1,94 @@
+"""Tests for codec.py."""
+
+import dm_env
+import numpy as np
+from absl.testing import absltest
+from dm_env import specs
+
+from dm_env_wrappers._src import codec
+
+_OBSERVATION_SPEC = {
+    "flag": specs.Array(shape=(), dtype=np.bool_),
+    "pixels": specs.Array(shape=(3, 5), dtype=np.uint8),
+    "position": specs.Array(shape=(3,), dtype=np.float64),
+    "sensors": (
+        specs.Array(shape=(), dtype=np.int32),
+        specs.Array(shape=(2,), dtype=np.float32),
+    ),
+}
+
+
+def _observation(value: int):
+    return {
+        "flag": np.bool_(value % 2),
+        "pixels": np.full((3, 5), value, dtype=np.uint8),
+        "position": np.arange(3, dtype=np.float64) + value,
+        "sensors": (np.int32(value), np.full(2, value, dtype=np.float32)),
+    }
+
+
+class NestCodecTest(absltest.TestCase):
+    """Tests for NestCodec."""
+
+    def test_leaves_are_aligned(self) -> None:
+        nest_codec = codec.NestCodec(_OBSERVATION_SPEC)
+        self.assertEqual(nest_codec.nbytes % 8, 0)
+        decoded = nest_codec.decode(nest_codec.encode(_observation(3)))
+        self.assertEqual(decoded["position"].ctypes.data % 8, 0)
+        self.assertEqual(decoded["sensors"][0].ctypes.data % 4, 0)
+
+    def test_rejects_invalid_values(self) -> None:
+        nest_codec = codec.NestCodec(specs.Array(shape=(2,), dtype=np.float32))
+        with self.assertRaises(ValueError):
+            nest_codec.encode(np.zeros(3))
+        with self.assertRaises(ValueError):
+            codec.NestCodec(specs.StringArray(shape=()))
+
+
+class TimeStepCodecTest(absltest.TestCase):
+    """Tests for TimeStepCodec."""
+
+    def test_round_trip(self) -> None:
+        timestep_codec = codec.TimeStepCodec(_OBSERVATION_SPEC)
+        buffer = bytearray(2 * timestep_codec.nbytes)
+        timestep_codec.encode(dm_env.restart(_observation(1)), buffer)
+        timestep_codec.encode(
+            dm_env.transition(2.5, _observation(2), 0.5), buffer, timestep_codec.nbytes
+        )
+
+        first = timestep_codec.decode(buffer)
+        self.assertTrue(first.first())
+        self.assertIsNone(first.reward)
+        self.assertIsNone(first.discount)
+
+        second = timestep_codec.decode(buffer, timestep_codec.nbytes)
+        self.assertTrue(second.mid())
+        self.assertEqual(second.reward, 2.5)
+        self.assertEqual(second.discount, 0.5)
+
+        for timestep, value in ((first, 1), (second, 2)):
+            expected = _observation(value)
+            for key in ("flag", "pixels", "position"):
+                np.testing.assert_array_equal(timestep.observation[key], expected[key])
+                self.assertEqual(timestep.observation[key].dtype, expected[key].dtype)
+            for actual, leaf in zip(
+                timestep.observation["sensors"], expected["sensors"]
+            ):
+                np.testing.assert_array_equal(actual, leaf)
+                self.assertEqual(actual.shape, np.shape(leaf))
+
+    def test_decodes_views(self) -> None:
+        timestep_codec = codec.TimeStepCodec(_OBSERVATION_SPEC)
+        buffer = timestep_codec.encode(dm_env.transition(1.0, _observation(1)))
+        timestep = timestep_codec.decode(buffer)
+        self.assertFalse(timestep.observation["pixels"].flags.owndata)
+
+        timestep_codec.encode(dm_env.transition(1.0, _observation(4)), buffer)
+        self.assertEqual(timestep.observation["pixels"][0, 0], 4)
+
+        read_only = timestep_codec.decode(bytes(buffer))
+        self.assertFalse(read_only.observation["position"].flags.writeable)
+
+
+if __name__ == "__main__":
+    absltest.main()
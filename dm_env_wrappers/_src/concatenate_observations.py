@@ -20,10 +20,10 @@ import dm_env
 import numpy as np
 import tree
 
-from dm_env_wrappers._src import base
+from dm_env_wrappers._src import base, spec_utils
 
 
-def _concat(values) -> np.ndarray:
+def _concat(values, out: Optional[np.ndarray] = None) -> np.ndarray:
     """Concatenates the leaves of `values` along the leading dimension.
 
     Treats scalars as 1d arrays and expects that the shapes of all leaves are
@@ -31,12 +31,13 @@ def _concat(values) -> np.ndarray:
 
     Args:
       values: the nested arrays to concatenate.
+      out: optional array to write the result into.
 
     Returns:
       The concatenated array.
     """
     leaves = list(map(np.atleast_1d, tree.flatten(values)))
-    return np.concatenate(leaves)
+    return np.concatenate(leaves, out=out)
 
 
 def _zeros_like(nest, dtype=None):
@@ -55,6 +56,8 @@ class ConcatObservationWrapper(base.EnvironmentWrapper):
     their names, see tree.flatten for more information.
     """
 
+    _supports_mutable_timesteps = True
+
     def __init__(
         self,
         environment: dm_env.Environment,
@@ -84,7 +87,7 @@ class ConcatObservationWrapper(base.EnvironmentWrapper):
 
     def _convert_observation(self, observation):
         obs = {k: observation[k] for k in self._obs_names}
-        return _concat(obs)
+        return _concat(obs, out=self._observation_buffers)
 
     def step(self, action) -> dm_env.TimeStep:
         timestep = self._environment.step(action)
@@ -100,3 +103,12 @@ class ConcatObservationWrapper(base.EnvironmentWrapper):
 
     def observation_spec(self):
         return self._observation_spec
+
+    def register_observation_buffers(self, buffers) -> None:
+        self._observation_buffers = spec_utils.check_buffers(
+            buffers, self.observation_spec()
+        )
+
+    def _wrapped_observation_keys(self, keys):
+        del keys  # The concatenated observation is a single array.
+        return frozenset(self._obs_names)
@@ -0,0 +1,68 @@
+"""Tests for mujoco/dm_control.py."""
+
+import os
+import tempfile
+
+import numpy as np
+from absl.testing import absltest
+from dm_control import suite
+
+from dm_env_wrappers._src.mujoco import dm_control
+
+
+def _load_cartpole(**kwargs) -> dm_control.DmControlWrapper:
+    env = suite.load("cartpole", "swingup", task_kwargs={"random": 0})
+    return dm_control.DmControlWrapper(env, **kwargs)
+
+
+class DmControlWrapperTest(absltest.TestCase):
+    """Tests for DmControlWrapper."""
+
+    def test_resets_restore_pooled_states(self) -> None:
+        env = _load_cartpole(initial_state_pool_size=2)
+        pool = []
+        for _ in range(2):
+            env.reset()
+            pool.append(env.physics.get_state())
+
+        for _ in range(5):
+            timestep = env.reset()
+            self.assertTrue(timestep.first())
+            state = env.physics.get_state()
+            self.assertTrue(any(np.array_equal(state, s) for s in pool))
+            # The first observation matches the restored state.
+            np.testing.assert_array_equal(
+                timestep.observation["position"][0], env.physics.cart_position()
+            )
+            env.step(env.action_spec().generate_value())
+
+    def test_refresh_replaces_pooled_states(self) -> None:
+        env = _load_cartpole(initial_state_pool_size=1, initial_state_refresh_every=2)
+        env.reset()
+        first_state = env.physics.get_state()
+        env.reset()
+        self.assertFalse(np.array_equal(env.physics.get_state(), first_state))
+        env.reset()
+        self.assertFalse(np.array_equal(env.physics.get_state(), first_state))
+
+    def test_save_and_load_pool(self) -> None:
+        env = _load_cartpole(initial_state_pool_size=3)
+        env.fill_initial_state_pool()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "pool.npy")
+            env.save_initial_state_pool(path)
+
+            loaded = _load_cartpole(initial_state_path=path)
+            pool = np.load(path)
+            self.assertEqual(pool.shape[0], 3)
+            loaded.reset()
+            state = loaded.physics.get_state()
+            self.assertTrue(any(np.array_equal(state, s) for s in pool))
+
+    def test_raises_value_error_on_refreshing_loaded_pool(self) -> None:
+        with self.assertRaises(ValueError):
+            _load_cartpole(initial_state_path="pool.npy", initial_state_refresh_every=1)
+
+
+if __name__ == "__main__":
+    absltest.main()
@@ -0,0 +1,125 @@
+"""Building environments in parallel worker processes.
+
+Building a wrapped `dm_control` environment compiles its MJCF model, which can
+take seconds. The helpers here run environment factories in a process pool and
+send the built environments back to the caller by pickling them:
+
+    factories = [
+        functools.partial(suite.load, "cartpole", "swingup", task_kwargs={"random": i})
+        for i in range(64)
+    ]
+    environments = make_environments(factories, preload_modules=["dm_control.suite"])
+
+Factories must be picklable, e.g. module-level functions or `functools.partial`
+objects wrapping them, and so must the environments they return.
+"""
+
+import collections
+import concurrent.futures
+import multiprocessing
+from typing import Callable, Deque, List, Optional, Sequence
+
+import dm_env
+
+EnvironmentFactory = Callable[[], dm_env.Environment]
+
+
+def make_environments(
+    environment_factories: Sequence[EnvironmentFactory],
+    num_workers: Optional[int] = None,
+    preload_modules: Sequence[str] = (),
+) -> List[dm_env.Environment]:
+    """Builds environments in a process pool.
+
+    Args:
+      environment_factories: Picklable callables returning the environments.
+      num_workers: Number of worker processes. Defaults to the number of CPUs.
+      preload_modules: Modules imported once by the forkserver process, so that
+        workers forked from it don't each import them again. Ignored if the
+        forkserver is already running or unavailable on this platform.
+
+    Returns:
+      The environments, in the order of their factories.
+    """
+    with _make_executor(num_workers, preload_modules) as executor:
+        futures = [executor.submit(factory) for factory in environment_factories]
+        return [future.result() for future in futures]
+
+
+class EnvironmentPool:
+    """Keeps a number of environments built ahead of time in worker processes.
+
+    Every call to `acquire()` returns a ready environment and starts building its
+    replacement in the background, so that environments can be recreated quickly,
+    e.g. after a crash. Pools are cheap to replace when the configuration changes
+    as long as they share the same `preload_modules`.
+    """
+
+    def __init__(
+        self,
+        environment_factory: EnvironmentFactory,
+        size: int,
+        num_workers: Optional[int] = None,
+        preload_modules: Sequence[str] = (),
+    ) -> None:
+        """Initializes a new EnvironmentPool.
+
+        Args:
+          environment_factory: A picklable callable returning an environment.
+          size: Number of environments to keep ready or in the making.
+          num_workers: Number of worker processes. Defaults to `size`.
+          preload_modules: Modules imported once by the forkserver process. See
+            `make_environments()`.
+        """
+        if size <= 0:
+            raise ValueError("size must be a positive integer.")
+        self._environment_factory = environment_factory
+        self._executor = _make_executor(num_workers or size, preload_modules)
+        self._futures: Deque[concurrent.futures.Future] = collections.deque(
+            self._executor.submit(environment_factory) for _ in range(size)
+        )
+
+    def acquire(self) -> dm_env.Environment:
+        """Returns a ready environment and starts building its replacement.
+
+        This blocks if the oldest environment of the pool is still being built.
+        """
+        if self._executor is None:
+            raise ValueError("The pool has been closed.")
+        future = self._futures.popleft()
+        self._futures.append(self._executor.submit(self._environment_factory))
+        return future.result()
+
+    def close(self) -> None:
+        """Shuts down the workers and closes the environments left in the pool."""
+        if self._executor is None:
+            return
+        for future in self._futures:
+            future.cancel()
+        self._executor.shutdown()
+        for future in self._futures:
+            if not future.cancelled() and future.exception() is None:
+                future.result().close()
+        self._futures.clear()
+        self._executor = None
+
+    def __enter__(self) -> "EnvironmentPool":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+def _make_executor(
+    num_workers: Optional[int], preload_modules: Sequence[str]
+) -> concurrent.futures.ProcessPoolExecutor:
+    # Workers are forked from a single server process that has imported the
+    # preloaded modules, which is much faster than spawning fresh interpreters and
+    # safer than forking a parent that may already be running threads.
+    try:
+        context = multiprocessing.get_context("forkserver")
+    except ValueError:
+        context = multiprocessing.get_context("spawn")
+    else:
+        context.set_forkserver_preload(list(preload_modules))
+    return concurrent.futures.ProcessPoolExecutor(num_workers, mp_context=context)
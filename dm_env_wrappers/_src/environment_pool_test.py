@@ -0,0 +1,88 @@
+"""Tests for environment_pool.py."""
+
+import functools
+
+import numpy as np
+from absl.testing import absltest
+from dm_control import suite
+
+from dm_env_wrappers._src import base, concatenate_observations, environment_pool
+from dm_env_wrappers._src.mujoco import dm_control
+
+
+def _factory(seed: int):
+    return functools.partial(
+        suite.load, "cartpole", "balance", task_kwargs={"random": seed}
+    )
+
+
+def _make_wrapped_environment(seed: int):
+    return base.wrap_all(
+        _factory(seed)(),
+        [
+            dm_control.DmControlWrapper,
+            concatenate_observations.ConcatObservationWrapper,
+        ],
+    )
+
+
+class MakeEnvironmentsTest(absltest.TestCase):
+    """Tests for make_environments."""
+
+    def test_builds_environments_in_order(self) -> None:
+        environments = environment_pool.make_environments(
+            [_factory(i) for i in range(3)],
+            num_workers=2,
+            preload_modules=["dm_control.suite"],
+        )
+        self.assertLen(environments, 3)
+        for seed, env in enumerate(environments):
+            expected = _factory(seed)().reset()
+            timestep = env.reset()
+            for key, value in expected.observation.items():
+                np.testing.assert_array_equal(timestep.observation[key], value)
+            env.close()
+
+    def test_builds_wrapped_environments(self) -> None:
+        environments = environment_pool.make_environments(
+            [functools.partial(_make_wrapped_environment, i) for i in range(2)],
+            num_workers=2,
+        )
+        for seed, env in enumerate(environments):
+            self.assertIsInstance(
+                env.find_wrapper(dm_control.DmControlWrapper),
+                dm_control.DmControlWrapper,
+            )
+            expected = _make_wrapped_environment(seed)
+            self.assertEqual(env.observation_spec(), expected.observation_spec())
+            np.testing.assert_array_equal(
+                env.reset().observation, expected.reset().observation
+            )
+            env.close()
+
+
+class EnvironmentPoolTest(absltest.TestCase):
+    """Tests for EnvironmentPool."""
+
+    def test_acquire_returns_fresh_environments(self) -> None:
+        with environment_pool.EnvironmentPool(
+            _factory(0), size=2, num_workers=2
+        ) as pool:
+            environments = [pool.acquire() for _ in range(3)]
+            self.assertLen({id(env) for env in environments}, 3)
+            expected = _factory(0)().reset()
+            for env in environments:
+                np.testing.assert_array_equal(
+                    env.reset().observation["position"],
+                    expected.observation["position"],
+                )
+        with self.assertRaises(ValueError):
+            pool.acquire()
+
+    def test_invalid_size(self) -> None:
+        with self.assertRaises(ValueError):
+            environment_pool.EnvironmentPool(_factory(0), size=0)
+
+
+if __name__ == "__main__":
+    absltest.main()
@@ -19,6 +19,9 @@ class EpisodeStatisticsWrapper(base.EnvironmentWrapper):
     statistics are tracked.
     """
 
+    _passes_observation_through = True
+    _supports_mutable_timesteps = True
+
     def __init__(self, environment: dm_env.Environment, deque_size: int = 1) -> None:
         super().__init__(environment)
 
@@ -51,3 +54,6 @@ class EpisodeStatisticsWrapper(base.EnvironmentWrapper):
             "return": sum(self._return_queue) / len(self._return_queue),
             "length": sum(self._length_queue) / len(self._length_queue),
         }
+
+    def _wrapped_observation_keys(self, keys):
+        return keys
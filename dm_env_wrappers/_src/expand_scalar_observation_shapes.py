@@ -28,7 +28,7 @@ import numpy as np
 import tree
 from dm_env import specs
 
-from dm_env_wrappers._src import base
+from dm_env_wrappers._src import base, spec_utils
 
 
 class ExpandScalarObservationShapesWrapper(base.EnvironmentWrapper):
@@ -38,27 +38,69 @@ class ExpandScalarObservationShapesWrapper(base.EnvironmentWrapper):
     wrapper makes sure the environment returns a previous action with shape [1].
 
     This can be necessary when stacking observations with previous actions.
+
+    The scalar leaves are found once from the observation spec, and only those are
+    reshaped on each step. All other leaves are passed through untouched.
     """
 
+    _supports_mutable_timesteps = True
+
+    def __init__(self, environment: dm_env.Environment) -> None:
+        super().__init__(environment)
+        observation_spec = self._environment.observation_spec()
+        self._scalar_paths = [
+            path
+            for path, spec in tree.flatten_with_path(observation_spec)
+            if not spec.shape
+        ]
+        self._expand_observation = spec_utils.make_path_mapper(
+            _expand_scalar_array_shape, self._scalar_paths
+        )
+        self._observation_spec = tree.map_structure(
+            _expand_scalar_spec_shape, observation_spec
+        )
+
     def step(self, action: Any) -> dm_env.TimeStep:
         timestep = self._environment.step(action)
-        expanded_observation = tree.map_structure(
-            _expand_scalar_array_shape, timestep.observation
+        return timestep._replace(
+            observation=self._convert_observation(timestep.observation)
         )
-        return timestep._replace(observation=expanded_observation)
 
     def reset(self) -> dm_env.TimeStep:
         timestep = self._environment.reset()
-        expanded_observation = tree.map_structure(
-            _expand_scalar_array_shape, timestep.observation
+        return timestep._replace(
+            observation=self._convert_observation(timestep.observation)
         )
-        return timestep._replace(observation=expanded_observation)
 
     def observation_spec(self) -> specs.Array:
-        return tree.map_structure(
-            _expand_scalar_spec_shape, self._environment.observation_spec()
+        return self._observation_spec
+
+    def register_observation_buffers(self, buffers) -> None:
+        self._observation_buffers = spec_utils.check_buffers(
+            buffers, self.observation_spec()
         )
 
+    def _set_consumed_observation_keys(self, keys) -> None:
+        if not isinstance(self._environment.observation_spec(), dict):
+            # Keys only select entries of dict observations.
+            keys = None
+        super()._set_consumed_observation_keys(keys)
+        paths = self._scalar_paths
+        if keys is not None:
+            paths = [path for path in paths if path[0] in keys]
+        self._expand_observation = spec_utils.make_path_mapper(
+            _expand_scalar_array_shape, paths
+        )
+
+    def _wrapped_observation_keys(self, keys):
+        return keys
+
+    def _convert_observation(self, observation):
+        if self._observation_buffers is None:
+            return self._expand_observation(observation)
+        # Copying broadcasts scalars to the expanded shape of their buffer.
+        return spec_utils.write_to_buffers(self._observation_buffers, observation)
+
 
 def _expand_scalar_spec_shape(spec: specs.Array) -> specs.Array:
     if not spec.shape:
@@ -69,4 +111,5 @@ def _expand_scalar_spec_shape(spec: specs.Array) -> specs.Array:
 
 
 def _expand_scalar_array_shape(array: np.ndarray) -> np.ndarray:
-    return array if array.shape else np.expand_dims(array, axis=-1)
+    # Reshaping an array is a view; Python scalars are wrapped in a new array.
+    return np.reshape(array, (1,))
@@ -0,0 +1,69 @@
+"""Tests for expand_scalar_observation_shapes.py."""
+
+import dm_env
+import numpy as np
+from absl.testing import absltest
+from dm_env import specs
+
+from dm_env_wrappers._src import expand_scalar_observation_shapes
+
+
+class _FakeEnvironment(dm_env.Environment):
+    """A mock environment with a nested observation."""
+
+    def __init__(self) -> None:
+        self.observation = {
+            "position": np.zeros(3),
+            "time": np.float64(0.0),
+            "sensors": (np.zeros(2), np.int32(1)),
+        }
+
+    def reset(self) -> dm_env.TimeStep:
+        return dm_env.restart(self.observation)
+
+    def step(self, action) -> dm_env.TimeStep:
+        del action  # Unused.
+        return dm_env.transition(1.0, self.observation)
+
+    def observation_spec(self):
+        return {
+            "position": specs.Array(shape=(3,), dtype=np.float64),
+            "time": specs.Array(shape=(), dtype=np.float64),
+            "sensors": (
+                specs.Array(shape=(2,), dtype=np.float64),
+                specs.DiscreteArray(num_values=3, dtype=np.int32),
+            ),
+        }
+
+    def action_spec(self):
+        return specs.Array(shape=(), dtype=np.int32)
+
+
+class ExpandScalarObservationShapesWrapperTest(absltest.TestCase):
+    """Tests for ExpandScalarObservationShapesWrapper."""
+
+    def test_expands_scalar_leaves(self) -> None:
+        inner = _FakeEnvironment()
+        env = expand_scalar_observation_shapes.ExpandScalarObservationShapesWrapper(
+            inner
+        )
+
+        spec = env.observation_spec()
+        self.assertEqual(spec["time"].shape, (1,))
+        self.assertEqual(spec["sensors"][1].shape, (1,))
+        self.assertIs(env.observation_spec(), spec)
+
+        for timestep in (env.reset(), env.step(0)):
+            observation = timestep.observation
+            self.assertEqual(observation["time"].shape, (1,))
+            self.assertEqual(observation["sensors"][1].shape, (1,))
+            # Non-scalar leaves are passed through as is.
+            self.assertIs(observation["position"], inner.observation["position"])
+            self.assertIs(observation["sensors"][0], inner.observation["sensors"][0])
+
+        # The wrapped environment's observation is left untouched.
+        self.assertEqual(np.shape(inner.observation["time"]), ())
+
+
+if __name__ == "__main__":
+    absltest.main()
@@ -14,19 +14,22 @@
 
 """Frame stacking utilities."""
 
-import collections
+import copy
+from typing import Optional, Sequence
 
 import dm_env
 import numpy as np
 import tree
 from dm_env import specs as dm_env_specs
 
-from dm_env_wrappers._src import base
+from dm_env_wrappers._src import base, spec_utils
 
 
 class FrameStackingWrapper(base.EnvironmentWrapper):
     """Wrapper that stacks observations along a new final axis."""
 
+    _supports_mutable_timesteps = True
+
     def __init__(
         self,
         environment: dm_env.Environment,
@@ -51,11 +54,31 @@ class FrameStackingWrapper(base.EnvironmentWrapper):
             self._stackers,
             original_spec,
         )
+        # Observation keys to stack, if not all of them are read further out.
+        self._stacked_keys: Optional[Sequence[str]] = None
 
     def _process_timestep(self, timestep: dm_env.TimeStep) -> dm_env.TimeStep:
-        observation = tree.map_structure(
-            lambda stacker, x: stacker.step(x), self._stackers, timestep.observation
-        )
+        if self._observation_buffers is not None:
+            observation = tree.map_structure(
+                lambda stacker, x, out: stacker.step(x, out=out),
+                self._stackers,
+                timestep.observation,
+                self._observation_buffers,
+            )
+        elif self._stacked_keys is None:
+            observation = tree.map_structure(
+                lambda stacker, x: stacker.step(x),
+                self._stackers,
+                timestep.observation,
+            )
+        else:
+            observation = copy.copy(timestep.observation)
+            for key in self._stacked_keys:
+                observation[key] = tree.map_structure(
+                    lambda stacker, x: stacker.step(x),
+                    self._stackers[key],
+                    observation[key],
+                )
         return timestep._replace(observation=observation)
 
     def reset(self) -> dm_env.TimeStep:
@@ -69,13 +92,38 @@ class FrameStackingWrapper(base.EnvironmentWrapper):
     def observation_spec(self):
         return self._observation_spec
 
+    def register_observation_buffers(self, buffers) -> None:
+        self._observation_buffers = spec_utils.check_buffers(
+            buffers, self.observation_spec()
+        )
+
+    def _set_consumed_observation_keys(self, keys) -> None:
+        if not isinstance(self._stackers, dict):
+            # Keys only select entries of dict observations.
+            keys = None
+        super()._set_consumed_observation_keys(keys)
+        self._stacked_keys = None
+        if keys is not None:
+            self._stacked_keys = [k for k in self._stackers if k in keys]
+
+    def _wrapped_observation_keys(self, keys):
+        return keys
+
 
 class FrameStacker:
-    """Simple class for frame-stacking observations."""
+    """Simple class for frame-stacking observations.
+
+    Frames are copied into storage owned by the stacker, so callers may reuse
+    the arrays they pass to `step()`, e.g. preallocated observation buffers.
+    Every frame is written twice, at `i` and `i + num_frames` of a buffer holding
+    `2 * num_frames` frames, so that the stack is always one contiguous slice
+    ordered from oldest to newest.
+    """
 
     def __init__(self, num_frames: int, flatten: bool = False):
         self._num_frames = num_frames
         self._flatten = flatten
+        self._storage: Optional[np.ndarray] = None
         self.reset()
 
     @property
@@ -83,15 +131,43 @@ class FrameStacker:
         return self._num_frames
 
     def reset(self):
-        self._stack = collections.deque(maxlen=self._num_frames)
+        self._index = 0
+        self._empty = True
+
+    def step(self, frame: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Append frame to stack and return the stack.
 
-    def step(self, frame: np.ndarray) -> np.ndarray:
-        """Append frame to stack and return the stack."""
-        if not self._stack:
+        If `out` is given, the stack is written into it and `out` is returned.
+        """
+        frame = np.asarray(frame)
+        storage = self._storage
+        if (
+            storage is None
+            or storage.shape[1:] != frame.shape
+            or storage.dtype != frame.dtype
+        ):
+            storage = self._storage = np.zeros(
+                (2 * self._num_frames,) + frame.shape, dtype=frame.dtype
+            )
+        elif self._empty:
             # Fill stack with blank frames if empty.
-            self._stack.extend([np.zeros_like(frame)] * (self._num_frames - 1))
-        self._stack.append(frame)
-        stacked_frames = np.stack(self._stack, axis=-1)
+            storage[...] = 0
+        self._empty = False
+
+        storage[self._index] = frame
+        storage[self._index + self._num_frames] = frame
+        self._index = (self._index + 1) % self._num_frames
+        # The frames, oldest first, moved to a new final axis.
+        stack = np.moveaxis(
+            storage[self._index : self._index + self._num_frames], 0, -1
+        )
+        if out is not None:
+            # A view of `out` with the frames on their own, unflattened axis.
+            np.copyto(out.reshape(stack.shape), stack)
+            return out
+        # Always copy: the window is itself contiguous for scalar frames or a
+        # single frame, and would otherwise be overwritten by later steps.
+        stacked_frames = np.array(stack, order="C")
 
         if not self._flatten:
             return stacked_frames
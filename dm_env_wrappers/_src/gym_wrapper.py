@@ -23,6 +23,8 @@ import tree
 from gym import spaces
 from dm_env import specs
 
+from dm_env_wrappers._src import spec_utils
+
 
 class GymWrapper(dm_env.Environment):
     """Environment wrapper for OpenAI Gym environments.
@@ -43,6 +45,7 @@ class GymWrapper(dm_env.Environment):
         act_space = self._environment.action_space
         self._observation_spec = _convert_to_spec(obs_space, name="observation")
         self._action_spec = _convert_to_spec(act_space, name="action")
+        self._convert_observation = spec_utils.make_converter(self._observation_spec)
 
     def reset(self) -> dm_env.TimeStep:
         """Resets the episode."""
@@ -50,7 +53,7 @@ class GymWrapper(dm_env.Environment):
         observation = self._environment.reset()
         # Reset the diagnostic information.
         self._last_info = None
-        return dm_env.restart(observation)
+        return dm_env.restart(self._convert_observation(observation))
 
     def step(self, action) -> dm_env.TimeStep:
         """Steps the environment."""
@@ -71,6 +74,8 @@ class GymWrapper(dm_env.Environment):
             self.reward_spec(),
         )
 
+        observation = self._convert_observation(observation)
+
         if done:
             truncated = info.get("TimeLimit.truncated", False)
             if truncated:
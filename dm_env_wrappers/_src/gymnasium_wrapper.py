@@ -9,6 +9,12 @@ import tree
 from gymnasium import spaces
 from dm_env import specs
 
+from dm_env_wrappers._src import spec_utils
+
+# Values of `metadata["autoreset_mode"]` for gymnasium vector environments.
+_NEXT_STEP = "NextStep"
+_SAME_STEP = "SameStep"
+
 
 class GymnasiumWrapper(dm_env.Environment):
     """Environment wrapper for OpenAI Gym environments."""
@@ -26,6 +32,7 @@ class GymnasiumWrapper(dm_env.Environment):
         act_space = self._environment.action_space
         self._observation_spec = _convert_to_spec(obs_space, name="observation")
         self._action_spec = _convert_to_spec(act_space, name="action")
+        self._convert_observation = spec_utils.make_converter(self._observation_spec)
 
     def reset(self) -> dm_env.TimeStep:
         """Resets the episode."""
@@ -33,7 +40,7 @@ class GymnasiumWrapper(dm_env.Environment):
         observation, info = self._environment.reset()
         # Reset the diagnostic information.
         self._last_info = info
-        return dm_env.restart(observation)
+        return dm_env.restart(self._convert_observation(observation))
 
     def step(self, action) -> dm_env.TimeStep:
         """Steps the environment."""
@@ -57,6 +64,8 @@ class GymnasiumWrapper(dm_env.Environment):
             self.reward_spec(),
         )
 
+        observation = self._convert_observation(observation)
+
         if terminated or truncated:
             if truncated:
                 return dm_env.truncation(reward, observation)
@@ -93,6 +102,211 @@ class GymnasiumWrapper(dm_env.Environment):
         self._environment.close()
 
 
+class GymnasiumVectorWrapper(dm_env.Environment):
+    """Environment wrapper for Farama Gymnasium vector environments.
+
+    The wrapped `gymnasium.vector.VectorEnv` (sync or async) is exposed as a batched
+    dm_env environment: observations, rewards, discounts and step types all carry a
+    leading dimension of size `num_envs`. Sub-environments that are starting a new
+    episode have a FIRST step type, a reward of 0 and a discount of 1.
+
+    How episodes end depends on the autoreset mode of the vector environment:
+
+    - Next-step autoreset (the default since gymnasium 1.0): the step that ends an
+      episode is reported as LAST, with its reward and discount. The following
+      step resets the sub-environment, ignores its action and is reported as
+      FIRST. This maps exactly onto dm_env semantics.
+    - Same-step autoreset (the only mode before gymnasium 1.0): the sub-environment
+      is reset within the step that ends the episode, so the returned timesteps
+      never contain LAST entries. A sub-environment goes straight from MID to
+      FIRST, with the first observation of the new episode, like
+      `AutoResetWrapper(return_first=True)`. The terminal reward, discount and
+      observation only appear in `final_timestep`, until the next call, and are
+      lost unless the caller reads them from there.
+    """
+
+    # Note: we don't inherit from base.EnvironmentWrapper because that class
+    # assumes that the wrapped environment is a dm_env.Environment.
+
+    def __init__(self, environment: gym.vector.VectorEnv, seed: Optional[int] = None):
+        """Initializes a new GymnasiumVectorWrapper.
+
+        Args:
+          environment: Vector environment to wrap.
+          seed: Seed passed to the first reset of the vector environment, which
+            seeds its sub-environments. None leaves them unseeded.
+        """
+        self._environment = environment
+        self._seed = seed
+        self._num_envs = environment.num_envs
+        self._reset_next_step = True
+        self._last_info: Optional[Dict[str, Any]] = None
+        self._done = np.zeros(self._num_envs, dtype=bool)
+        self._final_timestep: Optional[dm_env.TimeStep] = None
+
+        autoreset_mode = environment.metadata.get("autoreset_mode")
+        if autoreset_mode is None:
+            # Before gymnasium 1.0 vector environments always reset on the same step.
+            if hasattr(gym.vector, "AutoresetMode"):
+                autoreset_mode = _NEXT_STEP
+            else:
+                autoreset_mode = _SAME_STEP
+        self._autoreset_mode = getattr(autoreset_mode, "value", autoreset_mode)
+        if self._autoreset_mode not in (_NEXT_STEP, _SAME_STEP):
+            raise ValueError(
+                f"Unsupported autoreset mode: {self._autoreset_mode}. "
+                "GymnasiumVectorWrapper requires next-step or same-step autoreset."
+            )
+
+        # Convert action and observation specs.
+        obs_space = self._environment.single_observation_space
+        act_space = self._environment.single_action_space
+        self._observation_spec = spec_utils.batch_spec(
+            _convert_to_spec(obs_space, name="observation"), self._num_envs
+        )
+        self._action_spec = spec_utils.batch_spec(
+            _convert_to_spec(act_space, name="action"), self._num_envs
+        )
+        self._reward_spec = specs.Array(
+            shape=(self._num_envs,), dtype=float, name="reward"
+        )
+        self._discount_spec = specs.BoundedArray(
+            shape=(self._num_envs,),
+            dtype=float,
+            minimum=0.0,
+            maximum=1.0,
+            name="discount",
+        )
+        self._convert_observation = spec_utils.make_converter(self._observation_spec)
+
+    def reset(self) -> dm_env.TimeStep:
+        """Resets all sub-environments."""
+        self._reset_next_step = False
+        self._done = np.zeros(self._num_envs, dtype=bool)
+        self._final_timestep = None
+        observation, info = self._environment.reset(seed=self._seed)
+        # Later resets continue from the seeded random number generators.
+        self._seed = None
+        # Reset the diagnostic information.
+        self._last_info = info
+        return dm_env.TimeStep(
+            step_type=np.full(self._num_envs, dm_env.StepType.FIRST, dtype=np.uint8),
+            reward=np.zeros(self._num_envs, dtype=self._reward_spec.dtype),
+            discount=np.ones(self._num_envs, dtype=self._discount_spec.dtype),
+            observation=self._convert_observation(observation),
+        )
+
+    def step(self, action) -> dm_env.TimeStep:
+        """Steps all sub-environments."""
+        if self._reset_next_step:
+            return self.reset()
+
+        self._final_timestep = None
+        observation, reward, terminated, truncated, info = self._environment.step(
+            action
+        )
+        self._last_info = info
+
+        done = np.logical_or(terminated, truncated)
+        reward = np.array(reward, dtype=self._reward_spec.dtype)
+        discount = np.where(terminated, 0.0, 1.0).astype(self._discount_spec.dtype)
+        step_type = np.where(done, dm_env.StepType.LAST, dm_env.StepType.MID).astype(
+            np.uint8
+        )
+
+        if self._autoreset_mode == _NEXT_STEP:
+            # Sub-environments that ended on the previous step have just been reset
+            # and ignored their action.
+            step_type[self._done] = dm_env.StepType.FIRST
+            reward[self._done] = 0.0
+            discount[self._done] = 1.0
+        elif np.any(done):
+            final_observation = self._replace_final_observations(
+                observation, info, done
+            )
+            self._final_timestep = dm_env.TimeStep(
+                step_type.copy(),
+                reward.copy(),
+                discount.copy(),
+                self._convert_observation(final_observation),
+            )
+            # The observation is already the first one of the next episode.
+            step_type[done] = dm_env.StepType.FIRST
+            reward[done] = 0.0
+            discount[done] = 1.0
+
+        self._done = done
+        observation = self._convert_observation(observation)
+        return dm_env.TimeStep(step_type, reward, discount, observation)
+
+    def observation_spec(self):
+        return self._observation_spec
+
+    def action_spec(self):
+        return self._action_spec
+
+    def reward_spec(self):
+        return self._reward_spec
+
+    def discount_spec(self):
+        return self._discount_spec
+
+    def get_info(self) -> Optional[Dict[str, Any]]:
+        """Returns the last info returned from env.step(action).
+
+        Returns:
+          info: dictionary of diagnostic information from the last environment step
+        """
+        return self._last_info
+
+    @property
+    def final_timestep(self) -> Optional[dm_env.TimeStep]:
+        """The batched timestep replaced by FIRST ones in the previous `step()` call.
+
+        This is only set with same-step autoreset, when at least one episode ended,
+        and is None otherwise. Entries of sub-environments whose episode did not end
+        are those of the returned timestep.
+        """
+        return self._final_timestep
+
+    @property
+    def num_envs(self) -> int:
+        """Returns the number of sub-environments."""
+        return self._num_envs
+
+    @property
+    def environment(self) -> gym.vector.VectorEnv:
+        """Returns the wrapped environment."""
+        return self._environment
+
+    def __getattr__(self, name: str):
+        if name.startswith("__"):
+            raise AttributeError(
+                "attempted to get missing private attribute '{}'".format(name)
+            )
+        return getattr(self._environment, name)
+
+    def close(self):
+        self._environment.close()
+
+    # Helper methods.
+
+    def _replace_final_observations(self, observation, info, done: np.ndarray):
+        """Swaps in the final observation of episodes that were reset on this step."""
+        # The info key was renamed in gymnasium 1.0.
+        key = "final_obs" if "final_obs" in info else "final_observation"
+        indices = np.flatnonzero(done)
+        final_observations = [info[key][i] for i in indices]
+
+        def _replace_rows(batch, *rows):
+            # Copy so that we never write into buffers owned by the vector env.
+            batch = np.array(batch)
+            batch[indices] = np.stack(rows)
+            return batch
+
+        return tree.map_structure(_replace_rows, observation, *final_observations)
+
+
 def _convert_to_spec(space: gym.Space, name: Optional[str] = None):
     """Converts an OpenAI Gym space to a dm_env spec or nested structure of specs.
 
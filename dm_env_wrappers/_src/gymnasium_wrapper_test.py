@@ -1,6 +1,9 @@
 # type: ignore
 """Tests for gymnasium_wrapper."""
 
+import collections
+
+import dm_env
 import numpy as np
 from absl.testing import absltest
 from dm_env import specs
@@ -63,6 +66,139 @@ class GymWrapperTest(absltest.TestCase):
         self.assertRaises(ValueError, spec.validate, [2, 2])
         self.assertRaises(ValueError, spec.validate, [1, 3])
 
+    def test_dict_observation_is_normalized(self):
+        class _DictEnv(gymnasium.Env):
+            observation_space = gymnasium.spaces.Dict(
+                {
+                    "position": gymnasium.spaces.Box(-1.0, 1.0, (3,), np.float32),
+                    "velocity": gymnasium.spaces.Box(-1.0, 1.0, (3,), np.float32),
+                }
+            )
+            action_space = gymnasium.spaces.Discrete(2)
+
+            def reset(self, *, seed=None, options=None):
+                return self._observation(), {}
+
+            def step(self, action):
+                return self._observation(), 0.0, False, False, {}
+
+            def _observation(self):
+                # Non-contiguous position and wrongly typed velocity.
+                return collections.OrderedDict(
+                    position=np.zeros((3, 2), dtype=np.float32)[:, 0],
+                    velocity=np.zeros(3, dtype=np.float64),
+                )
+
+        env = gymnasium_wrapper.GymnasiumWrapper(_DictEnv())
+        for timestep in (env.reset(), env.step(0)):
+            self.assertEqual(type(timestep.observation), dict)
+            for value in timestep.observation.values():
+                self.assertEqual(value.dtype, np.float32)
+                self.assertTrue(value.flags.c_contiguous)
+
+        # Observations that already match the spec are passed through as is.
+        position = np.zeros(3, dtype=np.float32)
+        converted = env._convert_observation(
+            {"position": position, "velocity": position}
+        )
+        self.assertIs(converted["position"], position)
+
+
+class GymnasiumVectorWrapperTest(absltest.TestCase):
+    def test_batched_specs(self):
+        env = gymnasium_wrapper.GymnasiumVectorWrapper(
+            gymnasium.make_vec("CartPole-v1", num_envs=3, vectorization_mode="sync")
+        )
+
+        observation_spec: specs.BoundedArray = env.observation_spec()
+        self.assertEqual(type(observation_spec), specs.BoundedArray)
+        self.assertEqual(observation_spec.shape, (3, 4))
+
+        action_spec: specs.BoundedArray = env.action_spec()
+        self.assertEqual(type(action_spec), specs.BoundedArray)
+        self.assertEqual(action_spec.shape, (3,))
+        self.assertEqual(action_spec.maximum, 1)
+        self.assertEqual(env.reward_spec().shape, (3,))
+        self.assertEqual(env.discount_spec().shape, (3,))
+        env.close()
+
+    def test_next_step_autoreset(self):
+        env = gymnasium_wrapper.GymnasiumVectorWrapper(
+            gymnasium.make_vec("CartPole-v1", num_envs=2, vectorization_mode="sync")
+        )
+        timestep = env.reset()
+        np.testing.assert_array_equal(timestep.step_type, dm_env.StepType.FIRST)
+        action = np.zeros(2, dtype=np.int64)
+        while not np.any(timestep.step_type == dm_env.StepType.LAST):
+            timestep = env.step(action)
+        # The step that ends an episode is LAST, with the terminal reward.
+        ended = timestep.step_type == dm_env.StepType.LAST
+        np.testing.assert_array_equal(timestep.reward[ended], 1.0)
+        np.testing.assert_array_equal(timestep.discount[ended], 0.0)
+
+        timestep = env.step(action)
+        np.testing.assert_array_equal(timestep.step_type[ended], dm_env.StepType.FIRST)
+        np.testing.assert_array_equal(timestep.reward[ended], 0.0)
+        self.assertIsNone(env.final_timestep)
+        env.close()
+
+    def test_seed(self):
+        observations = []
+        for _ in range(2):
+            env = gymnasium_wrapper.GymnasiumVectorWrapper(
+                gymnasium.make_vec(
+                    "CartPole-v1", num_envs=2, vectorization_mode="sync"
+                ),
+                seed=0,
+            )
+            observations.append(env.reset().observation)
+            env.close()
+        np.testing.assert_array_equal(observations[0], observations[1])
+
+    def test_same_step_autoreset(self):
+        vector_env = gymnasium.vector.SyncVectorEnv(
+            [lambda: gymnasium.make("CartPole-v1")] * 2,
+            autoreset_mode=gymnasium.vector.AutoresetMode.SAME_STEP,
+        )
+        # Seeding makes the episode boundaries deterministic.
+        env = gymnasium_wrapper.GymnasiumVectorWrapper(vector_env, seed=0)
+        timestep = env.reset()
+        action = np.zeros(2, dtype=np.int64)
+        while env.final_timestep is None:
+            # Episodes never end with a LAST step type in this mode.
+            self.assertFalse(np.any(timestep.step_type == dm_env.StepType.LAST))
+            previous_step_type = timestep.step_type
+            timestep = env.step(action)
+
+        # Episodes that ended go from MID to FIRST, with the reset observation.
+        final_timestep = env.final_timestep
+        ended = final_timestep.step_type == dm_env.StepType.LAST
+        self.assertTrue(np.any(ended))
+        np.testing.assert_array_equal(previous_step_type[ended], dm_env.StepType.MID)
+        np.testing.assert_array_equal(timestep.step_type[ended], dm_env.StepType.FIRST)
+        np.testing.assert_array_equal(timestep.reward[ended], 0.0)
+        np.testing.assert_array_equal(timestep.discount[ended], 1.0)
+        # The terminal reward and discount are only in the final timestep.
+        np.testing.assert_array_equal(final_timestep.reward[ended], 1.0)
+        np.testing.assert_array_equal(final_timestep.discount[ended], 0.0)
+        info = env.get_info()
+        for i in np.flatnonzero(ended):
+            np.testing.assert_array_equal(
+                final_timestep.observation[i], info["final_obs"][i]
+            )
+            self.assertFalse(
+                np.array_equal(timestep.observation[i], info["final_obs"][i])
+            )
+
+        # The step after the episode boundary continues the new episode.
+        timestep = env.step(action)
+        np.testing.assert_array_equal(timestep.step_type[ended], dm_env.StepType.MID)
+        if env.final_timestep is not None:
+            # Only other sub-environments may have ended on this step.
+            final_step_type = env.final_timestep.step_type[ended]
+            self.assertFalse(np.any(final_step_type == dm_env.StepType.LAST))
+        env.close()
+
 
 if __name__ == "__main__":
     absltest.main()
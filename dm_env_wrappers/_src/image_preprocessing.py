@@ -0,0 +1,148 @@
+"""A wrapper that crops, resizes and grayscales pixel observations."""
+
+import copy
+from typing import Dict, Optional, Sequence, Tuple
+
+import dm_env
+import numpy as np
+from dm_env import specs
+
+from dm_env_wrappers._src import base
+
+# ITU-R BT.601 luma weights, as used by e.g. PIL and OpenCV.
+_GRAYSCALE_WEIGHTS = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+class ImagePreprocessingWrapper(base.EnvironmentWrapper):
+    """Crops, resizes and optionally grayscales `uint8` pixel observations.
+
+    Each selected observation must be a `(height, width, channels)` `uint8`
+    image. It is cropped to `crop`, resized to `size` with nearest-neighbor
+    sampling, and converted to a single grayscale channel if `grayscale` is set.
+    Crop and resize are done in a single gather with indices computed once at
+    construction, and results are written into preallocated `uint8` buffers.
+
+    Processed images are only valid until the next `step()` or `reset()`, and
+    must be copied to be kept for longer. `FrameStackingWrapper` copies them, so
+    this wrapper should be applied before it to stack the small frames.
+    """
+
+    _supports_mutable_timesteps = True
+
+    def __init__(
+        self,
+        environment: dm_env.Environment,
+        keys: Sequence[str] = ("pixels",),
+        crop: Optional[Tuple[int, int, int, int]] = None,
+        size: Optional[Tuple[int, int]] = None,
+        grayscale: bool = False,
+    ) -> None:
+        """Initializes a new ImagePreprocessingWrapper.
+
+        Args:
+          environment: Environment to wrap.
+          keys: Observation keys of the images to process.
+          crop: Region to keep as `(top, left, height, width)`. Defaults to the
+            whole image.
+          size: Output size as `(height, width)`. Defaults to the size of the
+            cropped region.
+          grayscale: Whether to convert RGB images to a single grayscale channel.
+        """
+        super().__init__(environment)
+
+        observation_spec = self._environment.observation_spec()
+        if not isinstance(observation_spec, dict):
+            raise ValueError(
+                "ImagePreprocessingWrapper requires a dictionary observation."
+            )
+
+        self._observation_spec = copy.copy(observation_spec)
+        self._processors: Dict[str, _ImageProcessor] = {}
+        for key in keys:
+            if key not in observation_spec:
+                raise ValueError(f"Unknown observation key: {key}.")
+            spec = observation_spec[key]
+            processor = _ImageProcessor(spec, crop, size, grayscale)
+            self._processors[key] = processor
+            self._observation_spec[key] = specs.Array(
+                shape=processor.output_shape, dtype=np.uint8, name=spec.name
+            )
+
+    def reset(self) -> dm_env.TimeStep:
+        return self._process(self._environment.reset())
+
+    def step(self, action) -> dm_env.TimeStep:
+        return self._process(self._environment.step(action))
+
+    def observation_spec(self):
+        return self._observation_spec
+
+    # Helper methods.
+
+    def _process(self, timestep: dm_env.TimeStep) -> dm_env.TimeStep:
+        observation = copy.copy(timestep.observation)
+        for key, processor in self._processors.items():
+            observation[key] = processor(observation[key])
+        return timestep._replace(observation=observation)
+
+
+class _ImageProcessor:
+    """Crops, resizes and grayscales a single image into preallocated buffers."""
+
+    def __init__(
+        self,
+        spec: specs.Array,
+        crop: Optional[Tuple[int, int, int, int]],
+        size: Optional[Tuple[int, int]],
+        grayscale: bool,
+    ) -> None:
+        if len(spec.shape) != 3 or spec.dtype != np.uint8:
+            raise ValueError(
+                f"Expected a (height, width, channels) uint8 image, got {spec}."
+            )
+        height, width, channels = spec.shape
+        top, left, crop_height, crop_width = crop or (0, 0, height, width)
+        if (
+            min(top, left) < 0
+            or crop_height <= 0
+            or crop_width <= 0
+            or top + crop_height > height
+            or left + crop_width > width
+        ):
+            raise ValueError(
+                f"Crop {crop} does not fit in an image of shape {spec.shape}."
+            )
+        output_height, output_width = size or (crop_height, crop_width)
+        if output_height <= 0 or output_width <= 0:
+            raise ValueError(f"Invalid output size: {size}.")
+        if grayscale and channels != 3:
+            raise ValueError(f"Grayscale conversion requires RGB images, got {spec}.")
+
+        # Source pixel of every output pixel, sampled at pixel centers and
+        # flattened to index the image viewed as a `(height * width, channels)`
+        # array.
+        rows = top + (np.arange(output_height) + 0.5) * crop_height // output_height
+        columns = left + (np.arange(output_width) + 0.5) * crop_width // output_width
+        rows, columns = rows.astype(np.intp), columns.astype(np.intp)
+        self._indices = rows[:, None] * width + columns[None, :]
+        self._num_pixels = height * width
+        self._resized = np.empty((output_height, output_width, channels), np.uint8)
+        self._grayscale = grayscale
+        if grayscale:
+            self._luma = np.empty((output_height, output_width), np.float32)
+            self._output = np.empty((output_height, output_width, 1), np.uint8)
+        else:
+            self._output = self._resized
+
+    @property
+    def output_shape(self) -> Tuple[int, ...]:
+        return self._output.shape
+
+    def __call__(self, image) -> np.ndarray:
+        pixels = np.asarray(image).reshape(self._num_pixels, -1)
+        np.take(pixels, self._indices, axis=0, out=self._resized, mode="clip")
+        if self._grayscale:
+            np.matmul(self._resized, _GRAYSCALE_WEIGHTS, out=self._luma)
+            self._luma += 0.5
+            np.copyto(self._output[..., 0], self._luma, casting="unsafe")
+        return self._output
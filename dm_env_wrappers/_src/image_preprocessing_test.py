@@ -0,0 +1,111 @@
+"""Tests for image_preprocessing.py."""
+
+import dm_env
+import numpy as np
+from absl.testing import absltest
+from dm_env import specs
+
+from dm_env_wrappers._src import frame_stacking, image_preprocessing
+
+
+class _FakeEnvironment(dm_env.Environment):
+    """A mock environment with 8x6 RGB frames that change every step."""
+
+    def __init__(self) -> None:
+        self.index = 0
+
+    def reset(self) -> dm_env.TimeStep:
+        self.index = 0
+        return dm_env.restart(self._observation())
+
+    def step(self, action) -> dm_env.TimeStep:
+        del action  # Unused.
+        self.index += 1
+        return dm_env.transition(0.0, self._observation())
+
+    def observation_spec(self):
+        return {
+            "pixels": specs.Array(shape=(8, 6, 3), dtype=np.uint8, name="pixels"),
+            "position": specs.Array(shape=(2,), dtype=np.float64),
+        }
+
+    def action_spec(self):
+        return specs.Array(shape=(), dtype=np.int32)
+
+    def _observation(self):
+        rows, columns = np.meshgrid(np.arange(8), np.arange(6), indexing="ij")
+        pixels = np.stack([rows * 10, columns * 10, np.full_like(rows, self.index)], -1)
+        return {"pixels": pixels.astype(np.uint8), "position": np.zeros(2)}
+
+
+class ImagePreprocessingWrapperTest(absltest.TestCase):
+    """Tests for ImagePreprocessingWrapper."""
+
+    def test_crop_and_resize(self) -> None:
+        env = image_preprocessing.ImagePreprocessingWrapper(
+            _FakeEnvironment(), crop=(2, 1, 4, 4), size=(2, 2)
+        )
+        spec = env.observation_spec()["pixels"]
+        self.assertEqual(spec.shape, (2, 2, 3))
+        self.assertEqual(spec.dtype, np.uint8)
+        self.assertEqual(env.observation_spec()["position"].shape, (2,))
+
+        pixels = env.reset().observation["pixels"]
+        self.assertEqual(pixels.shape, (2, 2, 3))
+        # Nearest neighbors of the output pixel centers in the 4x4 crop.
+        np.testing.assert_array_equal(pixels[..., 0], [[30, 30], [50, 50]])
+        np.testing.assert_array_equal(pixels[..., 1], [[20, 40], [20, 40]])
+
+    def test_grayscale(self) -> None:
+        inner = _FakeEnvironment()
+        env = image_preprocessing.ImagePreprocessingWrapper(inner, grayscale=True)
+        self.assertEqual(env.observation_spec()["pixels"].shape, (8, 6, 1))
+        pixels = env.reset().observation["pixels"]
+        rgb = inner._observation()["pixels"].astype(np.float64)
+        expected = np.round(rgb @ [0.299, 0.587, 0.114])
+        np.testing.assert_allclose(pixels[..., 0], expected, atol=1)
+
+    def test_frame_stacking_copies_reused_buffers(self) -> None:
+        env = frame_stacking.FrameStackingWrapper(
+            image_preprocessing.ImagePreprocessingWrapper(
+                _FakeEnvironment(), size=(4, 3)
+            ),
+            num_frames=3,
+        )
+        self.assertEqual(env.observation_spec()["pixels"].shape, (4, 3, 3, 3))
+        env.reset()
+        env.step(0)
+        pixels = env.step(0).observation["pixels"]
+        np.testing.assert_array_equal(pixels[0, 0, 2], [0, 1, 2])
+
+    def test_frame_stacking_returns_copies(self) -> None:
+        for num_frames in (1, 3):
+            # Stacked scalars, and single frames, are contiguous windows of the
+            # stacker's storage.
+            stacker = frame_stacking.FrameStacker(num_frames=num_frames)
+            scalars = stacker.step(np.float64(1.0))
+            expected_scalars = scalars.copy()
+            env = frame_stacking.FrameStackingWrapper(
+                _FakeEnvironment(), num_frames=num_frames
+            )
+            pixels = env.reset().observation["pixels"]
+            expected_pixels = pixels.copy()
+            for value in (2.0, 3.0, 4.0):
+                stacker.step(np.float64(value))
+                env.step(0)
+            np.testing.assert_array_equal(scalars, expected_scalars)
+            np.testing.assert_array_equal(pixels, expected_pixels)
+
+    def test_invalid_arguments(self) -> None:
+        with self.assertRaises(ValueError):
+            image_preprocessing.ImagePreprocessingWrapper(
+                _FakeEnvironment(), crop=(4, 0, 5, 6)
+            )
+        with self.assertRaises(ValueError):
+            image_preprocessing.ImagePreprocessingWrapper(
+                _FakeEnvironment(), keys=("position",)
+            )
+
+
+if __name__ == "__main__":
+    absltest.main()
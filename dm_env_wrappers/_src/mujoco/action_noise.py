@@ -33,6 +33,9 @@ _BOUNDS_MUST_BE_FINITE = (
 class ActionNoiseWrapper(base.EnvironmentWrapper):
     """A wrapper that adds zero-mean Gaussian noise to the actions."""
 
+    _passes_observation_through = True
+    _supports_mutable_timesteps = True
+
     def __init__(
         self,
         environment: dm_env.Environment,
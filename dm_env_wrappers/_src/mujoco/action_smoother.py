@@ -171,6 +171,9 @@ class ActionSmootherWrapper(base.EnvironmentWrapper):
         order: The order of the filter.
     """
 
+    _passes_observation_through = True
+    _supports_mutable_timesteps = True
+
     def __init__(
         self,
         environment: dm_env.Environment,
@@ -1,15 +1,132 @@
 """A wrapper to unify dm_control suite and composer environments."""
 
+from typing import Optional
+
+import dm_env
 import numpy as np
 
 from dm_env_wrappers._src import base
 
 
 class DmControlWrapper(base.EnvironmentWrapper):
-    """Gives a unified interface to `dm_control` environments."""
+    """Gives a unified interface to `dm_control` environments.
+
+    Optionally, resets can restore one of a pool of initial physics states instead
+    of running the task's full `initialize_episode` randomization. The pool is
+    filled lazily from the first `initial_state_pool_size` regular resets (or
+    ahead of time with `fill_initial_state_pool()`), and one of its states is
+    replaced by a fresh one every `initial_state_refresh_every` resets. It can be
+    saved with `save_initial_state_pool()` and loaded back as a read-only
+    memory-mapped array, so that many workers share a single copy.
+
+    Only the physics state returned by `physics.get_state()` is restored. Tasks
+    that also randomize model parameters or their own attributes in
+    `initialize_episode` should not use the pool. Pools are only supported for
+    `dm_control.suite` environments.
+    """
+
+    def __init__(
+        self,
+        environment: dm_env.Environment,
+        initial_state_pool_size: int = 0,
+        initial_state_refresh_every: Optional[int] = None,
+        initial_state_path: Optional[str] = None,
+    ) -> None:
+        """Initializes a new DmControlWrapper.
+
+        Args:
+          environment: The dm_control environment to wrap.
+          initial_state_pool_size: Number of initial states to keep. 0 disables
+            the pool.
+          initial_state_refresh_every: If set, every this many resets run the full
+            task initialization and replace a random state of the pool.
+          initial_state_path: Path to a pool saved with `save_initial_state_pool()`.
+            It is memory-mapped read-only and cannot be refreshed.
+        """
+        super().__init__(environment)
+
+        if initial_state_pool_size < 0:
+            raise ValueError("initial_state_pool_size must be non-negative.")
+        if initial_state_refresh_every is not None and initial_state_refresh_every <= 0:
+            raise ValueError("initial_state_refresh_every must be a positive integer.")
+
+        self._pool: Optional[np.ndarray] = None
+        self._pool_size = initial_state_pool_size
+        self._pool_count = 0
+        self._refresh_every = initial_state_refresh_every
+        self._num_resets = 0
+
+        if initial_state_path is not None:
+            if initial_state_refresh_every is not None:
+                raise ValueError("A pool loaded from disk cannot be refreshed.")
+            self._pool = np.load(initial_state_path, mmap_mode="r")
+            self._pool_size = self._pool_count = len(self._pool)
+
+        if self._pool_size and hasattr(self.task, "root_entity"):
+            raise ValueError(
+                "Initial state pools are only supported for dm_control suite "
+                "environments."
+            )
+
+    def reset(self) -> dm_env.TimeStep:
+        if not self._pool_size:
+            return self._environment.reset()
+
+        self._num_resets += 1
+        refresh = (
+            self._refresh_every is not None
+            and self._num_resets % self._refresh_every == 0
+        )
+        if self._pool_count < self._pool_size or refresh:
+            timestep = self._environment.reset()
+            self._add_initial_state(self.physics.get_state())
+            return timestep
+
+        index = self.random_state.randint(self._pool_count)
+        return self._reset_to_state(self._pool[index])  # type: ignore
+
+    def fill_initial_state_pool(self) -> None:
+        """Runs regular resets until the initial state pool is full."""
+        while self._pool_count < self._pool_size:
+            self._environment.reset()
+            self._add_initial_state(self.physics.get_state())
+
+    def save_initial_state_pool(self, path: str) -> None:
+        """Saves the initial states collected so far as a `.npy` file."""
+        if self._pool is None:
+            raise ValueError("No initial states have been collected yet.")
+        np.save(path, self._pool[: self._pool_count])
 
     @property
     def random_state(self) -> np.random.RandomState:
         if hasattr(self.environment, "random_state"):
             return self.environment.random_state
         return self.environment.task.random
+
+    # Helper methods.
+
+    def _add_initial_state(self, state: np.ndarray) -> None:
+        if self._pool is None:
+            self._pool = np.empty((self._pool_size, state.size), dtype=state.dtype)
+        if self._pool_count < self._pool_size:
+            self._pool[self._pool_count] = state
+            self._pool_count += 1
+        else:
+            self._pool[self.random_state.randint(self._pool_size)] = state
+
+    def _reset_to_state(self, state: np.ndarray) -> dm_env.TimeStep:
+        task = self.task
+
+        def initialize_episode(physics):
+            physics.set_state(np.asarray(state))
+            # Mirror `suite.base.Task.initialize_episode`, which resets geom colors.
+            task.after_step(physics)
+
+        # Shadow the task's method for this one reset. The environment's own reset
+        # still resets the step counter and physics (followed by `forward()`), and
+        # computes the first observation.
+        task.initialize_episode = initialize_episode
+        try:
+            return self._environment.reset()
+        finally:
+            del task.initialize_episode
@@ -0,0 +1,150 @@
+"""A reusable, in-place alternative to `dm_env.TimeStep` for wrapper chains.
+
+Every transforming wrapper calls `timestep._replace(...)`, which allocates a new
+`dm_env.TimeStep` per layer and per step. `MutableTimeStepWrapper` instead hands
+a single `MutableTimeStep` to the layers above it, whose `_replace` updates the
+record in place, and `FreezeTimeStepWrapper` turns it back into a regular
+`dm_env.TimeStep` at the outer boundary:
+
+    env = wrap_all(env, [MutableTimeStepWrapper, ..., FreezeTimeStepWrapper])
+
+Wrappers in between must not hold on to a timestep across `step()` or `reset()`
+calls without converting it first, e.g. with `MutableTimeStep.to_timestep()`.
+"""
+
+from typing import Any, Iterator
+
+import dm_env
+
+from dm_env_wrappers._src import base
+
+
+class MutableTimeStep:
+    """A `dm_env.TimeStep` lookalike that is updated in place."""
+
+    __slots__ = ("step_type", "reward", "discount", "observation")
+
+    def __init__(
+        self,
+        step_type: Any = None,
+        reward: Any = None,
+        discount: Any = None,
+        observation: Any = None,
+    ) -> None:
+        self.step_type = step_type
+        self.reward = reward
+        self.discount = discount
+        self.observation = observation
+
+    def first(self) -> bool:
+        return self.step_type == dm_env.StepType.FIRST
+
+    def mid(self) -> bool:
+        return self.step_type == dm_env.StepType.MID
+
+    def last(self) -> bool:
+        return self.step_type == dm_env.StepType.LAST
+
+    def _replace(self, **kwargs) -> "MutableTimeStep":
+        """Sets the given fields in place and returns this same object."""
+        for name, value in kwargs.items():
+            setattr(self, name, value)
+        return self
+
+    def update(self, timestep) -> "MutableTimeStep":
+        """Copies all fields of `timestep` into this object and returns it."""
+        (
+            self.step_type,
+            self.reward,
+            self.discount,
+            self.observation,
+        ) = timestep
+        return self
+
+    def to_timestep(self) -> dm_env.TimeStep:
+        return dm_env.TimeStep(
+            self.step_type, self.reward, self.discount, self.observation
+        )
+
+    def __iter__(self) -> Iterator[Any]:
+        yield self.step_type
+        yield self.reward
+        yield self.discount
+        yield self.observation
+
+    def __repr__(self) -> str:
+        return (
+            f"MutableTimeStep(step_type={self.step_type!r}, reward={self.reward!r}, "
+            f"discount={self.discount!r}, observation={self.observation!r})"
+        )
+
+
+def freeze(timestep) -> dm_env.TimeStep:
+    """Returns `timestep` as a regular, immutable `dm_env.TimeStep`."""
+    if isinstance(timestep, MutableTimeStep):
+        return timestep.to_timestep()
+    return timestep
+
+
+class MutableTimeStepWrapper(base.EnvironmentWrapper):
+    """Hands out a single, reused `MutableTimeStep` to the wrappers above it.
+
+    This should be the innermost wrapper of a chain that ends with a
+    `FreezeTimeStepWrapper`, which checks that the wrappers in between support
+    mutable timesteps.
+    """
+
+    _passes_observation_through = True
+
+    def __init__(self, environment: dm_env.Environment) -> None:
+        super().__init__(environment)
+        self._timestep = MutableTimeStep()
+
+    def reset(self) -> MutableTimeStep:
+        return self._timestep.update(self._environment.reset())
+
+    def step(self, action) -> MutableTimeStep:
+        return self._timestep.update(self._environment.step(action))
+
+    def _wrapped_observation_keys(self, keys):
+        return keys
+
+
+class FreezeTimeStepWrapper(base.EnvironmentWrapper):
+    """Converts `MutableTimeStep`s back into regular `dm_env.TimeStep`s.
+
+    This should be the outermost wrapper of a chain that starts with a
+    `MutableTimeStepWrapper`. Every wrapper in between must set
+    `_supports_mutable_timesteps`.
+    """
+
+    _passes_observation_through = True
+
+    def __init__(self, environment: dm_env.Environment) -> None:
+        """Initializes a new FreezeTimeStepWrapper.
+
+        Raises:
+          ValueError: If there is no `MutableTimeStepWrapper` in the chain, or if
+            a wrapper in between does not support mutable timesteps.
+        """
+        super().__init__(environment)
+        while not isinstance(environment, MutableTimeStepWrapper):
+            if not isinstance(environment, base.EnvironmentWrapper):
+                raise ValueError(
+                    "FreezeTimeStepWrapper requires a MutableTimeStepWrapper below."
+                )
+            if not environment._supports_mutable_timesteps:
+                raise ValueError(
+                    f"{type(environment).__name__} does not support mutable "
+                    "timesteps and cannot be used with MutableTimeStepWrapper."
+                )
+            environment = environment.environment
+
+    def reset(self) -> dm_env.TimeStep:
+        return freeze(self._environment.reset())
+
+    def step(self, action) -> dm_env.TimeStep:
+        return freeze(self._environment.step(action))
+
+    def _wrapped_observation_keys(self, keys):
+        return keys
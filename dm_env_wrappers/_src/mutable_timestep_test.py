@@ -0,0 +1,100 @@
+"""Tests for mutable_timestep.py."""
+
+import dm_env
+from absl.testing import absltest
+
+from dm_env_wrappers._src import (
+    action_repeat,
+    base,
+    episode_statistics,
+    mutable_timestep,
+    step_limit,
+)
+
+
+class _FakeEnvironment(dm_env.Environment):
+    """A mock environment for testing."""
+
+    def reset(self) -> dm_env.TimeStep:
+        return dm_env.restart(0)
+
+    def step(self, action) -> dm_env.TimeStep:
+        del action  # Unused.
+        return dm_env.transition(1.0, 1, 0.5)
+
+    def observation_spec(self):
+        return None
+
+    def action_spec(self):
+        return None
+
+
+class _RecordingWrapper(base.EnvironmentWrapper):
+    """Records the timesteps returned by the wrapped environment."""
+
+    _supports_mutable_timesteps = True
+
+    def __init__(self, environment: dm_env.Environment) -> None:
+        super().__init__(environment)
+        self.timesteps = []
+
+    def step(self, action) -> dm_env.TimeStep:
+        timestep = self._environment.step(action)
+        self.timesteps.append(timestep)
+        return timestep
+
+
+class MutableTimeStepTest(absltest.TestCase):
+    """Tests for MutableTimeStep and the wrappers using it."""
+
+    def test_replace_is_in_place(self) -> None:
+        timestep = mutable_timestep.MutableTimeStep().update(dm_env.restart(0))
+        self.assertTrue(timestep.first())
+        self.assertIs(timestep._replace(observation=1), timestep)
+        self.assertEqual(timestep.observation, 1)
+        self.assertEqual(tuple(timestep), tuple(dm_env.restart(1)))
+
+    def test_chain_reuses_a_single_timestep(self) -> None:
+        env = base.wrap_all(
+            _FakeEnvironment(),
+            [
+                mutable_timestep.MutableTimeStepWrapper,
+                _RecordingWrapper,
+                lambda e: action_repeat.ActionRepeatWrapper(e, num_repeats=2),
+                lambda e: step_limit.StepLimitWrapper(e, step_limit=3),
+                episode_statistics.EpisodeStatisticsWrapper,
+                mutable_timestep.FreezeTimeStepWrapper,
+            ],
+        )
+        timestep = env.reset()
+        self.assertIsInstance(timestep, dm_env.TimeStep)
+        self.assertTrue(timestep.first())
+        while not timestep.last():
+            timestep = env.step(0)
+            self.assertIsInstance(timestep, dm_env.TimeStep)
+            self.assertEqual(timestep.reward, 1.5)
+            self.assertEqual(timestep.discount, 0.25)
+        self.assertEqual(env.get_statistics()["length"], 3)
+
+        recorded = env.find_wrapper(_RecordingWrapper).timesteps
+        self.assertLen(recorded, 6)
+        self.assertTrue(all(t is recorded[0] for t in recorded))
+
+    def test_rejects_unsupported_wrappers(self) -> None:
+        with self.assertRaises(ValueError):
+            base.wrap_all(
+                _FakeEnvironment(),
+                [
+                    mutable_timestep.MutableTimeStepWrapper,
+                    base.EnvironmentWrapper,
+                    mutable_timestep.FreezeTimeStepWrapper,
+                ],
+            )
+        with self.assertRaises(ValueError):
+            mutable_timestep.FreezeTimeStepWrapper(
+                step_limit.StepLimitWrapper(_FakeEnvironment())
+            )
+
+
+if __name__ == "__main__":
+    absltest.main()
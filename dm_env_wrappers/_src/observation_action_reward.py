@@ -1,17 +1,51 @@
 """A wrapper that puts the previous action and reward into the observation."""
 
+import copy
+from typing import Optional
+
 import dm_env
+import numpy as np
 import tree
+from dm_env import specs
 
-from dm_env_wrappers._src import base
+from dm_env_wrappers._src import base, spec_utils
 
 
 class ObservationActionRewardWrapper(base.EnvironmentWrapper):
-    """Wrapper that puts the previous action and reward into the observation."""
+    """Wrapper that puts the previous action and reward into the observation.
+
+    The wrapped environment's observations and observation spec are never
+    modified: each timestep gets a shallow copy of the observation dict with the
+    `action` and `reward` entries added. The action is copied into a new array of
+    the action spec's dtype, so later in-place changes to the caller's action do
+    not leak into past observations.
+
+    If `history_length` is set, the observation holds the last `history_length`
+    actions and rewards instead, stacked along a new leading axis from oldest to
+    newest. Missing entries at the start of an episode are filled with default
+    values. The history is kept in a preallocated buffer per spec leaf.
+    """
+
+    _supports_mutable_timesteps = True
 
-    def __init__(self, environment: dm_env.Environment) -> None:
+    def __init__(
+        self, environment: dm_env.Environment, history_length: Optional[int] = None
+    ) -> None:
+        """Initializes a new ObservationActionRewardWrapper.
+
+        Args:
+          environment: Environment to wrap.
+          history_length: Number of past actions and rewards to put in the
+            observation. None only puts the previous ones, without a history axis.
+        """
         super().__init__(environment)
 
+        if history_length is not None:
+            if not isinstance(history_length, int):
+                raise ValueError("history_length must be an integer.")
+            if history_length <= 0:
+                raise ValueError("history_length must be a positive integer.")
+
         # Enforce that the wrapped environment has a dict observation spec, i.e., that
         # is hasn't been wrapped with `ConcatObservationWrapper`.
         if not isinstance(self._environment.observation_spec(), dict):
@@ -21,33 +55,126 @@ class ObservationActionRewardWrapper(base.EnvironmentWrapper):
                 "ConcatObservationWrapper."
             )
 
-        self._obs_spec = self._environment.observation_spec()
-        self._obs_spec["action"] = self._environment.action_spec()
-        self._obs_spec["reward"] = self._environment.reward_spec()
+        action_spec = self._environment.action_spec()
+        reward_spec = self._environment.reward_spec()
+
+        # The values used on the first step of an episode never change, so they are
+        # generated once and made read-only so they can be shared between episodes.
+        self._default_action = tree.map_structure(_generate_read_only, action_spec)
+        self._default_reward = tree.map_structure(_generate_read_only, reward_spec)
+
+        self._history_length = history_length
+        self._obs_spec = copy.copy(self._environment.observation_spec())
+        if history_length is None:
+            self._obs_spec["action"] = action_spec
+            self._obs_spec["reward"] = reward_spec
+        else:
+            self._obs_spec["action"] = spec_utils.batch_spec(
+                action_spec, history_length
+            )
+            self._obs_spec["reward"] = spec_utils.batch_spec(
+                reward_spec, history_length
+            )
+            self._action_history = tree.map_structure(
+                lambda s, d: _History(s, history_length, d),
+                action_spec,
+                self._default_action,
+            )
+            self._reward_history = tree.map_structure(
+                lambda s, d: _History(s, history_length, d),
+                reward_spec,
+                self._default_reward,
+            )
+
+        if tree.is_nested(action_spec):
+            self._copy_action = lambda action: tree.map_structure(
+                _copy_value, action, action_spec
+            )
+        else:
+            self._copy_action = lambda action: _copy_value(action, action_spec)
 
     def reset(self) -> dm_env.TimeStep:
-        action = tree.map_structure(
-            lambda x: x.generate_value(), self._environment.action_spec()
-        )
-        reward = tree.map_structure(
-            lambda x: x.generate_value(), self._environment.reward_spec()
-        )
         timestep = self._environment.reset()
-        return self._augment_observation(action, reward, timestep)
+        return self._restart(timestep)
 
     def step(self, action) -> dm_env.TimeStep:
         timestep = self._environment.step(action)
-        return self._augment_observation(action, timestep.reward, timestep)
+        if timestep.first():
+            # The wrapped environment started a new episode instead of stepping.
+            return self._restart(timestep)
+        if self._history_length is None:
+            return self._augment_observation(
+                self._copy_action(action), timestep.reward, timestep
+            )
+        return self._augment_observation(
+            tree.map_structure(_History.append, self._action_history, action),
+            tree.map_structure(_History.append, self._reward_history, timestep.reward),
+            timestep,
+        )
 
     def observation_spec(self):
         return self._obs_spec
 
     # Helper methods.
 
+    def _wrapped_observation_keys(self, keys):
+        if keys is None:
+            return None
+        return keys - {"action", "reward"}
+
+    def _restart(self, timestep: dm_env.TimeStep) -> dm_env.TimeStep:
+        if self._history_length is None:
+            return self._augment_observation(
+                self._default_action, self._default_reward, timestep
+            )
+        return self._augment_observation(
+            tree.map_structure(_History.reset, self._action_history),
+            tree.map_structure(_History.reset, self._reward_history),
+            timestep,
+        )
+
     def _augment_observation(
         self, action, reward, timestep: dm_env.TimeStep
     ) -> dm_env.TimeStep:
-        observation = timestep.observation
+        observation = copy.copy(timestep.observation)
         observation["action"] = action
         observation["reward"] = reward
         return timestep._replace(observation=observation)
+
+
+def _generate_read_only(spec: specs.Array) -> np.ndarray:
+    value = spec.generate_value()
+    value.flags.writeable = False
+    return value
+
+
+def _copy_value(value, spec: specs.Array) -> np.ndarray:
+    return np.array(value, dtype=spec.dtype)
+
+
+class _History:
+    """The last `length` values of a single spec leaf.
+
+    Every value is written twice, at `i` and `i + length` of a buffer of size
+    `2 * length`, so that the history is always one contiguous slice ordered from
+    oldest to newest and can be read out without rolling the buffer.
+    """
+
+    def __init__(self, spec: specs.Array, length: int, default: np.ndarray) -> None:
+        self._length = length
+        self._default = default
+        self._buffer = np.empty((2 * length,) + tuple(spec.shape), dtype=spec.dtype)
+        self._index = 0
+
+    def reset(self) -> np.ndarray:
+        """Fills the history with the default value and returns it."""
+        self._buffer[:] = self._default
+        self._index = 0
+        return self._buffer[: self._length].copy()
+
+    def append(self, value) -> np.ndarray:
+        """Appends a value and returns a copy of the updated history."""
+        self._buffer[self._index] = value
+        self._buffer[self._index + self._length] = value
+        self._index = (self._index + 1) % self._length
+        return self._buffer[self._index : self._index + self._length].copy()
@@ -0,0 +1,94 @@
+"""Tests for observation_action_reward.py."""
+
+import dm_env
+import numpy as np
+from absl.testing import absltest
+from dm_env import specs
+
+from dm_env_wrappers._src import observation_action_reward
+
+
+class _FakeEnvironment(dm_env.Environment):
+    """A mock environment with a dictionary observation."""
+
+    def __init__(self) -> None:
+        self.observation = {"position": np.zeros(3)}
+        self.spec = {"position": specs.Array(shape=(3,), dtype=np.float64)}
+
+    def reset(self) -> dm_env.TimeStep:
+        return dm_env.restart(self.observation)
+
+    def step(self, action) -> dm_env.TimeStep:
+        del action  # Unused.
+        return dm_env.transition(1.0, self.observation)
+
+    def observation_spec(self):
+        return self.spec
+
+    def action_spec(self):
+        return specs.BoundedArray(
+            shape=(2,), dtype=np.float32, minimum=-1.0, maximum=1.0
+        )
+
+
+class ObservationActionRewardWrapperTest(absltest.TestCase):
+    """Tests for ObservationActionRewardWrapper."""
+
+    def test_reset_uses_default_values(self) -> None:
+        env = observation_action_reward.ObservationActionRewardWrapper(
+            _FakeEnvironment()
+        )
+        timestep = env.reset()
+        np.testing.assert_array_equal(
+            timestep.observation["action"], env.action_spec().generate_value()
+        )
+        self.assertEqual(timestep.observation["reward"], 0.0)
+
+    def test_does_not_alias_wrapped_environment(self) -> None:
+        inner = _FakeEnvironment()
+        env = observation_action_reward.ObservationActionRewardWrapper(inner)
+        self.assertNotIn("action", inner.observation_spec())
+        self.assertIn("action", env.observation_spec())
+
+        env.reset()
+        action = np.ones(2, dtype=np.float32)
+        timestep = env.step(action)
+        self.assertNotIn("action", inner.observation)
+
+        # Mutating the action after the fact does not change the observation.
+        action[:] = 0.0
+        np.testing.assert_array_equal(timestep.observation["action"], np.ones(2))
+        self.assertEqual(timestep.observation["action"].dtype, np.float32)
+        self.assertEqual(timestep.observation["reward"], 1.0)
+
+    def test_history(self) -> None:
+        env = observation_action_reward.ObservationActionRewardWrapper(
+            _FakeEnvironment(), history_length=3
+        )
+        self.assertEqual(env.observation_spec()["action"].shape, (3, 2))
+        self.assertEqual(env.observation_spec()["reward"].shape, (3,))
+
+        default = env.action_spec().generate_value()
+        timestep = env.reset()
+        np.testing.assert_array_equal(timestep.observation["action"], [default] * 3)
+        np.testing.assert_array_equal(timestep.observation["reward"], np.zeros(3))
+
+        actions = [np.full(2, i, dtype=np.float32) for i in range(1, 5)]
+        for action in actions:
+            timestep = env.step(action)
+        np.testing.assert_array_equal(timestep.observation["action"], actions[-3:])
+        np.testing.assert_array_equal(timestep.observation["reward"], np.ones(3))
+
+        # The history is cleared at the start of every episode.
+        timestep = env.reset()
+        np.testing.assert_array_equal(timestep.observation["action"], [default] * 3)
+
+    def test_raises_value_error_on_invalid_history_length(self) -> None:
+        with self.assertRaises(ValueError):
+            observation_action_reward.ObservationActionRewardWrapper(
+                _FakeEnvironment(), history_length=0
+            )
+
+
+if __name__ == "__main__":
+    absltest.main()
@@ -0,0 +1,277 @@
+"""Compression of pixel observations into bytes, and the matching decoder."""
+
+import concurrent.futures
+import copy
+import zlib
+from typing import Dict, Optional, Sequence
+
+import dm_env
+import imageio
+import numpy as np
+from dm_env import specs
+
+from dm_env_wrappers._src import base
+
+_METHODS = ("zlib", "png", "delta")
+
+# Header byte of values encoded with the "delta" method.
+_KEYFRAME = 0
+_DELTA = 1
+
+
+class ObservationCompressionWrapper(base.EnvironmentWrapper):
+    """Compresses selected observations into `bytes`.
+
+    Supported methods are:
+
+      * "zlib": the raw array bytes, compressed with zlib.
+      * "png": a PNG image. Observations must be `uint8` or `uint16` images of
+        shape `(height, width)` or `(height, width, channels)` with 1, 3 or 4
+        channels.
+      * "delta": the bitwise XOR of the array bytes with those of the previous
+        frame of the episode, compressed with zlib. Consecutive frames are often
+        nearly identical, which makes the difference highly compressible. The
+        first frame of each episode is a keyframe encoded on its own, so episodes
+        must be decoded in order starting from their first frame.
+
+    The specs of compressed observations become scalar `StringArray`s of bytes.
+    Use `make_decoder()` to get an `ObservationDecoder` that restores the
+    original observations, e.g. on the replay side.
+
+    Compression runs within `reset()` and `step()`, which return once every
+    selected observation has been compressed, so it adds to the latency of each
+    step. When several observations are selected and `num_threads` is not 1, they
+    are compressed concurrently in a thread pool, since zlib and PNG encoding
+    release the GIL. A single observation is compressed in the calling thread,
+    where a pool would only add overhead.
+    """
+
+    _supports_mutable_timesteps = True
+
+    def __init__(
+        self,
+        environment: dm_env.Environment,
+        keys: Sequence[str] = ("pixels",),
+        method: str = "zlib",
+        level: int = 1,
+        num_threads: Optional[int] = None,
+    ) -> None:
+        """Initializes a new ObservationCompressionWrapper.
+
+        Args:
+          environment: Environment to wrap.
+          keys: Observation keys to compress.
+          method: One of "zlib", "png" or "delta".
+          level: Compression level from 0 to 9. Higher levels compress better
+            but are slower.
+          num_threads: Number of threads to compress with. Defaults to one per
+            key.
+        """
+        super().__init__(environment)
+
+        if num_threads is not None and num_threads < 1:
+            raise ValueError(f"num_threads must be positive, got {num_threads}.")
+
+        observation_spec = self._environment.observation_spec()
+        if not isinstance(observation_spec, dict):
+            raise ValueError(
+                "ObservationCompressionWrapper requires a dictionary observation."
+            )
+        missing = set(keys) - set(observation_spec)
+        if missing:
+            raise ValueError(f"Unknown observation keys: {sorted(missing)}.")
+
+        self._specs = {key: observation_spec[key] for key in keys}
+        self._method = method
+        self._level = level
+        self._encoders = _make_codecs(self._specs, method, level)
+        self._observation_spec = copy.copy(observation_spec)
+        for key, spec in self._specs.items():
+            self._observation_spec[key] = specs.StringArray(
+                shape=(), string_type=bytes, name=spec.name
+            )
+        num_threads = num_threads or len(keys)
+        self._executor = None
+        if min(num_threads, len(keys)) > 1:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=num_threads,
+                thread_name_prefix="ObservationCompressionWrapper",
+            )
+
+    def reset(self) -> dm_env.TimeStep:
+        return self._compress(self._environment.reset())
+
+    def step(self, action) -> dm_env.TimeStep:
+        return self._compress(self._environment.step(action))
+
+    def observation_spec(self):
+        return self._observation_spec
+
+    def make_decoder(self) -> "ObservationDecoder":
+        """Returns a decoder restoring the observations compressed by this wrapper."""
+        return ObservationDecoder(self._specs, self._method)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+        return self._environment.close()
+
+    # Helper methods.
+
+    def _compress(self, timestep: dm_env.TimeStep) -> dm_env.TimeStep:
+        if timestep.first():
+            for encoder in self._encoders.values():
+                encoder.reset()
+        observation = copy.copy(timestep.observation)
+        if self._executor is None:
+            for key, encoder in self._encoders.items():
+                observation[key] = encoder.encode(observation[key])
+        else:
+            futures = {
+                key: self._executor.submit(encoder.encode, observation[key])
+                for key, encoder in self._encoders.items()
+            }
+            for key, future in futures.items():
+                observation[key] = future.result()
+        return timestep._replace(observation=observation)
+
+
+class ObservationDecoder:
+    """Restores observations compressed by an `ObservationCompressionWrapper`.
+
+    Decoders of the "delta" method are stateful: observations must be decoded in
+    the order they were produced, starting from the first one of an episode.
+    Decoders can be pickled and sent to other processes.
+    """
+
+    def __init__(self, observation_specs: Dict[str, specs.Array], method: str):
+        """Initializes a new ObservationDecoder.
+
+        Args:
+          observation_specs: The original specs of the compressed observations,
+            by key.
+          method: The compression method.
+        """
+        self._specs = dict(observation_specs)
+        self._method = method
+        self._decoders = _make_codecs(self._specs, method, level=0)
+
+    def decode(self, observation):
+        """Returns a shallow copy of `observation` with decompressed values."""
+        observation = copy.copy(observation)
+        for key, decoder in self._decoders.items():
+            observation[key] = decoder.decode(observation[key])
+        return observation
+
+    def __getstate__(self):
+        return self._specs, self._method
+
+    def __setstate__(self, state) -> None:
+        self.__init__(*state)
+
+
+def _make_codecs(observation_specs, method: str, level: int):
+    if method == "zlib":
+        codec_type = _ZlibCodec
+    elif method == "png":
+        codec_type = _PngCodec
+    elif method == "delta":
+        codec_type = _DeltaCodec
+    else:
+        raise ValueError(f"method must be one of {_METHODS}, got {method!r}.")
+    return {key: codec_type(spec, level) for key, spec in observation_specs.items()}
+
+
+class _ZlibCodec:
+    """Compresses the raw bytes of arrays with zlib."""
+
+    def __init__(self, spec: specs.Array, level: int) -> None:
+        if np.dtype(spec.dtype).hasobject:
+            raise ValueError(f"Cannot compress observations of dtype {spec.dtype}.")
+        self._shape = tuple(spec.shape)
+        self._dtype = np.dtype(spec.dtype)
+        self._level = level
+
+    def reset(self) -> None:
+        pass
+
+    def encode(self, value) -> bytes:
+        value = np.ascontiguousarray(value, dtype=self._dtype)
+        return zlib.compress(value, self._level)
+
+    def decode(self, data: bytes) -> np.ndarray:
+        return np.frombuffer(zlib.decompress(data), self._dtype).reshape(self._shape)
+
+
+class _PngCodec:
+    """Encodes images as PNG."""
+
+    def __init__(self, spec: specs.Array, level: int) -> None:
+        shape = tuple(spec.shape)
+        if (
+            spec.dtype not in (np.uint8, np.uint16)
+            or len(shape) not in (2, 3)
+            or (len(shape) == 3 and shape[-1] not in (1, 3, 4))
+        ):
+            raise ValueError(f"Cannot encode {spec} as PNG.")
+        self._shape = shape
+        self._dtype = np.dtype(spec.dtype)
+        self._level = level
+
+    def reset(self) -> None:
+        pass
+
+    def encode(self, value) -> bytes:
+        value = np.asarray(value, dtype=self._dtype)
+        if value.ndim == 3 and value.shape[-1] == 1:
+            value = value[..., 0]
+        return imageio.v3.imwrite(
+            "<bytes>", value, extension=".png", compress_level=self._level
+        )
+
+    def decode(self, data: bytes) -> np.ndarray:
+        return imageio.v3.imread(data, extension=".png").reshape(self._shape)
+
+
+class _DeltaCodec:
+    """Compresses the bitwise difference with the previous frame with zlib."""
+
+    def __init__(self, spec: specs.Array, level: int) -> None:
+        if np.dtype(spec.dtype).hasobject:
+            raise ValueError(f"Cannot compress observations of dtype {spec.dtype}.")
+        self._shape = tuple(spec.shape)
+        self._dtype = np.dtype(spec.dtype)
+        self._level = level
+        nbytes = int(np.prod(self._shape)) * self._dtype.itemsize
+        self._previous = np.zeros(nbytes, dtype=np.uint8)
+        self._buffer = np.zeros(nbytes + 1, dtype=np.uint8)
+        self._has_previous = False
+
+    def reset(self) -> None:
+        self._has_previous = False
+
+    def encode(self, value) -> bytes:
+        value = np.ascontiguousarray(value, dtype=self._dtype)
+        frame = value.reshape(-1).view(np.uint8)
+        if self._has_previous:
+            self._buffer[0] = _DELTA
+            np.bitwise_xor(frame, self._previous, out=self._buffer[1:])
+        else:
+            self._buffer[0] = _KEYFRAME
+            self._buffer[1:] = frame
+        self._previous[:] = frame
+        self._has_previous = True
+        return zlib.compress(self._buffer, self._level)
+
+    def decode(self, data: bytes) -> np.ndarray:
+        buffer = np.frombuffer(zlib.decompress(data), dtype=np.uint8)
+        frame = np.empty_like(self._previous)
+        if buffer[0] == _DELTA:
+            if not self._has_previous:
+                raise ValueError("Cannot decode a delta frame without its keyframe.")
+            np.bitwise_xor(buffer[1:], self._previous, out=frame)
+        else:
+            frame[:] = buffer[1:]
+        self._previous[:] = frame
+        self._has_previous = True
+        return frame.view(self._dtype).reshape(self._shape)
@@ -0,0 +1,104 @@
+"""Tests for observation_compression.py."""
+
+import pickle
+
+import dm_env
+import numpy as np
+from absl.testing import absltest, parameterized
+from dm_env import specs
+
+from dm_env_wrappers._src import observation_compression
+
+
+class _FakeEnvironment(dm_env.Environment):
+    """A mock environment with 8x6 RGB frames that change every step."""
+
+    def __init__(self, episode_length: int = 3) -> None:
+        self.episode_length = episode_length
+        self.index = 0
+        self.rng = np.random.default_rng(0)
+
+    def reset(self) -> dm_env.TimeStep:
+        self.index = 0
+        return dm_env.restart(self._observation())
+
+    def step(self, action) -> dm_env.TimeStep:
+        del action  # Unused.
+        self.index += 1
+        if self.index == self.episode_length:
+            return dm_env.termination(0.0, self._observation())
+        return dm_env.transition(0.0, self._observation())
+
+    def observation_spec(self):
+        return {
+            "pixels": specs.Array(shape=(8, 6, 3), dtype=np.uint8, name="pixels"),
+            "depth": specs.Array(shape=(8, 6, 1), dtype=np.uint8, name="depth"),
+            "position": specs.Array(shape=(2,), dtype=np.float64),
+        }
+
+    def action_spec(self):
+        return specs.Array(shape=(), dtype=np.int32)
+
+    def _observation(self):
+        # Small changes between frames, as in rendered scenes.
+        noise = self.rng.integers(0, 4, (8, 6, 4), dtype=np.uint8)
+        self.last_observation = {
+            "pixels": noise[..., :3] + np.uint8(self.index),
+            "depth": noise[..., 3:] * np.uint8(50),
+            "position": np.full(2, self.index, dtype=np.float64),
+        }
+        return self.last_observation
+
+
+class ObservationCompressionWrapperTest(parameterized.TestCase):
+    """Tests for ObservationCompressionWrapper."""
+
+    @parameterized.parameters("zlib", "png", "delta")
+    def test_round_trip(self, method: str) -> None:
+        inner = _FakeEnvironment()
+        env = observation_compression.ObservationCompressionWrapper(
+            inner, keys=("pixels", "depth"), method=method
+        )
+        spec = env.observation_spec()
+        self.assertIsInstance(spec["pixels"], specs.StringArray)
+        self.assertEqual(spec["position"].shape, (2,))
+        # Decoders must survive being sent to another process.
+        decoder = pickle.loads(pickle.dumps(env.make_decoder()))
+
+        # Two episodes, so that delta frames restart from a keyframe.
+        for _ in range(2):
+            timestep = env.reset()
+            while True:
+                observation = timestep.observation
+                self.assertIsInstance(observation["pixels"], bytes)
+                spec["pixels"].validate(observation["pixels"])
+                decoded = decoder.decode(observation)
+                for key, value in inner.last_observation.items():
+                    self.assertEqual(decoded[key].dtype, value.dtype)
+                    np.testing.assert_array_equal(decoded[key], value)
+                if timestep.last():
+                    break
+                timestep = env.step(0)
+        env.close()
+
+    def test_invalid_arguments(self) -> None:
+        with self.assertRaises(ValueError):
+            observation_compression.ObservationCompressionWrapper(
+                _FakeEnvironment(), keys=("missing",)
+            )
+        with self.assertRaises(ValueError):
+            observation_compression.ObservationCompressionWrapper(
+                _FakeEnvironment(), method="lz4"
+            )
+        with self.assertRaises(ValueError):
+            observation_compression.ObservationCompressionWrapper(
+                _FakeEnvironment(), keys=("position",), method="png"
+            )
+        with self.assertRaises(ValueError):
+            observation_compression.ObservationCompressionWrapper(
+                _FakeEnvironment(), num_threads=0
+            )
+
+
+if __name__ == "__main__":
+    absltest.main()
@@ -0,0 +1,168 @@
+"""A wrapper that normalizes observations with running statistics."""
+
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import dm_env
+import numpy as np
+import tree
+from dm_env import specs
+
+from dm_env_wrappers._src import base, running_statistics
+
+
+class ObservationNormalizationWrapper(base.EnvironmentWrapper):
+    """Normalizes observations by a running estimate of their mean and variance.
+
+    Every floating-point leaf of the observation (or only those under the given
+    top-level `keys`) is normalized to `(x - mean) / sqrt(variance + epsilon)`,
+    optionally clipped to `[-clip, clip]`, and its spec becomes a float32 `Array`.
+    Statistics are updated with every observation before it is normalized, unless
+    the wrapper is frozen with `freeze()`, e.g. for evaluation.
+
+    Normalized leaves are written in place into float32 buffers owned by the
+    wrapper, so they are only valid until the next `step()` or `reset()` and must
+    be copied to be kept for longer.
+
+    With `batched=True`, observations are batches of samples stacked along their
+    leading axis, e.g. those of a vector environment, and statistics are kept
+    per feature over all samples of the batch. Statistics can be checkpointed
+    with `get_statistics()` and `set_statistics()`, and combined with those of
+    other processes with `merge_statistics()`.
+    """
+
+    _supports_mutable_timesteps = True
+
+    def __init__(
+        self,
+        environment: dm_env.Environment,
+        keys: Optional[Sequence[str]] = None,
+        batched: bool = False,
+        epsilon: float = 1e-8,
+        clip: Optional[float] = None,
+    ) -> None:
+        """Initializes a new ObservationNormalizationWrapper.
+
+        Args:
+          environment: Environment to wrap.
+          keys: Top-level observation keys to normalize. Defaults to all of them.
+          batched: Whether observations have a leading batch axis.
+          epsilon: Added to the variance to avoid dividing by zero.
+          clip: If set, normalized values are clipped to `[-clip, clip]`.
+        """
+        super().__init__(environment)
+
+        observation_spec = self._environment.observation_spec()
+        if keys is not None:
+            if not isinstance(observation_spec, dict):
+                raise ValueError("keys requires a dictionary observation.")
+            missing = set(keys) - set(observation_spec)
+            if missing:
+                raise ValueError(f"Unknown observation keys: {sorted(missing)}.")
+
+        self._frozen = False
+        self._normalizers: Dict[Tuple[Any, ...], _LeafNormalizer] = {}
+        new_specs = []
+        for path, spec in tree.flatten_with_path(observation_spec):
+            selected = keys is None or (path and path[0] in keys)
+            if not selected or not np.issubdtype(spec.dtype, np.floating):
+                new_specs.append(spec)
+                continue
+            if batched and not spec.shape:
+                raise ValueError(f"Batched observation {spec} has no batch axis.")
+            self._normalizers[path] = _LeafNormalizer(spec, batched, epsilon, clip)
+            new_specs.append(
+                specs.Array(shape=spec.shape, dtype=np.float32, name=spec.name)
+            )
+        self._observation_spec = tree.unflatten_as(observation_spec, new_specs)
+        self._indices = [
+            index
+            for index, (path, _) in enumerate(tree.flatten_with_path(observation_spec))
+            if path in self._normalizers
+        ]
+
+    def reset(self) -> dm_env.TimeStep:
+        return self._normalize(self._environment.reset())
+
+    def step(self, action) -> dm_env.TimeStep:
+        return self._normalize(self._environment.step(action))
+
+    def observation_spec(self):
+        return self._observation_spec
+
+    def freeze(self) -> None:
+        """Stops updating the statistics."""
+        self._frozen = True
+
+    def unfreeze(self) -> None:
+        """Resumes updating the statistics."""
+        self._frozen = False
+
+    @property
+    def frozen(self) -> bool:
+        return self._frozen
+
+    def get_statistics(self) -> Dict[Tuple[Any, ...], Dict[str, np.ndarray]]:
+        """Returns a copy of the statistics, keyed by observation path."""
+        return {
+            path: normalizer.statistics.get_state()
+            for path, normalizer in self._normalizers.items()
+        }
+
+    def set_statistics(self, statistics) -> None:
+        """Restores statistics returned by `get_statistics()`."""
+        for path, normalizer in self._normalizers.items():
+            normalizer.statistics.set_state(statistics[path])
+            normalizer.sync()
+
+    def merge_statistics(self, statistics) -> None:
+        """Folds in statistics returned by `get_statistics()` of another wrapper."""
+        for path, normalizer in self._normalizers.items():
+            normalizer.statistics.merge(statistics[path])
+            normalizer.sync()
+
+    # Helper methods.
+
+    def _normalize(self, timestep: dm_env.TimeStep) -> dm_env.TimeStep:
+        values = tree.flatten(timestep.observation)
+        update = not self._frozen
+        for index, normalizer in zip(self._indices, self._normalizers.values()):
+            values[index] = normalizer(values[index], update)
+        return timestep._replace(
+            observation=tree.unflatten_as(self._observation_spec, values)
+        )
+
+
+class _LeafNormalizer:
+    """Normalizes a single observation leaf into a preallocated buffer."""
+
+    def __init__(
+        self,
+        spec: specs.Array,
+        batched: bool,
+        epsilon: float,
+        clip: Optional[float],
+    ) -> None:
+        shape = tuple(spec.shape[1:]) if batched else tuple(spec.shape)
+        self.statistics = running_statistics.RunningStatistics(shape)
+        self._batched = batched
+        self._epsilon = epsilon
+        self._clip = clip
+        self._buffer = np.zeros(spec.shape, dtype=np.float32)
+        self._mean = np.zeros(shape, dtype=np.float32)
+        self._inverse_std = np.ones(shape, dtype=np.float32)
+
+    def sync(self) -> None:
+        """Refreshes the float32 copies of the statistics used for normalizing."""
+        self._mean[...] = self.statistics.mean
+        self._inverse_std[...] = 1.0 / np.sqrt(self.statistics.variance + self._epsilon)
+
+    def __call__(self, value, update: bool) -> np.ndarray:
+        value = np.asarray(value)
+        if update:
+            self.statistics.update(value if self._batched else value[np.newaxis])
+            self.sync()
+        np.subtract(value, self._mean, out=self._buffer, casting="unsafe")
+        np.multiply(self._buffer, self._inverse_std, out=self._buffer)
+        if self._clip is not None:
+            np.clip(self._buffer, -self._clip, self._clip, out=self._buffer)
+        return self._buffer
@@ -0,0 +1,123 @@
+"""Tests for observation_normalization.py."""
+
+import dm_env
+import numpy as np
+from absl.testing import absltest
+from dm_env import specs
+
+from dm_env_wrappers._src import observation_normalization
+
+
+class _FakeEnvironment(dm_env.Environment):
+    """A mock environment returning observations from a list."""
+
+    def __init__(self, observations, batch_shape=()) -> None:
+        self.observations = list(observations)
+        self.batch_shape = batch_shape
+        self.index = 0
+
+    def reset(self) -> dm_env.TimeStep:
+        self.index = 0
+        return dm_env.restart(self._observation())
+
+    def step(self, action) -> dm_env.TimeStep:
+        del action  # Unused.
+        self.index += 1
+        return dm_env.transition(0.0, self._observation())
+
+    def observation_spec(self):
+        return {
+            "position": specs.BoundedArray(
+                self.batch_shape + (2,), np.float64, -10.0, 10.0
+            ),
+            "count": specs.Array(self.batch_shape, np.int32),
+        }
+
+    def action_spec(self):
+        return specs.Array(shape=(), dtype=np.int32)
+
+    def _observation(self):
+        return {
+            "position": self.observations[self.index],
+            "count": np.full(self.batch_shape, self.index, dtype=np.int32),
+        }
+
+
+class ObservationNormalizationWrapperTest(absltest.TestCase):
+    """Tests for ObservationNormalizationWrapper."""
+
+    def test_normalizes_floating_point_leaves(self) -> None:
+        rng = np.random.default_rng(0)
+        observations = rng.normal(5.0, 2.0, size=(20, 2))
+        env = observation_normalization.ObservationNormalizationWrapper(
+            _FakeEnvironment(observations)
+        )
+        spec = env.observation_spec()
+        self.assertEqual(spec["position"].dtype, np.float32)
+        self.assertNotIsInstance(spec["position"], specs.BoundedArray)
+        self.assertEqual(spec["count"].dtype, np.int32)
+
+        timestep = env.reset()
+        for i in range(1, len(observations)):
+            timestep = env.step(0)
+            self.assertEqual(timestep.observation["count"], i)
+        seen = observations
+        expected = (seen[-1] - seen.mean(axis=0)) / np.sqrt(seen.var(axis=0) + 1e-8)
+        position = timestep.observation["position"]
+        self.assertEqual(position.dtype, np.float32)
+        np.testing.assert_allclose(position, expected, rtol=1e-5)
+
+        # Frozen statistics are not updated.
+        statistics = env.get_statistics()
+        env.freeze()
+        env.reset()
+        np.testing.assert_array_equal(
+            env.get_statistics()[("position",)]["mean"],
+            statistics[("position",)]["mean"],
+        )
+
+    def test_batched_merge_and_restore(self) -> None:
+        rng = np.random.default_rng(0)
+        observations = rng.normal(size=(4, 3, 2))
+        env = observation_normalization.ObservationNormalizationWrapper(
+            _FakeEnvironment(observations[:2], batch_shape=(3,)),
+            batched=True,
+            clip=1.0,
+        )
+        other = observation_normalization.ObservationNormalizationWrapper(
+            _FakeEnvironment(observations[2:], batch_shape=(3,)),
+            batched=True,
+        )
+        env.reset()
+        env.step(0)
+        other.reset()
+        other.step(0)
+        env.merge_statistics(other.get_statistics())
+
+        statistics = env.get_statistics()[("position",)]
+        self.assertEqual(statistics["count"], 12)
+        samples = observations.reshape(-1, 2)
+        np.testing.assert_allclose(statistics["mean"], samples.mean(axis=0))
+        np.testing.assert_allclose(statistics["m2"] / 12, samples.var(axis=0))
+
+        restored = observation_normalization.ObservationNormalizationWrapper(
+            _FakeEnvironment(observations, batch_shape=(3,)), batched=True, clip=1.0
+        )
+        restored.set_statistics(env.get_statistics())
+        restored.freeze()
+        position = restored.reset().observation["position"]
+        self.assertLessEqual(np.abs(position).max(), 1.0)
+
+    def test_selects_keys(self) -> None:
+        env = observation_normalization.ObservationNormalizationWrapper(
+            _FakeEnvironment(np.ones((2, 2))), keys=["count"]
+        )
+        self.assertEqual(env.observation_spec()["position"].dtype, np.float64)
+        with self.assertRaises(ValueError):
+            observation_normalization.ObservationNormalizationWrapper(
+                _FakeEnvironment(np.ones((2, 2))), keys=["velocity"]
+            )
+
+
+if __name__ == "__main__":
+    absltest.main()
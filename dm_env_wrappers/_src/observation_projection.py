@@ -0,0 +1,62 @@
+"""A wrapper that keeps only selected keys of dict observations."""
+
+from typing import Sequence
+
+import dm_env
+
+from dm_env_wrappers._src import base
+
+
+class ObservationProjectionWrapper(base.EnvironmentWrapper):
+    """Keeps only the selected keys of dict observations.
+
+    Observations are new dicts holding the selected entries of the wrapped
+    environment's observations, which are shared rather than copied. Combined with
+    `wrap_all(..., prune_observations=True)`, inner wrappers also skip the keys
+    that are dropped here.
+    """
+
+    _supports_mutable_timesteps = True
+
+    def __init__(self, environment: dm_env.Environment, keys: Sequence[str]) -> None:
+        """Initializes a new ObservationProjectionWrapper.
+
+        Args:
+          environment: Environment to wrap.
+          keys: Observation keys to keep.
+        """
+        super().__init__(environment)
+
+        observation_spec = self._environment.observation_spec()
+        if not isinstance(observation_spec, dict):
+            raise ValueError(
+                "ObservationProjectionWrapper requires a dictionary observation."
+            )
+        missing = [key for key in keys if key not in observation_spec]
+        if missing:
+            raise ValueError(f"Unknown observation keys: {missing}.")
+
+        self._keys = tuple(keys)
+        self._observation_spec = {key: observation_spec[key] for key in self._keys}
+
+    def reset(self) -> dm_env.TimeStep:
+        return self._project(self._environment.reset())
+
+    def step(self, action) -> dm_env.TimeStep:
+        return self._project(self._environment.step(action))
+
+    def observation_spec(self):
+        return self._observation_spec
+
+    # Helper methods.
+
+    def _project(self, timestep: dm_env.TimeStep) -> dm_env.TimeStep:
+        observation = timestep.observation
+        return timestep._replace(
+            observation={key: observation[key] for key in self._keys}
+        )
+
+    def _wrapped_observation_keys(self, keys):
+        if keys is None:
+            return frozenset(self._keys)
+        return keys & frozenset(self._keys)
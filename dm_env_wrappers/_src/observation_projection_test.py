@@ -0,0 +1,216 @@
+"""Tests for observation_projection.py."""
+
+import dm_env
+import numpy as np
+import tree
+from absl.testing import absltest
+from dm_env import specs
+
+from dm_env_wrappers._src import (
+    base,
+    concatenate_observations,
+    expand_scalar_observation_shapes,
+    frame_stacking,
+    observation_projection,
+    single_precision,
+)
+
+
+class _FakeEnvironment(dm_env.Environment):
+    """A mock environment with a dict of float64 observations."""
+
+    def __init__(self) -> None:
+        self.index = 0
+
+    def reset(self) -> dm_env.TimeStep:
+        self.index = 0
+        return dm_env.restart(self._observation())
+
+    def step(self, action) -> dm_env.TimeStep:
+        del action  # Unused.
+        self.index += 1
+        return dm_env.transition(1.0, self._observation())
+
+    def observation_spec(self):
+        return {
+            "position": specs.Array(shape=(2,), dtype=np.float64),
+            "time": specs.Array(shape=(), dtype=np.float64),
+            "pixels": specs.Array(shape=(4, 4), dtype=np.float64),
+        }
+
+    def action_spec(self):
+        return specs.Array(shape=(), dtype=np.int32)
+
+    def _observation(self):
+        return {
+            "position": np.full(2, self.index, dtype=np.float64),
+            "time": np.float64(self.index),
+            "pixels": np.full((4, 4), self.index, dtype=np.float64),
+        }
+
+
+class _NonDictEnvironment(dm_env.Environment):
+    """A mock environment with an array or tuple of float64 observations."""
+
+    def __init__(self, nested: bool) -> None:
+        self.nested = nested
+        self.index = 0
+
+    def reset(self) -> dm_env.TimeStep:
+        self.index = 0
+        return dm_env.restart(self._observation())
+
+    def step(self, action) -> dm_env.TimeStep:
+        del action  # Unused.
+        self.index += 1
+        return dm_env.transition(1.0, self._observation())
+
+    def observation_spec(self):
+        spec = specs.Array(shape=(), dtype=np.float64)
+        return (spec, spec) if self.nested else spec
+
+    def action_spec(self):
+        return specs.Array(shape=(), dtype=np.int32)
+
+    def _observation(self):
+        value = np.float64(self.index)
+        return (value, value) if self.nested else value
+
+
+class _DictObservationWrapper(base.EnvironmentWrapper):
+    """Puts the observation under a single key, passing read keys down as is."""
+
+    def reset(self) -> dm_env.TimeStep:
+        return self._to_dict(self._environment.reset())
+
+    def step(self, action) -> dm_env.TimeStep:
+        return self._to_dict(self._environment.step(action))
+
+    def observation_spec(self):
+        return {"observation": self._environment.observation_spec()}
+
+    def _to_dict(self, timestep: dm_env.TimeStep) -> dm_env.TimeStep:
+        return timestep._replace(observation={"observation": timestep.observation})
+
+    def _wrapped_observation_keys(self, keys):
+        return keys
+
+
+class _RecordingWrapper(base.EnvironmentWrapper):
+    """Records the last observation, which it reads in full by default."""
+
+    def step(self, action) -> dm_env.TimeStep:
+        timestep = self._environment.step(action)
+        self.observation = timestep.observation
+        return timestep
+
+
+class _PassThroughRecordingWrapper(_RecordingWrapper):
+    """Records the last observation, declaring that it does not read it."""
+
+    def _wrapped_observation_keys(self, keys):
+        return keys
+
+
+def _make_environment(outer, prune_observations, recorder=_PassThroughRecordingWrapper):
+    return base.wrap_all(
+        _FakeEnvironment(),
+        [
+            single_precision.SinglePrecisionWrapper,
+            expand_scalar_observation_shapes.ExpandScalarObservationShapesWrapper,
+            lambda env: frame_stacking.FrameStackingWrapper(env, num_frames=2),
+            recorder,
+            outer,
+        ],
+        prune_observations=prune_observations,
+    )
+
+
+class ObservationProjectionWrapperTest(absltest.TestCase):
+    """Tests for ObservationProjectionWrapper."""
+
+    def test_keeps_selected_keys(self) -> None:
+        env = observation_projection.ObservationProjectionWrapper(
+            _FakeEnvironment(), keys=("time", "position")
+        )
+        self.assertEqual(list(env.observation_spec()), ["time", "position"])
+        observation = env.step(0).observation
+        self.assertEqual(list(observation), ["time", "position"])
+        np.testing.assert_array_equal(observation["position"], [1.0, 1.0])
+
+        with self.assertRaises(ValueError):
+            observation_projection.ObservationProjectionWrapper(
+                _FakeEnvironment(), keys=("missing",)
+            )
+
+    def test_prunes_dropped_keys(self) -> None:
+        for outer in (
+            lambda env: observation_projection.ObservationProjectionWrapper(
+                env, keys=("position", "time")
+            ),
+            lambda env: concatenate_observations.ConcatObservationWrapper(
+                env, name_filter=("position", "time")
+            ),
+        ):
+            expected = _make_environment(outer, prune_observations=False)
+            env = _make_environment(outer, prune_observations=True)
+            self.assertEqual(env.observation_spec(), expected.observation_spec())
+            expected.reset()
+            env.reset()
+            for _ in range(3):
+                observation = env.step(0).observation
+                np.testing.assert_equal(observation, expected.step(0).observation)
+
+            # The dropped key is passed through the inner wrappers as is.
+            inner = env.find_wrapper(_RecordingWrapper).observation
+            self.assertEqual(inner["pixels"].shape, (4, 4))
+            self.assertEqual(inner["pixels"].dtype, np.float64)
+            self.assertEqual(inner["time"].shape, (1, 2))
+            self.assertEqual(inner["time"].dtype, np.float32)
+
+    def test_does_not_prune_below_reading_wrappers(self) -> None:
+        env = _make_environment(
+            lambda env: observation_projection.ObservationProjectionWrapper(
+                env, keys=("time",)
+            ),
+            prune_observations=True,
+            recorder=_RecordingWrapper,
+        )
+        env.reset()
+        env.step(0)
+        # The recorder keeps the same spec but may read every key, so all of them
+        # are still processed by the inner wrappers.
+        inner = env.find_wrapper(_RecordingWrapper).observation
+        self.assertEqual(inner["pixels"].shape, (4, 4, 2))
+        self.assertEqual(inner["pixels"].dtype, np.float32)
+
+    def test_prunes_non_dict_observations(self) -> None:
+        for nested in (False, True):
+            env = base.wrap_all(
+                _NonDictEnvironment(nested),
+                [
+                    single_precision.SinglePrecisionWrapper,
+                    expand_scalar_observation_shapes.ExpandScalarObservationShapesWrapper,
+                    lambda env: frame_stacking.FrameStackingWrapper(env, num_frames=2),
+                    _DictObservationWrapper,
+                    lambda env: observation_projection.ObservationProjectionWrapper(
+                        env, keys=("observation",)
+                    ),
+                ],
+                prune_observations=True,
+            )
+            env.reset()
+            observation = env.step(0).observation["observation"]
+            # Non-dict observations are processed in full.
+            expected = np.array([[0.0, 1.0]], dtype=np.float32)
+            if nested:
+                self.assertIsInstance(observation, tuple)
+                np.testing.assert_equal(observation, (expected, expected))
+            else:
+                np.testing.assert_equal(observation, expected)
+            for leaf in tree.flatten(observation):
+                self.assertEqual(leaf.dtype, np.float32)
+
+
+if __name__ == "__main__":
+    absltest.main()
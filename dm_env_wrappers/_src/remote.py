@@ -0,0 +1,348 @@
+"""Serving environments over a socket.
+
+An `EnvironmentServer` hosts one or more environments, e.g. `wrap_all` chains,
+and `RemoteEnvironment` exposes one of them as a regular `dm_env.Environment`
+in another process or on another host:
+
+    server = EnvironmentServer([make_env() for _ in range(8)], ("0.0.0.0", 5000))
+    server.start()
+
+    env = RemoteEnvironment(("sim-host", 5000), environment_id=3)
+
+`EnvironmentClient` steps several hosted environments in a single round-trip.
+
+Specs are pickled once when a client connects. After that, actions and
+timesteps are sent in the fixed binary layout of `codec.NestCodec` and
+`codec.TimeStepCodec`, and received timesteps are views into the message they
+arrived in.
+
+Since clients unpickle the specs sent by the server, they must only connect to
+trusted servers.
+"""
+
+import os
+import pickle
+import socket
+import socketserver
+import struct
+import threading
+from typing import List, Optional, Sequence, Tuple, Union
+
+import dm_env
+import numpy as np
+
+from dm_env_wrappers._src import codec
+
+Address = Union[str, Tuple[str, int]]
+
+# Every message is prefixed with its length, and starts with a header holding
+# the command (or status) and the number of environments it concerns.
+_LENGTH = struct.Struct("<Q")
+_HEADER = struct.Struct("<BxxxI")
+_RESET = 0
+_STEP = 1
+_OK = 0
+_ERROR = 1
+
+
+class EnvironmentServer:
+    """Hosts environments for `EnvironmentClient`s over a Unix or TCP socket.
+
+    Every connection is served in its own thread, and the environments of a
+    batched request are stepped one after another. Clients must not step the
+    same environment concurrently. All hosted environments must have the same
+    specs.
+    """
+
+    def __init__(
+        self, environments: Sequence[dm_env.Environment], address: Address
+    ) -> None:
+        """Initializes a new EnvironmentServer and binds its socket.
+
+        Args:
+          environments: The environments to host, addressed by their index.
+          address: A path for a Unix socket, or a `(host, port)` pair for a TCP
+            socket. Port 0 picks a free port, see `address`.
+        """
+        if not environments:
+            raise ValueError("At least one environment is required.")
+        self._environments = list(environments)
+        environment = self._environments[0]
+        self._codec = codec.TimeStepCodec.from_environment(environment)
+        self._action_codec = codec.NestCodec(environment.action_spec())
+        self._handshake = _frame(
+            pickle.dumps(
+                (
+                    len(self._environments),
+                    environment.observation_spec(),
+                    environment.action_spec(),
+                    environment.reward_spec(),
+                    environment.discount_spec(),
+                )
+            )
+        )
+
+        if isinstance(address, str):
+            server_type = socketserver.ThreadingUnixStreamServer
+        else:
+            server_type = socketserver.ThreadingTCPServer
+        self._server = server_type(address, _Handler, bind_and_activate=False)
+        self._server.daemon_threads = True
+        self._server.allow_reuse_address = True
+        self._server.environment_server = self  # type: ignore
+        self._server.server_bind()
+        self._server.server_activate()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> Address:
+        """Returns the address the server is bound to."""
+        return self._server.server_address
+
+    @property
+    def environments(self) -> Sequence[dm_env.Environment]:
+        """Returns the hosted environments."""
+        return self._environments
+
+    def serve_forever(self) -> None:
+        """Serves requests until `close()` is called from another thread."""
+        self._server.serve_forever()
+
+    def start(self) -> None:
+        """Serves requests in a background thread."""
+        self._thread = threading.Thread(
+            target=self.serve_forever, name="EnvironmentServer", daemon=True
+        )
+        self._thread.start()
+
+    def close(self) -> None:
+        """Stops serving and closes the hosted environments."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+        if isinstance(self.address, str):
+            os.unlink(self.address)
+        for environment in self._environments:
+            environment.close()
+
+    # Helper methods.
+
+    def _handle(self, request: bytearray) -> bytearray:
+        command, count = _HEADER.unpack_from(request)
+        environment_ids = np.frombuffer(request, np.uint32, count, _HEADER.size)
+        offset = _HEADER.size + _ids_nbytes(count)
+        response = _new_message(_HEADER.size + count * self._codec.nbytes)
+        _HEADER.pack_into(response, _LENGTH.size, _OK, count)
+        out = _LENGTH.size + _HEADER.size
+        for environment_id in environment_ids:
+            environment = self._environments[environment_id]
+            if command == _RESET:
+                timestep = environment.reset()
+            else:
+                action = self._action_codec.decode(request, offset)
+                offset += self._action_codec.nbytes
+                timestep = environment.step(action)
+            self._codec.encode(timestep, response, out)
+            out += self._codec.nbytes
+        return response
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    """Serves the requests of a single client connection."""
+
+    def handle(self) -> None:
+        server: EnvironmentServer = self.server.environment_server  # type: ignore
+        if self.request.family != socket.AF_UNIX:
+            self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        _send(self.request, server._handshake)
+        while True:
+            message = _receive(self.request)
+            if message is None:
+                return
+            try:
+                response = server._handle(message)
+            except Exception as e:  # pylint: disable=broad-except
+                response = _frame(_HEADER.pack(_ERROR, 0) + repr(e).encode())
+            _send(self.request, response)
+
+
+class EnvironmentClient:
+    """Steps environments hosted by an `EnvironmentServer`."""
+
+    def __init__(self, address: Address) -> None:
+        """Initializes a new EnvironmentClient and connects to the server.
+
+        Args:
+          address: The address of the server, see `EnvironmentServer`.
+        """
+        if isinstance(address, str):
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._socket.connect(address)
+        else:
+            self._socket = socket.create_connection(address)
+            self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        handshake = _receive(self._socket)
+        if handshake is None:
+            raise ConnectionError("The server closed the connection.")
+        (
+            self._num_environments,
+            self._observation_spec,
+            self._action_spec,
+            self._reward_spec,
+            self._discount_spec,
+        ) = pickle.loads(handshake)
+        self._codec = codec.TimeStepCodec(
+            self._observation_spec, self._reward_spec, self._discount_spec
+        )
+        self._action_codec = codec.NestCodec(self._action_spec)
+
+    def reset(self, environment_ids: Sequence[int]) -> List[dm_env.TimeStep]:
+        """Resets the given environments in a single round-trip."""
+        return self._request(_RESET, environment_ids)
+
+    def step(
+        self, environment_ids: Sequence[int], actions: Sequence
+    ) -> List[dm_env.TimeStep]:
+        """Steps the given environments, one action each, in a single round-trip."""
+        if len(actions) != len(environment_ids):
+            raise ValueError("Expected one action per environment id.")
+        return self._request(_STEP, environment_ids, actions)
+
+    @property
+    def num_environments(self) -> int:
+        """Returns the number of environments hosted by the server."""
+        return self._num_environments
+
+    def observation_spec(self):
+        return self._observation_spec
+
+    def action_spec(self):
+        return self._action_spec
+
+    def reward_spec(self):
+        return self._reward_spec
+
+    def discount_spec(self):
+        return self._discount_spec
+
+    def close(self) -> None:
+        self._socket.close()
+
+    # Helper methods.
+
+    def _request(
+        self, command: int, environment_ids: Sequence[int], actions: Sequence = ()
+    ) -> List[dm_env.TimeStep]:
+        environment_ids = np.asarray(environment_ids, dtype=np.uint32)
+        count = len(environment_ids)
+        if np.any(environment_ids >= self._num_environments):
+            raise ValueError(
+                f"Environment ids must be smaller than {self._num_environments}."
+            )
+
+        action_nbytes = self._action_codec.nbytes
+        offset = _LENGTH.size + _HEADER.size
+        request = _new_message(
+            _HEADER.size + _ids_nbytes(count) + len(actions) * action_nbytes
+        )
+        _HEADER.pack_into(request, _LENGTH.size, command, count)
+        np.frombuffer(request, np.uint32, count, offset)[:] = environment_ids
+        offset += _ids_nbytes(count)
+        for action in actions:
+            self._action_codec.encode(action, request, offset)
+            offset += action_nbytes
+        _send(self._socket, request)
+
+        response = _receive(self._socket)
+        if response is None:
+            raise ConnectionError("The server closed the connection.")
+        status, _ = _HEADER.unpack_from(response)
+        if status == _ERROR:
+            raise RuntimeError(
+                "The environment server failed: "
+                f"{bytes(response[_HEADER.size :]).decode()}"
+            )
+        # The timesteps are views into the response, which is never reused.
+        return [
+            self._codec.decode(response, _HEADER.size + i * self._codec.nbytes)
+            for i in range(count)
+        ]
+
+
+class RemoteEnvironment(dm_env.Environment):
+    """A `dm_env.Environment` backed by an environment of an `EnvironmentServer`."""
+
+    def __init__(self, address: Address, environment_id: int = 0) -> None:
+        """Initializes a new RemoteEnvironment.
+
+        Args:
+          address: The address of the server, see `EnvironmentServer`.
+          environment_id: Index of the hosted environment to use.
+        """
+        self._client = EnvironmentClient(address)
+        self._environment_ids = (environment_id,)
+
+    def reset(self) -> dm_env.TimeStep:
+        return self._client.reset(self._environment_ids)[0]
+
+    def step(self, action) -> dm_env.TimeStep:
+        return self._client.step(self._environment_ids, (action,))[0]
+
+    def observation_spec(self):
+        return self._client.observation_spec()
+
+    def action_spec(self):
+        return self._client.action_spec()
+
+    def reward_spec(self):
+        return self._client.reward_spec()
+
+    def discount_spec(self):
+        return self._client.discount_spec()
+
+    def close(self):
+        self._client.close()
+
+
+def _new_message(size: int) -> bytearray:
+    """Returns a zeroed message with room for its length prefix and `size` bytes."""
+    return bytearray(_LENGTH.size + size)
+
+
+def _frame(payload: bytes) -> bytearray:
+    message = _new_message(len(payload))
+    message[_LENGTH.size :] = payload
+    return message
+
+
+def _send(sock: socket.socket, message: bytearray) -> None:
+    _LENGTH.pack_into(message, 0, len(message) - _LENGTH.size)
+    sock.sendall(message)
+
+
+def _ids_nbytes(count: int) -> int:
+    # Environment ids are padded to 8 bytes, which keeps the values after them
+    # aligned.
+    return 4 * (count + count % 2)
+
+
+def _receive(sock: socket.socket) -> Optional[bytearray]:
+    """Receives a message, or returns None if the connection was closed."""
+    header = _receive_exactly(sock, _LENGTH.size)
+    if header is None:
+        return None
+    (length,) = _LENGTH.unpack(header)
+    return _receive_exactly(sock, length)
+
+
+def _receive_exactly(sock: socket.socket, size: int) -> Optional[bytearray]:
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    while view:
+        received = sock.recv_into(view)
+        if not received:
+            return None
+        view = view[received:]
+    return buffer
@@ -0,0 +1,140 @@
+"""Tests for remote.py."""
+
+import os
+import tempfile
+
+import dm_env
+import numpy as np
+from absl.testing import absltest
+from dm_env import specs
+
+from dm_env_wrappers._src import remote
+
+
+class _FakeEnvironment(dm_env.Environment):
+    """A mock environment with a nested observation."""
+
+    def __init__(self, index: int) -> None:
+        self.index = index
+        self.num_steps = 0
+        self.closed = False
+
+    def reset(self) -> dm_env.TimeStep:
+        self.num_steps = 0
+        return dm_env.restart(self._observation())
+
+    def step(self, action) -> dm_env.TimeStep:
+        if np.any(np.isnan(action["force"])):
+            raise ValueError("NaN action.")
+        self.num_steps += 1
+        self.last_action = action
+        observation = self._observation()
+        if self.num_steps == 2:
+            return dm_env.termination(float(action["force"].sum()), observation)
+        return dm_env.transition(float(action["force"].sum()), observation, 0.5)
+
+    def observation_spec(self):
+        return {
+            "pixels": specs.Array(shape=(4, 4, 3), dtype=np.uint8),
+            "sensors": (
+                specs.Array(shape=(2,), dtype=np.float64),
+                specs.Array(shape=(), dtype=np.int32),
+            ),
+        }
+
+    def action_spec(self):
+        return {
+            "force": specs.BoundedArray((2,), np.float32, -1.0, 1.0),
+            "grip": specs.DiscreteArray(2),
+        }
+
+    def close(self):
+        self.closed = True
+
+    def _observation(self):
+        return {
+            "pixels": np.full((4, 4, 3), self.index, dtype=np.uint8),
+            "sensors": (
+                np.arange(2, dtype=np.float64) + self.num_steps,
+                np.int32(self.num_steps),
+            ),
+        }
+
+
+def _action(value: float):
+    return {"force": np.full(2, value, dtype=np.float32), "grip": 1}
+
+
+class RemoteEnvironmentTest(absltest.TestCase):
+    """Tests for EnvironmentServer, EnvironmentClient and RemoteEnvironment."""
+
+    def _assert_timestep_equal(self, actual, expected) -> None:
+        self.assertEqual(actual.step_type, expected.step_type)
+        self.assertEqual(actual.reward, expected.reward)
+        self.assertEqual(actual.discount, expected.discount)
+        np.testing.assert_array_equal(
+            actual.observation["pixels"], expected.observation["pixels"]
+        )
+        for a, e in zip(actual.observation["sensors"], expected.observation["sensors"]):
+            np.testing.assert_array_equal(a, e)
+            self.assertEqual(a.shape, np.shape(e))
+
+    def test_tcp_round_trip(self) -> None:
+        environments = [_FakeEnvironment(i) for i in range(2)]
+        references = [_FakeEnvironment(i) for i in range(2)]
+        server = remote.EnvironmentServer(environments, ("localhost", 0))
+        server.start()
+
+        env = remote.RemoteEnvironment(server.address, environment_id=1)
+        self.assertEqual(env.observation_spec(), references[1].observation_spec())
+        self.assertEqual(env.action_spec(), references[1].action_spec())
+
+        self._assert_timestep_equal(env.reset(), references[1].reset())
+        for value in (0.25, 0.5):
+            self._assert_timestep_equal(
+                env.step(_action(value)), references[1].step(_action(value))
+            )
+        self.assertEqual(environments[1].last_action["force"].dtype, np.float32)
+        self.assertEqual(environments[0].num_steps, 0)
+
+        env.close()
+        server.close()
+        for environment in environments:
+            self.assertTrue(environment.closed)
+
+    def test_unix_socket_batched_requests(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "env.sock")
+            server = remote.EnvironmentServer(
+                [_FakeEnvironment(i) for i in range(3)], path
+            )
+            server.start()
+            client = remote.EnvironmentClient(path)
+            self.assertEqual(client.num_environments, 3)
+
+            timesteps = client.reset([2, 0])
+            self.assertTrue(all(timestep.first() for timestep in timesteps))
+            self.assertIsNone(timesteps[0].reward)
+            self.assertEqual(timesteps[0].observation["pixels"][0, 0, 0], 2)
+            self.assertEqual(timesteps[1].observation["pixels"][0, 0, 0], 0)
+
+            timesteps = client.step([2, 0], [_action(0.5), _action(-0.5)])
+            self.assertEqual([t.reward for t in timesteps], [1.0, -1.0])
+            self.assertEqual(timesteps[0].discount, 0.5)
+
+            with self.assertRaises(ValueError):
+                client.step([0], [_action(0.0), _action(0.0)])
+            with self.assertRaises(ValueError):
+                client.reset([3])
+            with self.assertRaisesRegex(RuntimeError, "NaN action"):
+                client.step([0], [_action(np.nan)])
+            # The connection is still usable after a failure.
+            self.assertEqual(client.step([0], [_action(0.5)])[0].reward, 1.0)
+
+            client.close()
+            server.close()
+            self.assertFalse(os.path.exists(path))
+
+
+if __name__ == "__main__":
+    absltest.main()
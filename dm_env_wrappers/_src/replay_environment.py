@@ -0,0 +1,173 @@
+"""An environment that replays trajectories recorded by TrajectoryRecorderWrapper."""
+
+import os
+import pickle
+from typing import List, Optional
+
+import dm_env
+import numpy as np
+import tree
+
+from dm_env_wrappers._src import trajectory_recorder
+
+
+class ReplayEnvironment(dm_env.Environment):
+    """Replays recorded timesteps from memory-mapped `.npy` chunks.
+
+    The recording's chunks are memory-mapped read-only and its rows are returned
+    one by one, regardless of the actions passed to `step()`. Observations are
+    read-only views into the memory-mapped files, so stepping costs next to
+    nothing and needs neither the simulator nor its dependencies. This makes it
+    useful for benchmarking wrapper stacks and input pipelines on real data.
+
+    `reset()` skips to the start of the next recorded episode. Once all rows have
+    been replayed, the replay starts over from the first episode if `loop` is
+    set, and raises a ValueError otherwise. If `action_tolerance` is set, every
+    action is compared to the recorded one, and a ValueError is raised when they
+    differ by more than the tolerance.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        loop: bool = True,
+        action_tolerance: Optional[float] = None,
+    ) -> None:
+        """Initializes a new ReplayEnvironment.
+
+        Args:
+          directory: Directory written by a `TrajectoryRecorderWrapper`.
+          loop: Whether to start over once all rows have been replayed.
+          action_tolerance: If set, the maximum absolute difference allowed
+            between actions and recorded actions.
+        """
+        with open(
+            os.path.join(directory, trajectory_recorder.SPECS_FILENAME), "rb"
+        ) as f:
+            (
+                self._observation_spec,
+                self._action_spec,
+                self._reward_spec,
+                self._discount_spec,
+            ) = pickle.load(f)
+        fields = trajectory_recorder.trajectory_fields(
+            self._observation_spec,
+            self._action_spec,
+            self._reward_spec,
+            self._discount_spec,
+        )
+
+        # Only complete chunks are named with digits only.
+        chunk_names = sorted(name for name in os.listdir(directory) if name.isdigit())
+        self._chunks: List[List[np.ndarray]] = [
+            [
+                np.load(os.path.join(directory, name, field + ".npy"), mmap_mode="r")
+                for field, _ in fields
+            ]
+            for name in chunk_names
+        ]
+        self._chunks = [chunk for chunk in self._chunks if len(chunk[0])]
+        if not self._chunks or not any(
+            np.any(chunk[0] == dm_env.StepType.FIRST) for chunk in self._chunks
+        ):
+            raise ValueError(f"No recorded episodes found in {directory}.")
+
+        num_observations = len(tree.flatten(self._observation_spec))
+        num_actions = len(tree.flatten(self._action_spec))
+        num_rewards = len(tree.flatten(self._reward_spec))
+        start = 1
+        self._observation_slice = slice(start, start + num_observations)
+        start += num_observations
+        self._action_slice = slice(start, start + num_actions)
+        start += num_actions
+        self._reward_slice = slice(start, start + num_rewards)
+        self._discount_slice = slice(start + num_rewards, None)
+
+        self._loop = loop
+        self._action_tolerance = action_tolerance
+        self._chunk_index = 0
+        self._row = 0
+        self._episode_ended = True
+
+    def reset(self) -> dm_env.TimeStep:
+        self._seek_first()
+        return self._emit()
+
+    def step(self, action) -> dm_env.TimeStep:
+        if self._episode_ended:
+            return self.reset()
+        if self._row == len(self._chunks[self._chunk_index][0]):
+            self._next_chunk()
+        chunk, row = self._chunks[self._chunk_index], self._row
+        # Actions are not checked when the recording continues with a new episode,
+        # e.g. when looping back from a truncated final episode.
+        if (
+            self._action_tolerance is not None
+            and chunk[0][row] != dm_env.StepType.FIRST
+        ):
+            self._check_action(action)
+        return self._emit()
+
+    def observation_spec(self):
+        return self._observation_spec
+
+    def action_spec(self):
+        return self._action_spec
+
+    def reward_spec(self):
+        return self._reward_spec
+
+    def discount_spec(self):
+        return self._discount_spec
+
+    # Helper methods.
+
+    def _next_chunk(self) -> None:
+        self._chunk_index += 1
+        self._row = 0
+        if self._chunk_index == len(self._chunks):
+            if not self._loop:
+                raise ValueError("All recorded timesteps have been replayed.")
+            self._chunk_index = 0
+
+    def _seek_first(self) -> None:
+        while True:
+            step_types = self._chunks[self._chunk_index][0][self._row :]
+            (firsts,) = np.nonzero(step_types == dm_env.StepType.FIRST)
+            if len(firsts):
+                self._row += int(firsts[0])
+                return
+            self._next_chunk()
+
+    def _check_action(self, action) -> None:
+        chunk, row = self._chunks[self._chunk_index], self._row
+        recorded = [array[row] for array in chunk[self._action_slice]]
+        for value, expected in zip(tree.flatten(action), recorded):
+            if not np.allclose(value, expected, rtol=0.0, atol=self._action_tolerance):
+                raise ValueError(
+                    f"Action {action} diverges from the recorded action "
+                    f"{tree.unflatten_as(self._action_spec, recorded)}."
+                )
+
+    def _emit(self) -> dm_env.TimeStep:
+        chunk, row = self._chunks[self._chunk_index], self._row
+        self._row += 1
+        step_type = dm_env.StepType(chunk[0][row])
+        self._episode_ended = step_type == dm_env.StepType.LAST
+        observation = tree.unflatten_as(
+            self._observation_spec,
+            [array[row] for array in chunk[self._observation_slice]],
+        )
+        if step_type == dm_env.StepType.FIRST:
+            return dm_env.TimeStep(step_type, None, None, observation)
+        return dm_env.TimeStep(
+            step_type,
+            tree.unflatten_as(
+                self._reward_spec, [array[row] for array in chunk[self._reward_slice]]
+            ),
+            tree.unflatten_as(
+                self._discount_spec,
+                [array[row] for array in chunk[self._discount_slice]],
+            ),
+            observation,
+        )
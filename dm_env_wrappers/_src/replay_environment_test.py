@@ -0,0 +1,112 @@
+"""Tests for replay_environment.py."""
+
+import tempfile
+
+import dm_env
+import numpy as np
+from absl.testing import absltest
+from dm_env import specs
+
+from dm_env_wrappers._src import replay_environment, trajectory_recorder
+
+
+class _FakeEnvironment(dm_env.Environment):
+    """A mock environment with 3-step episodes."""
+
+    def __init__(self) -> None:
+        self.num_steps = 0
+        self.num_episodes = 0
+
+    def reset(self) -> dm_env.TimeStep:
+        self.num_steps = 0
+        self.num_episodes += 1
+        return dm_env.restart(self._observation())
+
+    def step(self, action) -> dm_env.TimeStep:
+        self.num_steps += 1
+        reward = float(np.sum(action["force"]))
+        if self.num_steps == 3:
+            return dm_env.termination(reward, self._observation())
+        return dm_env.transition(reward, self._observation(), 0.5)
+
+    def observation_spec(self):
+        return {"state": specs.Array(shape=(2,), dtype=np.float32)}
+
+    def action_spec(self):
+        return {"force": specs.Array(shape=(2,), dtype=np.float32)}
+
+    def _observation(self):
+        return {
+            "state": np.array([self.num_episodes, self.num_steps], dtype=np.float32)
+        }
+
+
+def _action(value: float):
+    return {"force": np.full(2, value, dtype=np.float32)}
+
+
+class ReplayEnvironmentTest(absltest.TestCase):
+    """Tests for ReplayEnvironment."""
+
+    def setUp(self) -> None:
+        super().setUp()
+        self._directory = self.enter_context(tempfile.TemporaryDirectory())
+        self._timesteps = []
+        env = trajectory_recorder.TrajectoryRecorderWrapper(
+            _FakeEnvironment(), self._directory, chunk_length=5
+        )
+        for _ in range(2):
+            self._timesteps.append(env.reset())
+            for i in range(3):
+                self._timesteps.append(env.step(_action(i)))
+        # A truncated episode at the end of the recording.
+        self._timesteps.append(env.reset())
+        self._timesteps.append(env.step(_action(0)))
+        env.close()
+
+    def _assert_timestep_equal(self, actual, expected) -> None:
+        self.assertEqual(actual.step_type, expected.step_type)
+        self.assertEqual(actual.reward, expected.reward)
+        self.assertEqual(actual.discount, expected.discount)
+        np.testing.assert_array_equal(
+            actual.observation["state"], expected.observation["state"]
+        )
+
+    def test_replays_recorded_timesteps(self) -> None:
+        env = replay_environment.ReplayEnvironment(self._directory)
+        self.assertEqual(env.action_spec(), _FakeEnvironment().action_spec())
+
+        replayed = [env.reset()]
+        for _ in range(len(self._timesteps) - 1):
+            # Actions are ignored, and the step after LAST starts a new episode.
+            replayed.append(env.step(_action(100)))
+        for actual, expected in zip(replayed, self._timesteps):
+            self._assert_timestep_equal(actual, expected)
+        self.assertFalse(replayed[-1].observation["state"].flags.writeable)
+
+        # The replay loops back to the first episode.
+        self._assert_timestep_equal(env.step(_action(0)), self._timesteps[0])
+        # Reset skips the rest of the current episode.
+        self._assert_timestep_equal(env.reset(), self._timesteps[4])
+
+    def test_stops_without_loop(self) -> None:
+        env = replay_environment.ReplayEnvironment(self._directory, loop=False)
+        env.reset()
+        for _ in range(len(self._timesteps) - 1):
+            env.step(_action(0))
+        with self.assertRaises(ValueError):
+            env.step(_action(0))
+
+    def test_checks_actions(self) -> None:
+        env = replay_environment.ReplayEnvironment(
+            self._directory, action_tolerance=1e-6
+        )
+        env.reset()
+        env.step(_action(0))
+        env.step(_action(1 + 1e-7))
+        with self.assertRaises(ValueError):
+            env.step(_action(3))
+
+
+if __name__ == "__main__":
+    absltest.main()
@@ -0,0 +1,84 @@
+"""Wrapper that prepares the next episode in a background thread."""
+
+import concurrent.futures
+from typing import Callable, Tuple
+
+import dm_env
+
+
+class ResetPrefetchWrapper(dm_env.Environment):
+    """Resets a spare environment in the background while an episode is running.
+
+    Two environments are built with `environment_factory`. One of them runs the
+    current episode, while the other is reset in a background thread. `reset()`
+    swaps them, immediately returns the FIRST timestep prepared in the background
+    and starts resetting the environment that ran the previous episode. This hides
+    the cost of expensive resets, such as arena randomization or mesh loading.
+
+    Since consecutive episodes run on different environment instances, the
+    factory should seed them differently, and objects such as `physics` change
+    with every reset. Attributes are forwarded to the environment running the
+    current episode.
+    """
+
+    # Note: we don't inherit from base.EnvironmentWrapper because the wrapped
+    # environment changes between episodes, which outer wrappers must not cache.
+
+    def __init__(self, environment_factory: Callable[[], dm_env.Environment]):
+        """Initializes a new ResetPrefetchWrapper.
+
+        Args:
+          environment_factory: Callable returning a new environment.
+        """
+        self._environment = environment_factory()
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="ResetPrefetchWrapper"
+        )
+        self._next_reset = self._executor.submit(_reset, environment_factory())
+
+    def reset(self) -> dm_env.TimeStep:
+        environment, timestep = self._next_reset.result()
+        previous_environment, self._environment = self._environment, environment
+        self._next_reset = self._executor.submit(_reset, previous_environment)
+        return timestep
+
+    def step(self, action) -> dm_env.TimeStep:
+        return self._environment.step(action)
+
+    def action_spec(self):
+        return self._environment.action_spec()
+
+    def discount_spec(self):
+        return self._environment.discount_spec()
+
+    def observation_spec(self):
+        return self._environment.observation_spec()
+
+    def reward_spec(self):
+        return self._environment.reward_spec()
+
+    @property
+    def environment(self) -> dm_env.Environment:
+        """Returns the environment running the current episode."""
+        return self._environment
+
+    def __getattr__(self, name: str):
+        if name.startswith("__"):
+            raise AttributeError(
+                "attempted to get missing private attribute '{}'".format(name)
+            )
+        return getattr(self._environment, name)
+
+    def close(self):
+        try:
+            spare_environment, _ = self._next_reset.result()
+            spare_environment.close()
+        finally:
+            self._executor.shutdown()
+            self._environment.close()
+
+
+def _reset(
+    environment: dm_env.Environment,
+) -> Tuple[dm_env.Environment, dm_env.TimeStep]:
+    return environment, environment.reset()
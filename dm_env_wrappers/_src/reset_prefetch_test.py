@@ -0,0 +1,68 @@
+"""Tests for reset_prefetch.py."""
+
+import itertools
+import threading
+
+import dm_env
+from absl.testing import absltest
+
+from dm_env_wrappers._src import reset_prefetch
+
+
+class _FakeEnvironment(dm_env.Environment):
+    """A mock environment that records which thread resets it."""
+
+    def __init__(self, index: int) -> None:
+        self.index = index
+        self.reset_threads = []
+        self.closed = False
+
+    def reset(self) -> dm_env.TimeStep:
+        self.reset_threads.append(threading.current_thread())
+        return dm_env.restart(self.index)
+
+    def step(self, action) -> dm_env.TimeStep:
+        del action  # Unused.
+        return dm_env.transition(1.0, self.index)
+
+    def observation_spec(self):
+        return None
+
+    def action_spec(self):
+        return None
+
+    def close(self):
+        self.closed = True
+
+
+class ResetPrefetchWrapperTest(absltest.TestCase):
+    """Tests for ResetPrefetchWrapper."""
+
+    def test_alternates_prefetched_environments(self) -> None:
+        counter = itertools.count()
+        environments = []
+
+        def factory():
+            environments.append(_FakeEnvironment(next(counter)))
+            return environments[-1]
+
+        env = reset_prefetch.ResetPrefetchWrapper(factory)
+        self.assertLen(environments, 2)
+
+        for expected_index in (1, 0, 1):
+            timestep = env.reset()
+            self.assertTrue(timestep.first())
+            self.assertEqual(timestep.observation, expected_index)
+            self.assertEqual(env.step(0).observation, expected_index)
+            self.assertEqual(env.index, expected_index)
+
+        env.close()
+        for environment in environments:
+            self.assertTrue(environment.closed)
+            self.assertNotEmpty(environment.reset_threads)
+            for thread in environment.reset_threads:
+                self.assertIsNot(thread, threading.main_thread())
+
+
+if __name__ == "__main__":
+    absltest.main()
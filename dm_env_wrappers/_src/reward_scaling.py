@@ -0,0 +1,135 @@
+"""A wrapper that scales rewards by the spread of the discounted return."""
+
+from typing import Dict, Optional
+
+import dm_env
+import numpy as np
+from dm_env import specs
+
+from dm_env_wrappers._src import base, running_statistics
+
+
+class RewardScalingWrapper(base.EnvironmentWrapper):
+    """Scales rewards by a running estimate of the discounted return's std.
+
+    A running discounted return `G = r + gamma * d * G` is kept, where `d` is the
+    discount of the previous timestep, and reset at the start of every episode.
+    Rewards are divided by the running standard deviation of `G` (they are not
+    centered), and optionally clipped to `[-clip, clip]`. Rewards are left as is
+    until at least two returns have been observed. FIRST timesteps pass through
+    unchanged.
+
+    This should wrap an `ActionRepeatWrapper` rather than be wrapped by one, so
+    that it sees the accumulated reward and discount of every agent step, and
+    `gamma` should be the agent's discount factor.
+
+    With `batched=True`, rewards, discounts and step types are batched along their
+    leading axis, e.g. those of a vector environment, and the returns of all
+    entries feed into a single set of statistics. Statistics can be checkpointed
+    with `get_statistics()` and `set_statistics()`, and combined with those of
+    other processes with `merge_statistics()`.
+    """
+
+    _passes_observation_through = True
+    _supports_mutable_timesteps = True
+
+    def __init__(
+        self,
+        environment: dm_env.Environment,
+        gamma: float = 0.99,
+        batched: bool = False,
+        epsilon: float = 1e-8,
+        clip: Optional[float] = None,
+    ) -> None:
+        """Initializes a new RewardScalingWrapper.
+
+        Args:
+          environment: Environment to wrap.
+          gamma: Discount factor of the running return.
+          batched: Whether rewards, discounts and step types have a leading batch
+            axis.
+          epsilon: Added to the variance to avoid dividing by zero.
+          clip: If set, scaled rewards are clipped to `[-clip, clip]`.
+        """
+        super().__init__(environment)
+
+        if not 0.0 <= gamma <= 1.0:
+            raise ValueError("gamma must be in [0, 1].")
+        reward_spec = self._environment.reward_spec()
+        if not isinstance(reward_spec, specs.Array) or not np.issubdtype(
+            reward_spec.dtype, np.floating
+        ):
+            raise ValueError("RewardScalingWrapper requires a floating-point reward.")
+        if batched and not reward_spec.shape:
+            raise ValueError("Batched rewards must have a batch axis.")
+
+        self._gamma = gamma
+        self._batched = batched
+        self._epsilon = epsilon
+        self._clip = clip
+        self._dtype = reward_spec.dtype
+        shape = tuple(reward_spec.shape)
+        self._statistics = running_statistics.RunningStatistics(
+            shape[1:] if batched else shape
+        )
+        # The running return and previous discount of every batch entry.
+        self._return = np.zeros(shape if batched else (1,) + shape)
+        self._discount = np.ones_like(self._return)
+        self._scale = np.ones(self._statistics.mean.shape)
+
+    def reset(self) -> dm_env.TimeStep:
+        return self._reset_return(self._environment.reset())
+
+    def step(self, action) -> dm_env.TimeStep:
+        timestep = self._environment.step(action)
+        if not self._batched:
+            if timestep.first():
+                return self._reset_return(timestep)
+            first = np.zeros(1, dtype=bool)
+            reward = np.asarray(timestep.reward)[np.newaxis]
+            discount = np.asarray(timestep.discount)[np.newaxis]
+        else:
+            if timestep.reward is None:
+                return self._reset_return(timestep)
+            first = np.asarray(timestep.step_type) == dm_env.StepType.FIRST
+            reward = np.asarray(timestep.reward)
+            discount = np.asarray(timestep.discount)
+
+        self._return *= self._gamma * self._discount
+        self._return += reward
+        self._return[first] = 0.0
+        self._discount[...] = discount
+        self._discount[first] = 1.0
+        self._statistics.update(self._return[~first])
+        self._update_scale()
+
+        scaled = reward * self._scale
+        if self._clip is not None:
+            np.clip(scaled, -self._clip, self._clip, out=scaled)
+        scaled = scaled.astype(self._dtype, copy=False)
+        return timestep._replace(reward=scaled if self._batched else scaled[0])
+
+    def get_statistics(self) -> Dict[str, np.ndarray]:
+        """Returns a copy of the return statistics."""
+        return self._statistics.get_state()
+
+    def set_statistics(self, statistics: Dict[str, np.ndarray]) -> None:
+        """Restores statistics returned by `get_statistics()`."""
+        self._statistics.set_state(statistics)
+        self._update_scale()
+
+    def merge_statistics(self, statistics: Dict[str, np.ndarray]) -> None:
+        """Folds in statistics returned by `get_statistics()` of another wrapper."""
+        self._statistics.merge(statistics)
+        self._update_scale()
+
+    # Helper methods.
+
+    def _reset_return(self, timestep: dm_env.TimeStep) -> dm_env.TimeStep:
+        self._return[...] = 0.0
+        self._discount[...] = 1.0
+        return timestep
+
+    def _update_scale(self) -> None:
+        if self._statistics.count >= 2:
+            self._scale[...] = 1.0 / np.sqrt(self._statistics.variance + self._epsilon)
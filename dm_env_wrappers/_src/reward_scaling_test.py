@@ -0,0 +1,118 @@
+"""Tests for reward_scaling.py."""
+
+import dm_env
+import numpy as np
+from absl.testing import absltest
+from dm_env import specs
+
+from dm_env_wrappers._src import action_repeat, reward_scaling
+
+
+class _FakeEnvironment(dm_env.Environment):
+    """A mock environment returning rewards and discounts from lists."""
+
+    def __init__(self, rewards, discounts, reward_shape=()) -> None:
+        self.rewards = rewards
+        self.discounts = discounts
+        self.reward_shape = reward_shape
+        self.index = 0
+
+    def reset(self) -> dm_env.TimeStep:
+        self.index = 0
+        return dm_env.restart(0)
+
+    def step(self, action) -> dm_env.TimeStep:
+        del action  # Unused.
+        reward = self.rewards[self.index]
+        discount = self.discounts[self.index]
+        self.index += 1
+        step_type = dm_env.StepType.MID
+        if self.reward_shape:
+            step_type = np.full(self.reward_shape, dm_env.StepType.MID, np.uint8)
+        return dm_env.TimeStep(step_type, reward, discount, 0)
+
+    def reward_spec(self):
+        return specs.Array(shape=self.reward_shape, dtype=np.float64)
+
+    def observation_spec(self):
+        return specs.Array(shape=(), dtype=np.int32)
+
+    def action_spec(self):
+        return specs.Array(shape=(), dtype=np.int32)
+
+
+def _expected_rewards(rewards, discounts, gamma):
+    returns, scaled = [], []
+    value = 0.0
+    previous_discount = 1.0
+    for reward, discount in zip(rewards, discounts):
+        value = reward + gamma * previous_discount * value
+        previous_discount = discount
+        returns.append(value)
+        if len(returns) < 2:
+            scaled.append(reward)
+        else:
+            scaled.append(reward / np.sqrt(np.var(returns) + 1e-8))
+    return scaled
+
+
+class RewardScalingWrapperTest(absltest.TestCase):
+    """Tests for RewardScalingWrapper."""
+
+    def test_scales_by_return_std(self) -> None:
+        rng = np.random.default_rng(0)
+        rewards = list(rng.normal(size=10))
+        discounts = [1.0, 0.5, 1.0, 1.0, 0.0, 1.0, 1.0, 0.9, 1.0, 1.0]
+        env = reward_scaling.RewardScalingWrapper(
+            _FakeEnvironment(rewards, discounts), gamma=0.9
+        )
+        self.assertIsNone(env.reset().reward)
+        scaled = [env.step(0).reward for _ in rewards]
+        np.testing.assert_allclose(
+            scaled, _expected_rewards(rewards, discounts, 0.9), rtol=1e-6
+        )
+
+    def test_batched(self) -> None:
+        rewards = [np.array([1.0, 2.0]), np.array([3.0, 4.0]), np.array([0.0, 1.0])]
+        discounts = [np.ones(2)] * 3
+        env = reward_scaling.RewardScalingWrapper(
+            _FakeEnvironment(rewards, discounts, reward_shape=(2,)),
+            gamma=0.5,
+            batched=True,
+        )
+        env.reset()
+        for _ in rewards:
+            scaled = env.step(0).reward
+        returns = np.array([1.0, 2.0, 3.5, 5.0, 1.75, 3.5])
+        np.testing.assert_allclose(scaled, rewards[-1] / np.sqrt(returns.var() + 1e-8))
+        self.assertEqual(env.get_statistics()["count"], 6)
+
+    def test_statistics_round_trip(self) -> None:
+        rewards = [1.0, 2.0, 3.0]
+        env = reward_scaling.RewardScalingWrapper(
+            action_repeat.ActionRepeatWrapper(
+                _FakeEnvironment(rewards * 2, [1.0] * 6), num_repeats=2
+            )
+        )
+        env.reset()
+        for _ in range(3):
+            env.step(0)
+        restored = reward_scaling.RewardScalingWrapper(_FakeEnvironment([1.0], [1.0]))
+        restored.set_statistics(env.get_statistics())
+        restored.merge_statistics(env.get_statistics())
+        self.assertEqual(restored.get_statistics()["count"], 6)
+        restored.reset()
+        reward = restored.step(0).reward
+        statistics = restored.get_statistics()
+        self.assertEqual(statistics["count"], 7)
+        np.testing.assert_allclose(reward, 1.0 / np.sqrt(statistics["m2"] / 7 + 1e-8))
+
+    def test_rejects_invalid_reward_spec(self) -> None:
+        env = _FakeEnvironment([], [])
+        env.reward_spec = lambda: specs.Array(shape=(), dtype=np.int32)
+        with self.assertRaises(ValueError):
+            reward_scaling.RewardScalingWrapper(env)
+
+
+if __name__ == "__main__":
+    absltest.main()
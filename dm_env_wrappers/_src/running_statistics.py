@@ -0,0 +1,82 @@
+"""Running mean and variance estimates that can be merged across processes."""
+
+from typing import Dict, Sequence
+
+import numpy as np
+
+
+class RunningStatistics:
+    """Running mean and variance of arrays of a fixed shape.
+
+    Batches of samples are folded in with the parallel algorithm of Chan et al.,
+    which combines the count, mean and sum of squared deviations of two sets of
+    samples exactly and stays numerically stable for large counts. The same
+    update merges statistics gathered elsewhere, e.g. in other processes, with
+    `merge()`. Statistics are accumulated in float64.
+    """
+
+    def __init__(self, shape: Sequence[int] = ()) -> None:
+        self._count = 0.0
+        self._mean = np.zeros(shape, dtype=np.float64)
+        self._m2 = np.zeros(shape, dtype=np.float64)
+
+    @property
+    def count(self) -> float:
+        return self._count
+
+    @property
+    def mean(self) -> np.ndarray:
+        return self._mean
+
+    @property
+    def variance(self) -> np.ndarray:
+        if not self._count:
+            return np.zeros_like(self._m2)
+        return self._m2 / self._count
+
+    def update(self, values) -> None:
+        """Folds in a batch of samples, stacked along the leading axis."""
+        values = np.asarray(values, dtype=np.float64)
+        if values.shape[1:] != self._mean.shape:
+            raise ValueError(
+                f"Expected samples of shape {self._mean.shape}, got {values.shape[1:]}."
+            )
+        count = len(values)
+        if not count:
+            return
+        mean = values.mean(axis=0)
+        m2 = np.square(values - mean).sum(axis=0)
+        self._combine(float(count), mean, m2)
+
+    def merge(self, state: Dict[str, np.ndarray]) -> None:
+        """Folds in statistics returned by `get_state()` of another instance."""
+        self._combine(
+            float(state["count"]),
+            np.asarray(state["mean"], dtype=np.float64),
+            np.asarray(state["m2"], dtype=np.float64),
+        )
+
+    def get_state(self) -> Dict[str, np.ndarray]:
+        """Returns a copy of the statistics, e.g. for checkpointing or merging."""
+        return {
+            "count": np.float64(self._count),
+            "mean": self._mean.copy(),
+            "m2": self._m2.copy(),
+        }
+
+    def set_state(self, state: Dict[str, np.ndarray]) -> None:
+        """Restores statistics returned by `get_state()`."""
+        self._count = float(state["count"])
+        self._mean[...] = state["mean"]
+        self._m2[...] = state["m2"]
+
+    # Helper methods.
+
+    def _combine(self, count: float, mean: np.ndarray, m2: np.ndarray) -> None:
+        if not count:
+            return
+        total = self._count + count
+        delta = mean - self._mean
+        self._mean += delta * (count / total)
+        self._m2 += m2 + np.square(delta) * (self._count * count / total)
+        self._count = total
@@ -0,0 +1,47 @@
+"""Tests for running_statistics.py."""
+
+import numpy as np
+from absl.testing import absltest
+
+from dm_env_wrappers._src import running_statistics
+
+
+class RunningStatisticsTest(absltest.TestCase):
+    """Tests for RunningStatistics."""
+
+    def test_matches_batch_statistics(self) -> None:
+        rng = np.random.default_rng(0)
+        samples = rng.normal(1e6, 3.0, size=(1000, 2, 3))
+        statistics = running_statistics.RunningStatistics((2, 3))
+        for batch in np.array_split(samples, 7):
+            statistics.update(batch)
+        statistics.update(samples[:0])
+
+        self.assertEqual(statistics.count, 1000)
+        np.testing.assert_allclose(statistics.mean, samples.mean(axis=0))
+        np.testing.assert_allclose(statistics.variance, samples.var(axis=0))
+
+    def test_merge(self) -> None:
+        rng = np.random.default_rng(0)
+        samples = rng.normal(size=(100, 4))
+        merged = running_statistics.RunningStatistics((4,))
+        other = running_statistics.RunningStatistics((4,))
+        merged.update(samples[:30])
+        other.update(samples[30:])
+        merged.merge(other.get_state())
+        np.testing.assert_allclose(merged.mean, samples.mean(axis=0))
+        np.testing.assert_allclose(merged.variance, samples.var(axis=0))
+
+        restored = running_statistics.RunningStatistics((4,))
+        restored.set_state(merged.get_state())
+        self.assertEqual(restored.count, 100)
+        np.testing.assert_array_equal(restored.mean, merged.mean)
+
+    def test_rejects_invalid_shape(self) -> None:
+        statistics = running_statistics.RunningStatistics((2,))
+        with self.assertRaises(ValueError):
+            statistics.update(np.zeros((1, 3)))
+
+
+if __name__ == "__main__":
+    absltest.main()
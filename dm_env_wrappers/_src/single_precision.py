@@ -14,41 +14,80 @@
 
 """Environment wrapper which converts double-to-single precision."""
 
+from typing import Any, Callable, Optional
+
 import dm_env
 import numpy as np
 import tree
 
-from dm_env_wrappers._src import base
+from dm_env_wrappers._src import base, spec_utils
 
 
 class SinglePrecisionWrapper(base.EnvironmentWrapper):
     """Wrapper which converts environments from double- to single-precision."""
 
+    _supports_mutable_timesteps = True
+
+    # Converts only the observation entries read further out, if they are known.
+    _convert_consumed_entries: Optional[Callable[[Any], Any]] = None
+
     def _convert_timestep(self, timestep: dm_env.TimeStep) -> dm_env.TimeStep:
         return timestep._replace(
             reward=_convert_value(timestep.reward),
             discount=_convert_value(timestep.discount),
-            observation=_convert_value(timestep.observation),
+            observation=self._convert_observation(timestep.observation),
         )
 
+    def _convert_observation(self, observation):
+        if self._observation_buffers is None:
+            if self._convert_consumed_entries is not None:
+                return self._convert_consumed_entries(observation)
+            return _convert_value(observation)
+        return spec_utils.write_to_buffers(self._observation_buffers, observation)
+
     def step(self, action) -> dm_env.TimeStep:
         return self._convert_timestep(self._environment.step(action))
 
     def reset(self) -> dm_env.TimeStep:
         return self._convert_timestep(self._environment.reset())
 
+    @base.memoize_spec
     def action_spec(self):
         return _convert_spec(self._environment.action_spec())
 
+    @base.memoize_spec
     def discount_spec(self):
         return _convert_spec(self._environment.discount_spec())
 
+    @base.memoize_spec
     def observation_spec(self):
         return _convert_spec(self._environment.observation_spec())
 
+    @base.memoize_spec
     def reward_spec(self):
         return _convert_spec(self._environment.reward_spec())
 
+    def register_observation_buffers(self, buffers) -> None:
+        self._observation_buffers = spec_utils.check_buffers(
+            buffers, self.observation_spec()
+        )
+
+    def _set_consumed_observation_keys(self, keys) -> None:
+        observation_spec = self._environment.observation_spec()
+        if not isinstance(observation_spec, dict):
+            # Keys only select entries of dict observations.
+            keys = None
+        super()._set_consumed_observation_keys(keys)
+        self._convert_consumed_entries = None
+        if keys is not None:
+            paths = [(k,) for k in observation_spec if k in keys]
+            self._convert_consumed_entries = spec_utils.make_path_mapper(
+                _convert_value, paths
+            )
+
+    def _wrapped_observation_keys(self, keys):
+        return keys
+
 
 def _convert_spec(nested_spec):
     """Convert a nested spec."""
@@ -74,11 +113,11 @@ def _convert_value(nested_value):
 
     def _convert_single_value(value):
         if value is not None:
-            value = np.array(value, copy=False)
+            value = np.asarray(value)
             if np.issubdtype(value.dtype, np.float64):
-                value = np.array(value, copy=False, dtype=np.float32)
+                value = np.asarray(value, dtype=np.float32)
             elif np.issubdtype(value.dtype, np.int64):
-                value = np.array(value, copy=False, dtype=np.int32)
+                value = np.asarray(value, dtype=np.int32)
         return value
 
     return tree.map_structure(_convert_single_value, nested_value)
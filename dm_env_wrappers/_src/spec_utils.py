@@ -0,0 +1,161 @@
+"""Utilities for manipulating nested dm_env specs."""
+
+import copy
+import functools
+from typing import Any, Callable, Optional, Sequence, Tuple
+
+import numpy as np
+import tree
+from dm_env import specs
+
+
+def batch_spec(nested_spec, batch_size: int):
+    """Prepends a batch dimension of size `batch_size` to every spec in a nest.
+
+    DiscreteArray specs are upcast to BoundedArray specs since their shape is
+    always scalar. Bounds are kept as is and broadcast against the new shape.
+
+    Args:
+      nested_spec: The (possibly nested) spec to batch.
+      batch_size: Size of the leading batch dimension.
+
+    Returns:
+      A nest of specs with the same structure as `nested_spec`.
+    """
+
+    def _batch_single_spec(spec: specs.Array) -> specs.Array:
+        shape = (batch_size,) + tuple(spec.shape)
+        if isinstance(spec, specs.BoundedArray):
+            return specs.BoundedArray(
+                shape=shape,
+                dtype=spec.dtype,
+                minimum=spec.minimum,
+                maximum=spec.maximum,
+                name=spec.name,
+            )
+        if isinstance(spec, specs.StringArray):
+            return specs.StringArray(
+                shape=shape, string_type=spec.string_type, name=spec.name
+            )
+        return specs.Array(shape=shape, dtype=spec.dtype, name=spec.name)
+
+    return tree.map_structure(_batch_single_spec, nested_spec)
+
+
+def make_converter(nested_spec) -> Callable[[Any], Any]:
+    """Builds a function that normalizes values to match a nested spec.
+
+    The returned function maps dicts (including `OrderedDict`s) to plain dicts and
+    sequences to tuples or lists following the structure of `nested_spec`, and
+    each leaf to a C-contiguous array of the spec's dtype. Leaves that already
+    satisfy these requirements are returned as is, so a copy only happens when
+    the dtype or memory layout has to change. The structure is traversed once
+    here, rather than on every call.
+
+    Args:
+      nested_spec: The (possibly nested) spec that values should conform to.
+
+    Returns:
+      A function converting a value with the structure of `nested_spec`.
+    """
+    if isinstance(nested_spec, dict):
+        converters = {k: make_converter(v) for k, v in nested_spec.items()}
+        return lambda value: {k: c(value[k]) for k, c in converters.items()}
+
+    if isinstance(nested_spec, (tuple, list)):
+        converters = [make_converter(s) for s in nested_spec]
+        sequence_type = type(nested_spec)
+        return lambda value: sequence_type(c(v) for c, v in zip(converters, value))
+
+    if nested_spec.dtype == object:
+        # Pass StringArray values through unmodified.
+        return lambda value: value
+
+    dtype = nested_spec.dtype
+    return lambda value: np.require(value, dtype=dtype, requirements="C")
+
+
+def make_path_mapper(
+    fn: Callable[[Any], Any], paths: Sequence[Tuple[Any, ...]]
+) -> Callable[[Any], Any]:
+    """Builds a function that applies `fn` to the leaves of a nest at `paths`.
+
+    Paths are in the format returned by `tree.flatten_with_path`. Only the leaves
+    at `paths` are visited. Containers on the way to them are shallow-copied and
+    everything else is shared with the input nest, which is never modified.
+
+    Args:
+      fn: Function to apply to each selected leaf.
+      paths: Paths of the leaves to apply `fn` to.
+
+    Returns:
+      A function mapping a nest to a new nest with the selected leaves replaced.
+    """
+    trie: dict = {}
+    for path in paths:
+        if not path:
+            # The nest is a single leaf.
+            return fn
+        node = trie
+        for key in path[:-1]:
+            node = node.setdefault(key, {})
+        node[path[-1]] = None
+
+    if not trie:
+        return lambda nest: nest
+    return functools.partial(_map_at_trie, fn, trie)
+
+
+def _map_at_trie(fn: Callable[[Any], Any], trie: dict, nest):
+    items = list(nest) if isinstance(nest, tuple) else copy.copy(nest)
+    for key, child in trie.items():
+        value = nest[key]
+        items[key] = fn(value) if child is None else _map_at_trie(fn, child, value)
+    if isinstance(nest, tuple):
+        # Namedtuples take their fields as positional arguments.
+        return type(nest)(*items) if hasattr(nest, "_fields") else tuple(items)
+    return items
+
+
+def check_buffers(buffers: Optional[Any], nested_spec) -> Optional[Any]:
+    """Checks that a nest of arrays can be written into as values of a spec.
+
+    Args:
+      buffers: Nest of arrays with the structure of `nested_spec`, or None.
+      nested_spec: The (possibly nested) spec the buffers are for.
+
+    Returns:
+      The buffers, unchanged.
+
+    Raises:
+      ValueError: If any buffer does not match its spec or is not a writeable,
+        C-contiguous array.
+    """
+    if buffers is None:
+        return None
+    tree.assert_same_structure(nested_spec, buffers)
+    for spec, buffer in zip(tree.flatten(nested_spec), tree.flatten(buffers)):
+        if not isinstance(buffer, np.ndarray):
+            raise ValueError(f"Expected a numpy array for {spec}, got {buffer!r}.")
+        if buffer.shape != spec.shape or buffer.dtype != spec.dtype:
+            raise ValueError(
+                f"Buffer of shape {buffer.shape} and dtype {buffer.dtype} does not "
+                f"match {spec}."
+            )
+        if not buffer.flags.c_contiguous or not buffer.flags.writeable:
+            raise ValueError(f"Buffer for {spec} must be writeable and C-contiguous.")
+    return buffers
+
+
+def write_to_buffers(buffers, nest):
+    """Copies the leaves of `nest` into `buffers`, casting and broadcasting them.
+
+    Returns:
+      The buffers.
+    """
+
+    def _write(buffer: np.ndarray, value) -> np.ndarray:
+        np.copyto(buffer, value, casting="same_kind")
+        return buffer
+
+    return tree.map_structure(_write, buffers, nest)
@@ -24,6 +24,9 @@ from dm_env_wrappers._src import base
 class StepLimitWrapper(base.EnvironmentWrapper):
     """A wrapper which truncates episodes at the specified step limit."""
 
+    _passes_observation_through = True
+    _supports_mutable_timesteps = True
+
     def __init__(
         self, environment: dm_env.Environment, step_limit: Optional[int] = None
     ) -> None:
@@ -62,3 +65,6 @@ class StepLimitWrapper(base.EnvironmentWrapper):
                 timestep.reward, timestep.observation, timestep.discount
             )
         return timestep
+
+    def _wrapped_observation_keys(self, keys):
+        return keys
@@ -0,0 +1,143 @@
+"""A vector environment that steps its environments in a thread pool."""
+
+import concurrent.futures
+from typing import Callable, List, Optional, Sequence
+
+import dm_env
+import numpy as np
+import tree
+
+from dm_env_wrappers._src import spec_utils
+
+
+class ThreadPoolVectorEnvironment(dm_env.Environment):
+    """Steps a batch of environments concurrently in a `ThreadPoolExecutor`.
+
+    This suits simulators that release the GIL while stepping, like MuJoCo, and
+    avoids the process startup, pickling and per-process model copies of
+    subprocess-based vector environments. Actions and timesteps are batched along
+    a leading axis of size `num_envs`. An environment whose previous timestep was
+    LAST is reset instead of stepped, and its action is ignored. FIRST timesteps
+    have a reward of 0 and a discount of 1.
+
+    Results are written into preallocated, stacked arrays that are reused on every
+    call: the arrays of a timestep are only valid until the next `step()` or
+    `reset()`, and should be copied to be kept for longer.
+    """
+
+    def __init__(
+        self,
+        environment_factories: Sequence[Callable[[], dm_env.Environment]],
+        max_workers: Optional[int] = None,
+    ) -> None:
+        """Initializes a new ThreadPoolVectorEnvironment.
+
+        Args:
+          environment_factories: Callables returning the environments to step, one
+            per environment. They are called concurrently in the thread pool.
+          max_workers: Number of threads. Defaults to one per environment.
+        """
+        self._num_envs = len(environment_factories)
+        if not self._num_envs:
+            raise ValueError("At least one environment factory is required.")
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers or self._num_envs,
+            thread_name_prefix="ThreadPoolVectorEnvironment",
+        )
+        self._environments: List[dm_env.Environment] = list(
+            self._executor.map(lambda factory: factory(), environment_factories)
+        )
+
+        environment = self._environments[0]
+        self._single_action_spec = environment.action_spec()
+        self._observation_spec = spec_utils.batch_spec(
+            environment.observation_spec(), self._num_envs
+        )
+        self._action_spec = spec_utils.batch_spec(
+            self._single_action_spec, self._num_envs
+        )
+        self._reward_spec = spec_utils.batch_spec(
+            environment.reward_spec(), self._num_envs
+        )
+        self._discount_spec = spec_utils.batch_spec(
+            environment.discount_spec(), self._num_envs
+        )
+
+        self._step_type = np.full(self._num_envs, dm_env.StepType.LAST, np.uint8)
+        self._reward = np.zeros(self._reward_spec.shape, self._reward_spec.dtype)
+        self._discount = np.ones(self._discount_spec.shape, self._discount_spec.dtype)
+        self._observation = tree.map_structure(
+            lambda s: np.zeros(s.shape, s.dtype), self._observation_spec
+        )
+        self._observation_leaves = tree.flatten(self._observation)
+        self._timestep = dm_env.TimeStep(
+            self._step_type, self._reward, self._discount, self._observation
+        )
+
+    def reset(self) -> dm_env.TimeStep:
+        """Resets all environments."""
+        for _ in self._executor.map(self._reset_one, range(self._num_envs)):
+            pass
+        return self._timestep
+
+    def step(self, action) -> dm_env.TimeStep:
+        """Steps all environments with a batch of actions."""
+        action_leaves = tree.flatten(action)
+        for _ in self._executor.map(
+            lambda i: self._step_one(i, action_leaves), range(self._num_envs)
+        ):
+            pass
+        return self._timestep
+
+    def observation_spec(self):
+        return self._observation_spec
+
+    def action_spec(self):
+        return self._action_spec
+
+    def reward_spec(self):
+        return self._reward_spec
+
+    def discount_spec(self):
+        return self._discount_spec
+
+    @property
+    def num_envs(self) -> int:
+        """Returns the number of environments."""
+        return self._num_envs
+
+    @property
+    def environments(self) -> Sequence[dm_env.Environment]:
+        """Returns the stepped environments."""
+        return self._environments
+
+    def close(self):
+        self._executor.shutdown()
+        for environment in self._environments:
+            environment.close()
+
+    # Helper methods.
+
+    def _reset_one(self, index: int) -> None:
+        self._write(index, self._environments[index].reset())
+
+    def _step_one(self, index: int, action_leaves: List[np.ndarray]) -> None:
+        if self._step_type[index] == dm_env.StepType.LAST:
+            self._reset_one(index)
+            return
+        action = tree.unflatten_as(
+            self._single_action_spec, [leaf[index] for leaf in action_leaves]
+        )
+        self._write(index, self._environments[index].step(action))
+
+    def _write(self, index: int, timestep: dm_env.TimeStep) -> None:
+        self._step_type[index] = timestep.step_type
+        if timestep.first():
+            self._reward[index] = 0.0
+            self._discount[index] = 1.0
+        else:
+            self._reward[index] = timestep.reward
+            self._discount[index] = timestep.discount
+        observation_leaves = tree.flatten(timestep.observation)
+        for buffer, value in zip(self._observation_leaves, observation_leaves):
+            buffer[index] = value
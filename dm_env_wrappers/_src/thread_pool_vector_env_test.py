@@ -0,0 +1,83 @@
+"""Tests for thread_pool_vector_env.py."""
+
+import functools
+
+import dm_env
+import numpy as np
+from absl.testing import absltest
+from dm_control import suite
+
+from dm_env_wrappers._src import thread_pool_vector_env
+from dm_env_wrappers._src.mujoco import dm_control
+
+_NUM_ENVS = 3
+
+
+def _load_cartpole(seed: int) -> dm_env.Environment:
+    env = suite.load(
+        "cartpole",
+        "swingup",
+        task_kwargs={"random": seed, "time_limit": 0.05},
+    )
+    return dm_control.DmControlWrapper(env)
+
+
+class ThreadPoolVectorEnvironmentTest(absltest.TestCase):
+    """Tests for ThreadPoolVectorEnvironment."""
+
+    def test_matches_sequential_environments(self) -> None:
+        env = thread_pool_vector_env.ThreadPoolVectorEnvironment(
+            [functools.partial(_load_cartpole, i) for i in range(_NUM_ENVS)]
+        )
+        references = [_load_cartpole(i) for i in range(_NUM_ENVS)]
+
+        self.assertEqual(env.num_envs, _NUM_ENVS)
+        self.assertEqual(env.action_spec().shape, (_NUM_ENVS, 1))
+        self.assertEqual(env.reward_spec().shape, (_NUM_ENVS,))
+        self.assertEqual(env.observation_spec()["position"].shape, (_NUM_ENVS, 3))
+
+        timestep = env.reset()
+        expected = [reference.reset() for reference in references]
+        rng = np.random.default_rng(0)
+        # Long enough for every episode to end and restart.
+        for _ in range(12):
+            self.assertEqual(timestep.step_type.dtype, np.uint8)
+            for i, reference in enumerate(expected):
+                self.assertEqual(timestep.step_type[i], reference.step_type)
+                if reference.first():
+                    self.assertEqual(timestep.reward[i], 0.0)
+                    self.assertEqual(timestep.discount[i], 1.0)
+                else:
+                    self.assertEqual(timestep.reward[i], reference.reward)
+                    self.assertEqual(timestep.discount[i], reference.discount)
+                for key, value in reference.observation.items():
+                    np.testing.assert_array_equal(timestep.observation[key][i], value)
+
+            action = rng.uniform(-1, 1, size=(_NUM_ENVS, 1))
+            timestep = env.step(action)
+            expected = [
+                reference.reset() if reference_timestep.last() else reference.step(a)
+                for reference, reference_timestep, a in zip(
+                    references, expected, action
+                )
+            ]
+
+        env.close()
+
+    def test_reuses_output_arrays(self) -> None:
+        env = thread_pool_vector_env.ThreadPoolVectorEnvironment(
+            [functools.partial(_load_cartpole, i) for i in range(2)], max_workers=1
+        )
+        first = env.reset()
+        second = env.step(np.zeros((2, 1)))
+        self.assertIs(first.reward, second.reward)
+        self.assertIs(first.observation["velocity"], second.observation["velocity"])
+        env.close()
+
+    def test_requires_environments(self) -> None:
+        with self.assertRaises(ValueError):
+            thread_pool_vector_env.ThreadPoolVectorEnvironment([])
+
+
+if __name__ == "__main__":
+    absltest.main()
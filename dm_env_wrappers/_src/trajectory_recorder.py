@@ -0,0 +1,207 @@
+"""Wrapper that records trajectories to chunked `.npy` files."""
+
+import os
+import pickle
+import queue
+import threading
+from typing import List, Optional, Tuple
+
+import dm_env
+import numpy as np
+import tree
+from dm_env import specs
+
+from dm_env_wrappers._src import base
+
+SPECS_FILENAME = "specs.pkl"
+
+
+def trajectory_fields(
+    observation_spec, action_spec, reward_spec, discount_spec
+) -> List[Tuple[str, specs.Array]]:
+    """Returns the name and spec of every recorded field, in recording order.
+
+    Fields are named after their path in the nest, e.g. `observation.pixels` or
+    `action.0`, and there is one `step_type` field.
+    """
+    fields = [("step_type", specs.Array(shape=(), dtype=np.uint8, name="step_type"))]
+    for prefix, nested_spec in (
+        ("observation", observation_spec),
+        ("action", action_spec),
+        ("reward", reward_spec),
+        ("discount", discount_spec),
+    ):
+        for path, spec in tree.flatten_with_path(nested_spec):
+            fields.append((".".join((prefix,) + tuple(map(str, path))), spec))
+    return fields
+
+
+class TrajectoryRecorderWrapper(base.EnvironmentWrapper):
+    """Records every timestep, and the action that led to it, to disk.
+
+    Each row holds a timestep's step type, observation, reward and discount, and
+    the action passed to the `step()` call that returned it. FIRST rows have a
+    zero action, a zero reward and a discount of 1. Rows are written into
+    preallocated chunks of `chunk_length` rows per field, and full chunks are
+    saved from a background thread as `<directory>/<chunk:06d>/<field>.npy`
+    files, which can be memory-mapped with `np.load(..., mmap_mode="r")`.
+    Episodes simply continue from one chunk into the next.
+
+    Chunks are only reused once they have been saved, so `step()` blocks if
+    `num_buffers` chunks are waiting to be written. The last, partial chunk is
+    saved by `flush()` or `close()`. The specs are pickled to
+    `<directory>/specs.pkl`, and `trajectory_fields()` gives the field names.
+    """
+
+    _passes_observation_through = True
+    _supports_mutable_timesteps = True
+
+    def __init__(
+        self,
+        environment: dm_env.Environment,
+        directory: str,
+        chunk_length: int = 1000,
+        num_buffers: int = 2,
+    ) -> None:
+        """Initializes a new TrajectoryRecorderWrapper.
+
+        Args:
+          environment: Environment to wrap.
+          directory: Directory to record to. It must be empty or not exist yet.
+          chunk_length: Number of rows per chunk.
+          num_buffers: Number of preallocated chunks.
+        """
+        super().__init__(environment)
+
+        if chunk_length <= 0:
+            raise ValueError("chunk_length must be a positive integer.")
+        if num_buffers <= 0:
+            raise ValueError("num_buffers must be a positive integer.")
+        os.makedirs(directory, exist_ok=True)
+        if os.listdir(directory):
+            raise ValueError(f"Directory {directory} is not empty.")
+
+        spec_nests = (
+            self._environment.observation_spec(),
+            self._environment.action_spec(),
+            self._environment.reward_spec(),
+            self._environment.discount_spec(),
+        )
+        self._fields = trajectory_fields(*spec_nests)
+        for name, spec in self._fields:
+            if np.dtype(spec.dtype).hasobject:
+                raise ValueError(f"Cannot record field {name} of dtype {spec.dtype}.")
+        with open(os.path.join(directory, SPECS_FILENAME), "wb") as f:
+            pickle.dump(spec_nests, f)
+
+        self._directory = directory
+        self._chunk_length = chunk_length
+        _, action_spec, reward_spec, discount_spec = spec_nests
+        self._zero_action = [
+            np.zeros(s.shape, s.dtype) for s in tree.flatten(action_spec)
+        ]
+        self._first_reward = [
+            np.zeros(s.shape, s.dtype) for s in tree.flatten(reward_spec)
+        ]
+        self._first_discount = [
+            np.ones(s.shape, s.dtype) for s in tree.flatten(discount_spec)
+        ]
+
+        self._free_chunks: queue.Queue = queue.Queue()
+        for _ in range(num_buffers):
+            self._free_chunks.put(
+                [
+                    np.empty((chunk_length,) + tuple(spec.shape), spec.dtype)
+                    for _, spec in self._fields
+                ]
+            )
+        self._full_chunks: queue.Queue = queue.Queue()
+        self._chunk = self._free_chunks.get()
+        self._row = 0
+        self._chunk_index = 0
+        self._error: Optional[BaseException] = None
+        self._writer = threading.Thread(
+            target=self._write_chunks, name="TrajectoryRecorderWrapper", daemon=True
+        )
+        self._writer.start()
+
+    def reset(self) -> dm_env.TimeStep:
+        timestep = self._environment.reset()
+        self._record(timestep, self._zero_action)
+        return timestep
+
+    def step(self, action) -> dm_env.TimeStep:
+        timestep = self._environment.step(action)
+        if timestep.first():
+            self._record(timestep, self._zero_action)
+        else:
+            self._record(timestep, tree.flatten(action))
+        return timestep
+
+    def flush(self) -> None:
+        """Saves the rows recorded so far and waits for all chunks to be written."""
+        if self._row:
+            self._submit_chunk()
+        self._full_chunks.join()
+        self._raise_writer_error()
+
+    def close(self):
+        if self._writer.is_alive():
+            try:
+                self.flush()
+            finally:
+                self._full_chunks.put(None)
+                self._writer.join()
+        return self._environment.close()
+
+    # Helper methods.
+
+    def _record(self, timestep: dm_env.TimeStep, action: List[np.ndarray]) -> None:
+        values = tree.flatten(timestep.observation) + action
+        if timestep.first():
+            values += self._first_reward + self._first_discount
+        else:
+            values += tree.flatten(timestep.reward) + tree.flatten(timestep.discount)
+        chunk, row = self._chunk, self._row
+        chunk[0][row] = timestep.step_type
+        for array, value in zip(chunk[1:], values):
+            array[row] = value
+        self._row += 1
+        if self._row == self._chunk_length:
+            self._submit_chunk()
+
+    def _submit_chunk(self) -> None:
+        self._raise_writer_error()
+        self._full_chunks.put((self._chunk_index, self._chunk, self._row))
+        self._chunk_index += 1
+        self._chunk = self._free_chunks.get()
+        self._row = 0
+
+    def _raise_writer_error(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise RuntimeError("Failed to write a trajectory chunk.") from error
+
+    def _write_chunks(self) -> None:
+        while True:
+            item = self._full_chunks.get()
+            if item is None:
+                self._full_chunks.task_done()
+                return
+            index, chunk, length = item
+            try:
+                self._save_chunk(index, chunk, length)
+            except Exception as e:  # pylint: disable=broad-except
+                self._error = e
+            self._free_chunks.put(chunk)
+            self._full_chunks.task_done()
+
+    def _save_chunk(self, index: int, chunk: List[np.ndarray], length: int) -> None:
+        # Chunks are written to a temporary directory that is renamed once
+        # complete, so that readers never see partially written chunks.
+        path = os.path.join(self._directory, f"{index:06d}")
+        temporary_path = path + ".tmp"
+        os.makedirs(temporary_path)
+        for (name, _), array in zip(self._fields, chunk):
+            np.save(os.path.join(temporary_path, name + ".npy"), array[:length])
+        os.rename(temporary_path, path)
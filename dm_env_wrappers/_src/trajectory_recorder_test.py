@@ -0,0 +1,130 @@
+"""Tests for trajectory_recorder.py."""
+
+import os
+import pickle
+import tempfile
+
+import dm_env
+import numpy as np
+from absl.testing import absltest
+from dm_env import specs
+
+from dm_env_wrappers._src import trajectory_recorder
+
+
+class _FakeEnvironment(dm_env.Environment):
+    """A mock environment with 3-step episodes that reset on step."""
+
+    def __init__(self) -> None:
+        self.num_steps = 0
+        self.closed = False
+
+    def reset(self) -> dm_env.TimeStep:
+        self.num_steps = 0
+        return dm_env.restart(self._observation())
+
+    def step(self, action) -> dm_env.TimeStep:
+        if self.num_steps == 3:
+            return self.reset()
+        self.num_steps += 1
+        if self.num_steps == 3:
+            return dm_env.termination(float(action), self._observation())
+        return dm_env.transition(float(action), self._observation(), 0.5)
+
+    def observation_spec(self):
+        return {
+            "pixels": specs.Array(shape=(2, 2), dtype=np.uint8),
+            "time": specs.Array(shape=(), dtype=np.int32),
+        }
+
+    def action_spec(self):
+        return specs.Array(shape=(), dtype=np.float32)
+
+    def close(self):
+        self.closed = True
+
+    def _observation(self):
+        return {
+            "pixels": np.full((2, 2), self.num_steps, dtype=np.uint8),
+            "time": np.int32(self.num_steps),
+        }
+
+
+class TrajectoryRecorderWrapperTest(absltest.TestCase):
+    """Tests for TrajectoryRecorderWrapper."""
+
+    def test_records_chunks(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            inner = _FakeEnvironment()
+            env = trajectory_recorder.TrajectoryRecorderWrapper(
+                inner, directory, chunk_length=4, num_buffers=1
+            )
+            timesteps = [env.reset()]
+            actions = [0.0]
+            for i in range(9):
+                actions.append(float(i + 1))
+                timesteps.append(env.step(actions[-1]))
+            env.close()
+            self.assertTrue(inner.closed)
+
+            self.assertEqual(
+                sorted(os.listdir(directory)),
+                ["000000", "000001", "000002", trajectory_recorder.SPECS_FILENAME],
+            )
+            with open(os.path.join(directory, "specs.pkl"), "rb") as f:
+                spec_nests = pickle.load(f)
+            self.assertEqual(spec_nests[0], inner.observation_spec())
+            fields = trajectory_recorder.trajectory_fields(*spec_nests)
+            self.assertEqual(
+                [name for name, _ in fields],
+                [
+                    "step_type",
+                    "observation.pixels",
+                    "observation.time",
+                    "action",
+                    "reward",
+                    "discount",
+                ],
+            )
+
+            data = {
+                name: np.concatenate(
+                    [
+                        np.load(
+                            os.path.join(directory, chunk, name + ".npy"),
+                            mmap_mode="r",
+                        )
+                        for chunk in ("000000", "000001", "000002")
+                    ]
+                )
+                for name, _ in fields
+            }
+            self.assertLen(data["step_type"], 10)
+            np.testing.assert_array_equal(
+                data["step_type"], [t.step_type for t in timesteps]
+            )
+            np.testing.assert_array_equal(
+                data["observation.time"], [t.observation["time"] for t in timesteps]
+            )
+            self.assertEqual(data["observation.pixels"].shape, (10, 2, 2))
+            for row, timestep in enumerate(timesteps):
+                if timestep.first():
+                    self.assertEqual(data["action"][row], 0.0)
+                    self.assertEqual(data["reward"][row], 0.0)
+                    self.assertEqual(data["discount"][row], 1.0)
+                else:
+                    self.assertEqual(data["action"][row], actions[row])
+                    self.assertEqual(data["reward"][row], timestep.reward)
+                    self.assertEqual(data["discount"][row], timestep.discount)
+
+    def test_rejects_non_empty_directory(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            open(os.path.join(directory, "file"), "w").close()
+            with self.assertRaises(ValueError):
+                trajectory_recorder.TrajectoryRecorderWrapper(
+                    _FakeEnvironment(), directory
+                )
+
+
+if __name__ == "__main__":
+    absltest.main()
@@ -8,6 +8,9 @@ from dm_env_wrappers._src import base
 class ValidateActionSpecWrapper(base.EnvironmentWrapper):
     """Throws an exception if an action does not match its spec."""
 
+    _passes_observation_through = True
+    _supports_mutable_timesteps = True
+
     def step(self, action) -> dm_env.TimeStep:
         """Validates the action against the action spec.
 
@@ -1,5 +1,8 @@
 """Tests for dm_env_wrappers."""
 
+import subprocess
+import sys
+
 from absl.testing import absltest
 
 import numpy as np
@@ -13,6 +16,37 @@ class DmEnvWrappersTest(absltest.TestCase):
     def test_import(self) -> None:
         self.assertTrue(hasattr(dm_env_wrappers, "EnvironmentWrapper"))
 
+    def test_import_does_not_load_heavy_dependencies(self) -> None:
+        """Import-time regression check for a cold `import dm_env_wrappers`."""
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import dm_env_wrappers"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        # Each line looks like: "import time: self [us] | cumulative | package".
+        imported = {}
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "[us]" in line:
+                continue
+            _, cumulative, name = line.split("|")
+            imported[name.strip()] = int(cumulative)
+        total_ms = imported["dm_env_wrappers"] / 1000
+        for module in (
+            "tree",
+            "scipy",
+            "imageio",
+            "gym",
+            "gymnasium",
+            "asyncio",
+            "multiprocessing",
+        ):
+            self.assertNotIn(
+                module,
+                imported,
+                f"`import dm_env_wrappers` loaded {module} ({total_ms:.1f}ms)",
+            )
+
     def test_canonical_spec_discrete_action(self) -> None:
         """Test that canonical spec wrapper works with discrete actions."""
         num_actions = 3